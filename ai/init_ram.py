@@ -12,15 +12,41 @@ Strategy:
 
 from __future__ import annotations
 
-import random
 from typing import TYPE_CHECKING
 
+from ai.opponents import BaseAIOpponent
+from cards import CARD_BITS, CARD_IDS, NUM_RANKS, NUM_SUITS, RANK_IDS, RANK_MASKS, card_mask
+
 if TYPE_CHECKING:
     from ai.opponents import AIOpponentContext
     from truco_logic import TrucoLogic
 
 
-class InitRam:
+def _ranks_mask(ranks: str) -> int:
+    """Mask of every card of the given ranks."""
+    mask = 0
+    for rank in ranks:
+        mask |= RANK_MASKS[RANK_IDS[rank]]
+    return mask
+
+
+# Card masks behind the hand classification (bits are card ids, see cards.py)
+_TOP_MASK = _ranks_mask("32A")  # 3s, 2s and As
+_WEAK_MASK = _ranks_mask("4567")
+_RANKED_MASK = _ranks_mask("QJKA23")  # ranks the strongest pick tells apart
+# Strong cards per manilha rank: the top ranks plus every manilha
+_STRONG_MASKS = tuple(_TOP_MASK | RANK_MASKS[m] for m in range(NUM_RANKS))
+
+
+def _first_of_rank(ids: list[int], rank: int) -> int:
+    """Index of the first card of `rank` in hand order."""
+    for i, card in enumerate(ids):
+        if card // NUM_SUITS == rank:
+            return i
+    return 0
+
+
+class InitRam(BaseAIOpponent):
     """INIT-RAM: The Bluff-Master.
     
     Aries sign, aggressive bluffer, forces the player to learn truco psychology.
@@ -28,6 +54,8 @@ class InitRam:
 
     name = "INIT-RAM"
     description = "The Bluff-Master. Aggressive caller but weak follow-through. Learn when to fold or counter."
+    variants = ("paulista",)  # reads the manilha as a rank
+    context_fields = frozenset({"opponent_hand", "manilha"})
     
     # Per-hand state for bluff tracking
     hand_strength: str = ""  # "high", "medium", or "low"
@@ -46,13 +74,12 @@ class InitRam:
         Medium: Has some strong cards but not dominantly
         Low: Mostly weak cards (4s, 5s, 6s, 7s)
         """
-        strong_cards = {manilha}  # Manilha is always strong
-        strong_cards.update(["3", "2", "A"])  # Highest non-manilha cards
-        
-        strong_count = sum(1 for card in hand if any(rank in card for rank in ["3", "2", "A", manilha]))
-        weak_count = sum(1 for card in hand if any(rank in card for rank in ["4", "5", "6", "7"]))
+        mask = card_mask(CARD_IDS[card] for card in hand)
+        m = RANK_IDS[manilha]
+        strong_count = bin(mask & _STRONG_MASKS[m]).count("1")
+        weak_count = bin(mask & _WEAK_MASK).count("1")
         
-        if strong_count >= 2 or manilha in "".join(hand):
+        if strong_count >= 2 or mask & RANK_MASKS[m]:
             return "high"
         elif strong_count >= 1 and weak_count <= 1:
             return "medium"
@@ -84,35 +111,31 @@ class InitRam:
     
     def _pick_strongest_card(self, hand: list[str], manilha: str) -> int:
         """Return index of the manilha if present, else highest ranked card."""
-        for i, card in enumerate(hand):
-            if manilha in card:
-                return i
+        ids = [CARD_IDS[card] for card in hand]
+        mask = card_mask(ids)
+        m = RANK_IDS[manilha]
+        if mask & RANK_MASKS[m]:
+            return _first_of_rank(ids, m)
         
-        # Fallback to highest rank
-        rank_order = {"3": 10, "2": 9, "A": 8, "K": 7, "J": 6, "Q": 5}
-        return max(range(len(hand)), key=lambda i: rank_order.get(hand[i][0], 0))
+        # Fallback to highest rank (4s to 7s all count as equally low)
+        altas = mask & _RANKED_MASK
+        if not altas:
+            return 0
+        return _first_of_rank(ids, (altas.bit_length() - 1) // NUM_SUITS)
     
     def _pick_medium_card(self, hand: list[str], manilha: str) -> int:
         """Pick a card that's moderately strong but not the best."""
-        strong_cards = []
-        weak_cards = []
-        
+        # Prefer the first 3, 2 or A if available, otherwise play first available
         for i, card in enumerate(hand):
-            if any(rank in card for rank in ["3", "2", "A"]):
-                strong_cards.append(i)
-            else:
-                weak_cards.append(i)
-        
-        # Prefer a strong card if available, but not the manilha
-        if strong_cards:
-            return strong_cards[0]
-        # Otherwise play first available
+            if CARD_BITS[CARD_IDS[card]] & _TOP_MASK:
+                return i
         return 0
     
     def _pick_weakest_card(self, hand: list[str]) -> int:
         """Return index of the weakest card."""
-        rank_order = {"3": 10, "2": 9, "A": 8, "K": 7, "J": 6, "Q": 5, "7": 4, "6": 3, "5": 2, "4": 1}
-        return min(range(len(hand)), key=lambda i: rank_order.get(hand[i][0], 0))
+        ids = [CARD_IDS[card] for card in hand]
+        mask = card_mask(ids)
+        return _first_of_rank(ids, ((mask & -mask).bit_length() - 1) // NUM_SUITS)
     
     def decide_truco_response(self, proposed_value: int, truco: TrucoLogic, context: AIOpponentContext) -> str:
         """Respond to player's truco call.
@@ -124,21 +147,21 @@ class InitRam:
         """
         if self.hand_strength == "high":
             # Strong hand: accept more often (75% accept, 25% run/reraise)
-            if random.random() < 0.75:
+            if self.rng.random() < 0.75:
                 return "accept"
             else:
                 return "run"
         
         elif self.hand_strength == "medium":
             # Medium hand: concede ~60% (reward bluff attempts)
-            if random.random() < 0.60:
+            if self.rng.random() < 0.60:
                 return "run"
             else:
                 return "accept"
         
         else:  # low hand
             # Low hand: almost always concede (~85%)
-            if random.random() < 0.85:
+            if self.rng.random() < 0.85:
                 return "run"
             else:
                 return "accept"
@@ -0,0 +1,412 @@
+"""ISMCTS: information-set Monte Carlo Tree Search opponent.
+
+Searches card plays and truco actions using only what AIOpponentContext
+exposes. Every iteration samples a hidden hand for the other side
+(a determinization), walks a single shared tree with UCB restricted to the
+actions legal in that sample, plays the rest out at random and backs up the
+hand points.
+
+Strategy:
+- Anytime: returns the most visited action when `time_budget` expires
+- Root parallel: with `workers > 1`, independent searches run in worker
+  processes and their root visit counts are merged
+- Strength scales with the time and cores it is given
+
+Rewards are hand points (positive when this AI takes them), so the
+exploration constant is expressed in points as well.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Tuple
+
+from ai.opponents import BaseAIOpponent
+from cards import STRENGTH
+from game_core import EMPATE, JOGADOR, OPONENTE
+from sim.batch import HAND_ROUNDS, HAND_WINNER
+from solver.visible_state import from_context
+
+if TYPE_CHECKING:
+    from ai.opponents import AIOpponentContext
+    from truco_logic import TrucoLogic
+
+_HAND_WINNER = tuple(HAND_WINNER.tolist())
+_ENDS_AFTER_TWO = tuple(HAND_ROUNDS[prefix * 3] == 2 for prefix in range(9))
+
+# Non-card actions (cards are their own ids, 0-39)
+RAISE = 40
+ACCEPT = 41
+RUN = 42
+RERAISE = 43
+RESPONSES = {ACCEPT: "accept", RUN: "run", RERAISE: "reraise"}
+
+# Search phases: a card play (optionally preceded by a raise) or a truco response
+_PLAY = 0
+_RESPOND = 1
+
+# Seats inside the search: this AI is seat 0, the other side seat 1
+_ME = 0
+_OTHER = 1
+_LAST_RAISER_SEATS = {"opponent": _ME, "player": _OTHER, None: None}
+
+
+def _next_value(value: int) -> Optional[int]:
+    """Same escalation as TrucoLogic.get_next_truco_value."""
+    if value == 1:
+        return 3
+    return value + 3 if value < 12 else None
+
+
+class Root(NamedTuple):
+    """Picklable description of the decision point searched from."""
+
+    my_hand: Tuple[int, ...]
+    unseen: Tuple[int, ...]
+    hidden_count: int
+    manilha: int
+    prefix: int
+    rodadas: int
+    starter: int
+    mesa: Optional[int]
+    value: int
+    last_accepted: int
+    last_raiser: Optional[int]
+    phase: int
+    may_raise: bool
+    pending: Optional[int] = None
+    raiser: Optional[int] = None
+    neg_accepted: int = 1
+
+
+class _Estado:
+    """Mutable hand state of one determinization (both hands known)."""
+
+    __slots__ = ("maos", "forca", "prefix", "rodadas", "starter", "mesa", "value", "last_accepted",
+                 "last_raiser", "phase", "may_raise", "pending", "raiser", "neg_accepted", "payoff")
+
+    def __init__(self, root: Root, theirs: List[int]) -> None:
+        self.maos = (list(root.my_hand), theirs)
+        self.forca = STRENGTH[root.manilha]
+        self.prefix = root.prefix
+        self.rodadas = root.rodadas
+        self.starter = root.starter
+        self.mesa = root.mesa
+        self.value = root.value
+        self.last_accepted = root.last_accepted
+        self.last_raiser = root.last_raiser
+        self.phase = root.phase
+        self.may_raise = root.may_raise
+        self.pending = root.pending
+        self.raiser = root.raiser
+        self.neg_accepted = root.neg_accepted
+        self.payoff = None
+
+    def mover(self) -> int:
+        """Seat that acts next."""
+        if self.phase == _RESPOND:
+            return 1 - self.raiser
+        return self.starter if self.mesa is None else 1 - self.starter
+
+    def legal(self) -> List[int]:
+        """Legal actions for the seat to act."""
+        if self.phase == _RESPOND:
+            if self.pending < 12:
+                return [ACCEPT, RUN, RERAISE]
+            return [ACCEPT, RUN]
+        mover = self.mover()
+        acoes = list(self.maos[mover])
+        if self.may_raise and self.value < 12 and (self.value == 1 or self.last_raiser != mover):
+            acoes.append(RAISE)
+        return acoes
+
+    def apply(self, acao: int) -> None:
+        """Play an action; sets `payoff` (points to seat 0) when the hand ends."""
+        if acao < RAISE:
+            self._play_card(acao)
+        elif acao == RAISE:
+            self.pending = _next_value(self.value)
+            self.raiser = self.mover()
+            self.neg_accepted = self.last_accepted
+            self.phase = _RESPOND
+        elif acao == ACCEPT:
+            self.value = self.last_accepted = self.pending
+            self.last_raiser = self.raiser
+            self.phase = _PLAY
+            self.may_raise = False
+        elif acao == RUN:
+            pontos = self.neg_accepted
+            self.payoff = pontos if self.raiser == _ME else -pontos
+        else:
+            self.neg_accepted = self.pending
+            self.raiser = 1 - self.raiser
+            self.pending = _next_value(self.pending)
+
+    def _play_card(self, card: int) -> None:
+        mover = self.mover()
+        self.maos[mover].remove(card)
+        self.may_raise = True
+        if self.mesa is None:
+            self.mesa = card
+            return
+
+        # Second card of the round: same rule as GameCore.vencedor_rodada
+        forca = self.forca
+        meu, deles = (card, self.mesa) if mover == _ME else (self.mesa, card)
+        if forca[meu] > forca[deles]:
+            code = JOGADOR
+        elif forca[deles] > forca[meu]:
+            code = OPONENTE
+        else:
+            code = EMPATE
+        self.mesa = None
+        self.prefix = self.prefix * 3 + code
+        self.rodadas += 1
+        if code != EMPATE:
+            self.starter = code - 1
+
+        if self.rodadas == 3:
+            winner = _HAND_WINNER[self.prefix]
+        elif self.rodadas == 2 and _ENDS_AFTER_TWO[self.prefix]:
+            winner = _HAND_WINNER[self.prefix * 3]
+        else:
+            return
+        if winner == EMPATE:
+            self.payoff = 0
+        else:
+            self.payoff = self.value if winner == JOGADOR else -self.value
+
+
+class _No:
+    """Tree node; statistics are from the point of view of `mover`."""
+
+    __slots__ = ("mover", "filhos", "visitas", "total", "disponivel")
+
+    def __init__(self, mover: int) -> None:
+        self.mover = mover
+        self.filhos: Dict[int, _No] = {}
+        self.visitas = 0
+        self.total = 0.0
+        self.disponivel = 1
+
+
+def search(root: Root, time_budget: float, seed=None, exploration: float = 1.0,
+           max_iterations: Optional[int] = None) -> Dict[int, int]:
+    """Run one single-observer ISMCTS search.
+
+    Args:
+        root: Decision point to search from
+        time_budget: Seconds to search for
+        seed: Seed for this search's random stream
+        exploration: UCB exploration constant, in hand points
+        max_iterations: Optional iteration cap (for reproducible searches)
+
+    Returns:
+        dict: Visit count per root action
+    """
+    rng = random.Random(seed)
+    choice = rng.choice
+    sample = rng.sample
+    log = math.log
+    sqrt = math.sqrt
+    raiz = _No(_OTHER)
+    deadline = time.perf_counter() + time_budget
+    iteracoes = 0
+
+    while True:
+        estado = _Estado(root, sample(root.unseen, root.hidden_count))
+        no = raiz
+        caminho = [raiz]
+
+        # Selection / expansion over the actions legal in this determinization
+        while estado.payoff is None:
+            acoes = estado.legal()
+            mover = estado.mover()
+            filhos = no.filhos
+            novas = [a for a in acoes if a not in filhos]
+            for a in acoes:
+                filho = filhos.get(a)
+                if filho is not None:
+                    filho.disponivel += 1
+            if novas:
+                acao = choice(novas)
+                no = filhos[acao] = _No(mover)
+                estado.apply(acao)
+                caminho.append(no)
+                break
+            melhor = None
+            melhor_score = -math.inf
+            for a in acoes:
+                filho = filhos[a]
+                score = filho.total / filho.visitas + exploration * sqrt(log(filho.disponivel) / filho.visitas)
+                if score > melhor_score:
+                    melhor, melhor_score = a, score
+            no = filhos[melhor]
+            estado.apply(melhor)
+            caminho.append(no)
+
+        # Rollout: random cards, no raises, accept anything pending
+        while estado.payoff is None:
+            if estado.phase == _RESPOND:
+                estado.apply(ACCEPT)
+            else:
+                estado.apply(choice(estado.maos[estado.mover()]))
+
+        payoff = estado.payoff
+        for no in caminho:
+            no.visitas += 1
+            no.total += payoff if no.mover == _ME else -payoff
+
+        iteracoes += 1
+        if max_iterations is not None and iteracoes >= max_iterations:
+            break
+        if time.perf_counter() >= deadline:
+            break
+
+    return {acao: filho.visitas for acao, filho in raiz.filhos.items()}
+
+
+def root_from_context(context: AIOpponentContext, phase: int = _PLAY, may_raise: bool = False,
+                      proposed_value: Optional[int] = None) -> Root:
+    """Build the search root for a decision from this AI's context.
+
+    Args:
+        context: Context handed to the AI
+        phase: _PLAY for a card (and optional raise), _RESPOND for a truco response
+        may_raise: Whether raising is one of the root options
+        proposed_value: Value this AI must respond to (phase _RESPOND)
+    """
+    state = from_context(context)
+    if state.my_played is not None:
+        starter, mesa = _ME, state.my_played
+    elif state.their_played is not None:
+        starter, mesa = _OTHER, state.their_played
+    elif phase == _PLAY:
+        starter, mesa = _ME, None
+    else:
+        starter, mesa = (_OTHER if context.player_starts_round else _ME), None
+    prefix = 0
+    for code in state.results:
+        prefix = prefix * 3 + code
+
+    value = context.current_hand_value
+    last_accepted = context.last_accepted_value
+    pending = raiser = None
+    neg_accepted = last_accepted
+    if phase == _RESPOND:
+        pending, raiser = proposed_value, _OTHER
+        # A proposal above the next step means the other side re-raised,
+        # implicitly accepting the value this AI proposed
+        if proposed_value != _next_value(value):
+            neg_accepted = proposed_value - 3
+
+    return Root(
+        my_hand=state.my_hand,
+        unseen=state.unseen,
+        hidden_count=state.hidden_count,
+        manilha=state.manilha,
+        prefix=prefix,
+        rodadas=len(state.results),
+        starter=starter,
+        mesa=mesa,
+        value=value,
+        last_accepted=last_accepted,
+        last_raiser=_LAST_RAISER_SEATS.get(getattr(context, "last_raiser", None)),
+        phase=phase,
+        may_raise=may_raise,
+        pending=pending,
+        raiser=raiser,
+        neg_accepted=neg_accepted,
+    )
+
+
+class IsmctsOpponent(BaseAIOpponent):
+    """Anytime ISMCTS opponent with optional root parallelism."""
+
+    name = "ISMCTS"
+    description = "Searches every card and truco line it can in the time it is given."
+    variants = ("paulista",)  # reads the manilha as a rank
+    heads_up_only = True  # searches over a single hidden hand
+    order_dependent = True  # keeps its search plan across the hand
+
+    def __init__(self, rng: Optional[random.Random] = None, time_budget: float = 0.05, workers: int = 1,
+                 exploration: float = 1.0, max_iterations: Optional[int] = None) -> None:
+        """
+        Args:
+            rng: Random stream (seeds for each search are drawn from it)
+            time_budget: Seconds per decision
+            workers: Parallel root searches (1 keeps everything in-process)
+            exploration: UCB exploration constant, in hand points
+            max_iterations: Optional iteration cap per search
+        """
+        super().__init__(rng)
+        self.time_budget = time_budget
+        self.workers = max(1, workers)
+        self.exploration = exploration
+        self.max_iterations = max_iterations
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._plano: Optional[Tuple[tuple, int]] = None
+
+    def on_new_hand(self, context: AIOpponentContext) -> None:
+        """Forget the card planned during the last truco decision."""
+        self._plano = None
+
+    def search(self, root: Root) -> Dict[int, int]:
+        """Search a root on every worker and merge the root visit counts."""
+        seeds = [self.rng.getrandbits(64) for _ in range(self.workers)]
+        futures = []
+        if self.workers > 1:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers - 1)
+            futures = [self._pool.submit(search, root, self.time_budget, seed, self.exploration,
+                                         self.max_iterations) for seed in seeds[1:]]
+        visitas = search(root, self.time_budget, seeds[0], self.exploration, self.max_iterations)
+        for future in futures:
+            for acao, n in future.result().items():
+                visitas[acao] = visitas.get(acao, 0) + n
+        return visitas
+
+    def _best(self, root: Root) -> int:
+        visitas = self.search(root)
+        return max(visitas, key=visitas.get)
+
+    @staticmethod
+    def _plan_key(context: AIOpponentContext) -> tuple:
+        return tuple(context.opponent_hand), tuple(context.round_results), context.current_hand_value
+
+    def choose_card(self, context: AIOpponentContext) -> int:
+        """Play the most visited card (reusing the truco search if it already picked one)."""
+        hand = context.opponent_hand
+        if len(hand) <= 1:
+            return 0
+        if self._plano is not None and self._plano[0] == self._plan_key(context):
+            card = self._plano[1]
+        else:
+            card = self._best(root_from_context(context))
+        self._plano = None
+        nomes = from_context(context).my_hand
+        return nomes.index(card)
+
+    def should_call_truco(self, truco: TrucoLogic, context: AIOpponentContext) -> bool:
+        """Raise if raising is the most visited root action."""
+        if not context.opponent_hand:
+            return False
+        acao = self._best(root_from_context(context, may_raise=True))
+        if acao == RAISE:
+            self._plano = None
+            return True
+        self._plano = (self._plan_key(context), acao)
+        return False
+
+    def decide_truco_response(self, proposed_value: int, truco: TrucoLogic, context: AIOpponentContext) -> str:
+        """Accept, run or re-raise, whichever the search visited most."""
+        return RESPONSES[self._best(root_from_context(context, _RESPOND, proposed_value=proposed_value))]
+
+    def close(self) -> None:
+        """Shut down the worker pool, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
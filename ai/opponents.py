@@ -1,30 +1,62 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+import random
+from typing import Dict, FrozenSet, List, Optional, Tuple
 from truco_logic import TrucoLogic
 
 
-@dataclass
 class AIOpponentContext:
     """Lightweight snapshot of state exposed to AI opponents.
 
     This avoids leaking controller internals but provides enough signal for
     decision making and debugging.
+
+    Controllers keep one slotted context per AI and refresh it in place before
+    every decision, so asking an AI costs no allocations. Treat it as read-only
+    and copy anything that must outlive the current call.
     """
 
-    opponent_hand: List[str]
-    player_hand: List[str]
-    played: Dict[str, Optional[str]]
-    manilha: str
-    carta_vira: str
-    scores: Dict[str, int]
-    current_hand_value: int
-    last_accepted_value: int
-    pending_truco: Optional[Dict]
-    round_results: List[str]
-    player_starts_round: bool
-    player_starts_hand: bool
+    __slots__ = ("opponent_hand", "player_hand", "played", "manilha", "carta_vira", "scores",
+                 "current_hand_value", "last_accepted_value", "pending_truco", "round_results",
+                 "player_starts_round", "player_starts_hand", "seen_cards", "last_raiser")
+
+    def __init__(
+        self,
+        opponent_hand: List[str],
+        player_hand: List[str],
+        played: Dict[str, Optional[str]],
+        manilha: str,
+        carta_vira: str,
+        scores: Dict[str, int],
+        current_hand_value: int,
+        last_accepted_value: int,
+        pending_truco: Optional[Dict],
+        round_results: List[str],
+        player_starts_round: bool,
+        player_starts_hand: bool,
+        seen_cards: Optional[List[str]] = None,
+        last_raiser: Optional[str] = None,
+    ) -> None:
+        self.opponent_hand = opponent_hand
+        self.player_hand = player_hand
+        self.played = played
+        self.manilha = manilha
+        self.carta_vira = carta_vira
+        self.scores = scores
+        self.current_hand_value = current_hand_value
+        self.last_accepted_value = last_accepted_value
+        self.pending_truco = pending_truco
+        self.round_results = round_results
+        self.player_starts_round = player_starts_round
+        self.player_starts_hand = player_starts_hand
+        # Cards played in earlier (already resolved) rounds of this hand, both sides
+        self.seen_cards = seen_cards if seen_cards is not None else []
+        # Who made the last accepted raise: "player", "opponent" or None
+        self.last_raiser = last_raiser
+
+    def __repr__(self) -> str:
+        campos = ", ".join(f"{nome}={getattr(self, nome)!r}" for nome in self.__slots__)
+        return f"AIOpponentContext({campos})"
 
 
 class BaseAIOpponent:
@@ -32,11 +64,25 @@ class BaseAIOpponent:
 
     Subclasses implement card selection and truco behaviour. All methods are
     synchronous and deterministic by default; add randomness inside overrides
-    as needed.
+    as needed, drawing from ``self.rng`` so seeded runs stay reproducible.
     """
 
     name: str = "Base"
     description: str = "Placeholder opponent; override in subclasses."
+    # Rule variants (rules.py names) this AI understands; None means any
+    variants: Optional[Tuple[str, ...]] = None
+    # True if the AI models the table as exactly two hands (no 2v2 team play)
+    heads_up_only: bool = False
+    # AIOpponentContext fields this AI reads; None means all of them. Headless
+    # engines only keep the listed fields current and leave the others stale
+    context_fields: Optional[FrozenSet[str]] = None
+    # True if decisions depend on state carried between calls within a hand
+    # (samples, search plans); analysis tools call on_new_hand before each query
+    order_dependent: bool = False
+
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
+        """Create the opponent with its own random stream (see rng.py)."""
+        self.rng = rng if rng is not None else random.Random()
 
     def on_new_hand(self, context: AIOpponentContext) -> None:
         """Hook called at the start of each hand. Override to reset per-hand state."""
@@ -50,6 +96,14 @@ class BaseAIOpponent:
         """
         return 0
 
+    def should_call_truco(self, truco: TrucoLogic, context: AIOpponentContext) -> bool:
+        """Decide whether to raise the stakes before playing a card.
+
+        Only asked when the rules allow this opponent to raise. Default: never,
+        matching the Textual controller where the opponent only responds.
+        """
+        return False
+
     def decide_truco_response(self, proposed_value: int, truco: TrucoLogic, context: AIOpponentContext) -> str:
         """Decide how to respond when the player raises to proposed_value.
 
@@ -0,0 +1,166 @@
+"""PIMC: determinized (perfect-information Monte Carlo) search opponent.
+
+Samples K hands the other side could be holding, solves each one exactly
+with the perfect-information solver (solver/minimax.py) and votes.
+
+Strategy:
+- Cards: every determinization votes for the cards that reach its best
+  outcome; the most voted card wins (ties go to the better total outcome,
+  then the cheaper card)
+- Truco: the fraction of determinizations won / lost with best play gives
+  an expected margin that drives raises and responses
+
+The K samples are drawn once per hand and updated as the other side shows
+cards, so they stay uniform over the holdings consistent with the context.
+Solved determinizations are cached for the whole hand, so later decisions
+mostly reuse earlier work and per-decision latency stays flat.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from ai.opponents import BaseAIOpponent
+from cards import CARD_IDS, STRENGTH
+from game_core import JOGADOR, OPONENTE
+from solver import minimax
+from solver.visible_state import from_context
+
+if TYPE_CHECKING:
+    import random
+
+    from ai.opponents import AIOpponentContext
+    from solver.visible_state import VisibleState
+    from truco_logic import TrucoLogic
+
+# Minimax outcome code (this AI is Jogador) -> points sign
+_SINAL = {JOGADOR: 1, OPONENTE: -1}
+
+
+class PimcOpponent(BaseAIOpponent):
+    """Votes over exactly solved determinizations of the hidden hand."""
+
+    name = "PIMC"
+    description = "Solves dozens of guesses of your hand exactly and goes with the majority."
+    variants = ("paulista",)  # reads the manilha as a rank
+    heads_up_only = True  # searches over a single hidden hand
+    order_dependent = True  # keeps its samples across the hand
+
+    def __init__(self, rng: Optional[random.Random] = None, samples: int = 32,
+                 raise_margin: float = 0.5, reraise_margin: float = 0.7) -> None:
+        """
+        Args:
+            rng: Random stream used to draw determinizations
+            samples: Determinizations (K) kept per hand
+            raise_margin: Expected win-minus-loss margin needed to call truco
+            reraise_margin: Margin needed to re-raise instead of accepting
+        """
+        super().__init__(rng)
+        self.samples = samples
+        self.raise_margin = raise_margin
+        self.reraise_margin = reraise_margin
+        self._mao_inicial: frozenset = frozenset()
+        self._amostras: List[List[int]] = []
+        self._revelados: set = set()
+        self._solucoes: Dict[tuple, object] = {}
+
+    def on_new_hand(self, context: AIOpponentContext) -> None:
+        """Drop last hand's determinizations and cached solutions."""
+        self._mao_inicial = frozenset(CARD_IDS[name] for name in context.opponent_hand)
+        self._amostras = []
+        self._revelados = set()
+        self._solucoes = {}
+
+    def _determinizations(self, state: VisibleState, seen_cards) -> List[List[int]]:
+        """Bring the K samples of the hidden hand up to date with the cards shown."""
+        revelados = {CARD_IDS[name] for name in seen_cards} - self._mao_inicial
+        if state.their_played is not None:
+            revelados.add(state.their_played)
+
+        # A shown card leaves a sample if it was there; otherwise the other
+        # side held it instead of one of the sampled cards. Either way the
+        # rest of the sample stays uniform over the unseen pool.
+        for card in revelados - self._revelados:
+            for amostra in self._amostras:
+                if card in amostra:
+                    amostra.remove(card)
+                elif amostra:
+                    amostra.pop(self.rng.randrange(len(amostra)))
+        self._revelados = revelados
+
+        if not self._amostras or any(len(s) != state.hidden_count for s in self._amostras):
+            self._amostras = [self.rng.sample(state.unseen, state.hidden_count) for _ in range(self.samples)]
+        return self._amostras
+
+    def _prepare(self, context: AIOpponentContext) -> Tuple[VisibleState, List[List[int]]]:
+        state = from_context(context)
+        if not self._mao_inicial:
+            self._mao_inicial = frozenset(state.my_hand) | ({state.my_played} - {None})
+        return state, self._determinizations(state, getattr(context, "seen_cards", ()))
+
+    def _card_outcomes(self, state: VisibleState, theirs: List[int]) -> List[int]:
+        """Solver outcome of each of this AI's cards against one determinization."""
+        mesa = state.their_played
+        key = ("card", state.my_hand, tuple(sorted(theirs)), state.results, mesa)
+        outcomes = self._solucoes.get(key)
+        if outcomes is None:
+            outcomes = minimax.card_outcomes(state.my_hand, theirs, state.manilha,
+                                             player_starts_round=mesa is None,
+                                             results=state.results, table_card=mesa)
+            self._solucoes[key] = outcomes
+        return outcomes
+
+    def _margin(self, context: AIOpponentContext) -> float:
+        """Expected (wins - losses) fraction over the determinizations, best play."""
+        state, amostras = self._prepare(context)
+        if state.my_played is not None:
+            my_hand, ai_starts, mesa = state.my_hand, True, state.my_played
+        elif state.their_played is not None:
+            my_hand, ai_starts, mesa = state.my_hand, False, state.their_played
+        else:
+            my_hand, ai_starts, mesa = state.my_hand, not context.player_starts_round, None
+        total = 0
+        for theirs in amostras:
+            key = ("hand", my_hand, tuple(sorted(theirs)), state.results, ai_starts, mesa)
+            outcome = self._solucoes.get(key)
+            if outcome is None:
+                outcome = minimax.solve(my_hand, theirs, state.manilha, player_starts_round=ai_starts,
+                                        results=state.results, table_card=mesa).outcome
+                self._solucoes[key] = outcome
+            total += _SINAL.get(outcome, 0)
+        return total / len(amostras)
+
+    def choose_card(self, context: AIOpponentContext) -> int:
+        """Play the card most determinizations vote for."""
+        if len(context.opponent_hand) <= 1:
+            return 0
+        state, amostras = self._prepare(context)
+        n = len(state.my_hand)
+        votos = [0] * n
+        somas = [0] * n
+        for theirs in amostras:
+            valores = [_SINAL.get(code, 0) for code in self._card_outcomes(state, theirs)]
+            melhor = max(valores)
+            for i, valor in enumerate(valores):
+                votos[i] += valor == melhor
+                somas[i] += valor
+        forca = STRENGTH[state.manilha]
+        return max(range(n), key=lambda i: (votos[i], somas[i], -forca[state.my_hand[i]]))
+
+    def should_call_truco(self, truco: TrucoLogic, context: AIOpponentContext) -> bool:
+        """Raise when the determinizations are won by a wide enough margin."""
+        if not context.opponent_hand:
+            return False
+        return self._margin(context) >= self.raise_margin
+
+    def decide_truco_response(self, proposed_value: int, truco: TrucoLogic, context: AIOpponentContext) -> str:
+        """Re-raise on a very good margin, accept if playing beats running."""
+        margem = self._margin(context)
+        if proposed_value < 12 and margem >= self.reraise_margin:
+            return "reraise"
+        # Running concedes the last accepted value; accepting risks the proposal
+        if proposed_value != truco.get_next_truco_value(context.current_hand_value):
+            concedido = proposed_value - 3
+        else:
+            concedido = context.last_accepted_value
+        return "accept" if proposed_value * margem >= -concedido else "run"
@@ -0,0 +1,108 @@
+"""TABLE: opponent driven entirely by a precomputed policy file.
+
+Every decision is one lookup into a memory-mapped, quantized policy table
+(see solver/policy_table.py), typically exported from the CFR trainer:
+- Truco calls and responses sample from the stored probabilities
+- Cards follow the stored card table (k-th strongest remaining card)
+
+Decisions cost O(1) with no search, and every TablePolicyOpponent in a
+process shares one mapping of the file, so per-table memory is a few
+integers. The hand bucket is looked up once per hand in on_new_hand.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+from ai.opponents import BaseAIOpponent
+from cards import CARD_IDS, RANK_IDS, STRENGTH, hand_index
+from config import GameConfig
+from solver.abstraction import bucket_table
+from solver.cfr import RAISE, RESPONSE_NAMES, infoset_index
+from solver.policy_table import DEFAULT_PATH, SCALE, card_infoset_index, load_policy
+
+if TYPE_CHECKING:
+    import random
+
+    from ai.opponents import AIOpponentContext
+    from truco_logic import TrucoLogic
+
+# Context round labels ("Você" is the other side) to this AI's result codes
+_RESULT_CODES = {"Empate": 0, "Oponente": 1, "Você": 2}
+_KIND = {1: 0, 3: 1, 6: 2, 9: 3, 12: 4}
+
+
+class TablePolicyOpponent(BaseAIOpponent):
+    """Plays straight from a quantized policy table."""
+
+    name = "TABLE"
+    description = "Never thinks, never hesitates: every move was decided offline."
+    variants = ("paulista",)  # reads the manilha as a rank
+
+    def __init__(self, rng: Optional[random.Random] = None, path: str = DEFAULT_PATH) -> None:
+        """
+        Args:
+            rng: Random stream used to sample the stored probabilities
+            path: Policy file written by solver.policy_table.write_policy
+        """
+        super().__init__(rng)
+        self.table = load_policy(path)
+        self.buckets = bucket_table(self.table.n_buckets)
+        self.bucket = self.table.n_buckets // 2
+
+    def on_new_hand(self, context: AIOpponentContext) -> None:
+        """Look up the bucket of the three cards dealt."""
+        if len(context.opponent_hand) == 3:
+            cards = [CARD_IDS[name] for name in context.opponent_hand]
+            self.bucket = int(self.buckets[RANK_IDS[context.manilha], hand_index(cards)])
+
+    def _slots(self, context: AIOpponentContext):
+        """(need_me, need_them, rodadas, prefix, table) for the index functions."""
+        prefix = 0
+        for label in context.round_results:
+            prefix = prefix * 3 + _RESULT_CODES[label]
+        played = context.played
+        table = 1 if played.get("opponent") else 2 if played.get("player") else 0
+        alvo = GameConfig.WINNING_SCORE
+        need_me = min(max(alvo - context.scores["opponent"], 1), alvo)
+        need_them = min(max(alvo - context.scores["player"], 1), alvo)
+        return need_me, need_them, len(context.round_results), prefix, table
+
+    def _sample(self, row) -> int:
+        r = self.rng.randrange(SCALE)
+        for acao, peso in enumerate(row.tolist()):
+            r -= peso
+            if r < 0:
+                return acao
+        return 0
+
+    def choose_card(self, context: AIOpponentContext) -> int:
+        """Play the k-th strongest remaining card, k read from the card table."""
+        hand = context.opponent_hand
+        if len(hand) <= 1:
+            return 0
+        forca = STRENGTH[RANK_IDS[context.manilha]]
+        valores = [forca[CARD_IDS[name]] for name in hand]
+        need_me, need_them, rodadas, prefix, table = self._slots(context)
+        beats = 0
+        if table == 2:
+            alvo = forca[CARD_IDS[context.played["player"]]]
+            beats = sum(v > alvo for v in valores)
+        k = int(self.table.cards[card_infoset_index(self.table.n_buckets, need_me, need_them, self.bucket,
+                                                    rodadas, prefix, table, beats)])
+        ordem = sorted(range(len(hand)), key=valores.__getitem__, reverse=True)
+        return ordem[min(k, len(hand) - 1)]
+
+    def should_call_truco(self, truco: TrucoLogic, context: AIOpponentContext) -> bool:
+        """Raise with the stored probability."""
+        need_me, need_them, rodadas, prefix, table = self._slots(context)
+        row = self.table.truco[infoset_index(self.table.n_buckets, need_me, need_them, self.bucket,
+                                             rodadas, prefix, table, _KIND[context.current_hand_value])]
+        return self.rng.randrange(SCALE) < int(row[RAISE])
+
+    def decide_truco_response(self, proposed_value: int, truco: TrucoLogic, context: AIOpponentContext) -> str:
+        """Sample accept / run / reraise from the stored probabilities."""
+        need_me, need_them, rodadas, prefix, table = self._slots(context)
+        row = self.table.truco[infoset_index(self.table.n_buckets, need_me, need_them, self.bucket,
+                                             rodadas, prefix, table, 3 + _KIND[proposed_value])]
+        return RESPONSE_NAMES[self._sample(row)]
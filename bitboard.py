@@ -0,0 +1,109 @@
+"""
+Bitboard Module for Truco 2000
+
+Card sets as 40-bit ints (bit `id` set for each card id, see cards.py):
+- Hands, the remaining deck and seen cards are plain int masks
+- Precomputed per manilha and card: the cards that beat it, tie it or lose
+  to it under GameCore.vencedor_rodada
+- Set queries ("cheapest winner in my hand", "how many unseen cards beat
+  mine") become a few AND / bit-scan operations
+
+Within a manilha, regular cards get stronger with their id and the four
+manilhas (one rank, ascending suit order) beat them all, so strength
+order queries only need to look at the manilha bits first or last.
+
+Paulista only: the masks come from cards.STRENGTH, and Mineiro's fixed
+manilhas (four different ranks) break the one-rank layout above.
+"""
+
+from cards import CARD_BITS, DECK, NUM_RANKS, RANK_MASKS, STRENGTH, card_mask
+
+FULL_DECK = card_mask(DECK)
+
+
+def _build_outcome_sets():
+    """(beats, ties, loses): [manilha][card] masks of cards that beat / tie / lose to card."""
+    beats, ties, loses = [], [], []
+    for manilha in range(NUM_RANKS):
+        forca = STRENGTH[manilha]
+        linhas = ([], [], [])
+        for card in DECK:
+            acima = empate = abaixo = 0
+            for outra in DECK:
+                if outra == card:
+                    continue
+                if forca[outra] > forca[card]:
+                    acima |= CARD_BITS[outra]
+                elif forca[outra] == forca[card]:
+                    empate |= CARD_BITS[outra]
+                else:
+                    abaixo |= CARD_BITS[outra]
+            linhas[0].append(acima)
+            linhas[1].append(empate)
+            linhas[2].append(abaixo)
+        beats.append(tuple(linhas[0]))
+        ties.append(tuple(linhas[1]))
+        loses.append(tuple(linhas[2]))
+    return tuple(beats), tuple(ties), tuple(loses)
+
+
+# BEATS[m][card]: cards that win against `card` when rank m is the manilha
+BEATS, TIES, LOSES = _build_outcome_sets()
+
+
+def popcount(mask):
+    """Number of cards in a mask."""
+    return bin(mask).count("1")
+
+
+def lowest(mask):
+    """Lowest card id in a non-empty mask."""
+    return (mask & -mask).bit_length() - 1
+
+
+def highest(mask):
+    """Highest card id in a non-empty mask."""
+    return mask.bit_length() - 1
+
+
+def cards_of(mask):
+    """Card ids in a mask, ascending."""
+    cards = []
+    while mask:
+        bit = mask & -mask
+        cards.append(bit.bit_length() - 1)
+        mask ^= bit
+    return cards
+
+
+def weakest(mask, manilha):
+    """Weakest card of a non-empty mask (lowest id on ties)."""
+    regulares = mask & ~RANK_MASKS[manilha]
+    return lowest(regulares or mask)
+
+
+def strongest(mask, manilha):
+    """Strongest card of a non-empty mask (highest id on ties)."""
+    manilhas = mask & RANK_MASKS[manilha]
+    return highest(manilhas or mask)
+
+
+def cheapest_winner(hand, card, manilha):
+    """
+    Weakest card of `hand` that beats `card`.
+
+    Args:
+        hand (int): Mask of the cards to choose from
+        card (int): Card id to beat
+        manilha (int): Manilha rank index
+
+    Returns:
+        int or None: Card id, or None if nothing in hand wins
+    """
+    vencedoras = hand & BEATS[manilha][card]
+    return weakest(vencedoras, manilha) if vencedoras else None
+
+
+def count_beating(card, pool, manilha):
+    """Number of cards in `pool` that beat `card` (e.g. unseen cards beating one of mine)."""
+    return popcount(pool & BEATS[manilha][card])
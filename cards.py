@@ -0,0 +1,155 @@
+"""
+Card Encoding Module for Truco 2000
+
+This module defines the integer card-id engine used by the core logic:
+- Card ids 0-39 (rank index * 4 + suit index)
+- Precomputed strength tables (one row per manilha rank)
+- 40-bit card masks (one bit per card id) for set-style checks
+- Conversion helpers between card ids and 'RankSuit' display strings
+
+Game logic works exclusively on card ids; string conversion should only
+happen at the UI boundary (controllers, snapshots, display).
+"""
+
+from itertools import combinations
+from math import comb
+
+# Ranks in ascending base order and suits in ascending manilha order
+RANKS = ('4', '5', '6', '7', 'Q', 'J', 'K', 'A', '2', '3')
+SUITS = ('♦', '♠', '♥', '♣')
+
+NUM_RANKS = len(RANKS)
+NUM_SUITS = len(SUITS)
+NUM_CARDS = NUM_RANKS * NUM_SUITS
+
+# Full deck of card ids, in id order
+DECK = tuple(range(NUM_CARDS))
+
+# Display names indexed by card id, and the reverse lookup
+CARD_NAMES = tuple(rank + suit for rank in RANKS for suit in SUITS)
+CARD_IDS = {name: card for card, name in enumerate(CARD_NAMES)}
+RANK_IDS = {rank: idx for idx, rank in enumerate(RANKS)}
+
+# Base value of each card (1 for '4' up to 10 for '3'), ignoring manilha status
+BASE_VALUE = tuple(card // NUM_SUITS + 1 for card in DECK)
+
+# 40-bit card masks: bit `id` per card, and the four bits of each rank
+CARD_BITS = tuple(1 << card for card in DECK)
+RANK_MASKS = tuple(0b1111 << (rank * NUM_SUITS) for rank in range(NUM_RANKS))
+
+
+def card_mask(cards):
+    """Return the 40-bit mask of a collection of card ids."""
+    mask = 0
+    for card in cards:
+        mask |= CARD_BITS[card]
+    return mask
+
+
+def _build_strength_table():
+    """
+    Build the strength table used to decide rounds.
+
+    Row m holds the strength of every card when rank m is the manilha.
+    Regular cards are worth their rank index (0-9), so equal ranks tie;
+    manilhas are worth 10 + suit index, so they beat every regular card
+    and never tie each other (♣ > ♥ > ♠ > ♦).
+
+    Returns:
+        tuple: NUM_RANKS rows of NUM_CARDS strengths each
+    """
+    table = []
+    for manilha in range(NUM_RANKS):
+        row = []
+        for card in DECK:
+            rank, suit = divmod(card, NUM_SUITS)
+            row.append(NUM_RANKS + suit if rank == manilha else rank)
+        table.append(tuple(row))
+    return tuple(table)
+
+
+# Paulista rules (identical to rules.PAULISTA.strength). Modules that index it
+# directly instead of a GameCore's variant tables are Paulista-only.
+STRENGTH = _build_strength_table()
+
+
+def rank_of(card):
+    """Return the rank index (0-9) of a card id."""
+    return card // NUM_SUITS
+
+
+def suit_of(card):
+    """Return the suit index (0-3, ♦ lowest) of a card id."""
+    return card % NUM_SUITS
+
+
+def card_to_str(card):
+    """
+    Convert a card id to its display string.
+
+    Args:
+        card (int): Card id (0-39)
+
+    Returns:
+        str: Card in format 'RankSuit' (e.g., '7♠')
+    """
+    return CARD_NAMES[card]
+
+
+def str_to_card(name):
+    """
+    Convert a display string to its card id.
+
+    Args:
+        name (str): Card in format 'RankSuit' (e.g., '7♠')
+
+    Returns:
+        int: Card id (0-39)
+    """
+    return CARD_IDS[name]
+
+
+def cards_to_str(cards):
+    """Convert a sequence of card ids to a list of display strings."""
+    return [CARD_NAMES[card] for card in cards]
+
+
+def rank_to_str(rank):
+    """Convert a rank index (e.g., a manilha) to its display string."""
+    return RANKS[rank]
+
+
+def str_to_rank(rank):
+    """Convert a rank display string (e.g., '7') to its rank index."""
+    return RANK_IDS[rank]
+
+
+# --- Three-card hand indexing (combinatorial number system) ---
+
+HAND_SIZE = 3
+
+# _BINOM[k][n] = C(n, k) for k <= 3 and n <= 40
+_BINOM = tuple(tuple(comb(n, k) for n in range(NUM_CARDS + 1)) for k in range(HAND_SIZE + 1))
+
+NUM_HANDS = _BINOM[HAND_SIZE][NUM_CARDS]
+
+
+def hand_index(cards):
+    """
+    Return the dense index (0-9879) of a three-card hand.
+
+    Uses the colexicographic combinatorial number system, so the index does
+    not depend on the order the cards are given in.
+
+    Args:
+        cards (sequence): Three distinct card ids
+
+    Returns:
+        int: Hand index, matching the position of the hand in HANDS
+    """
+    a, b, c = sorted(cards)
+    return a + _BINOM[2][b] + _BINOM[3][c]
+
+
+# Every three-card hand as a sorted tuple, in hand_index order
+HANDS = tuple(sorted(combinations(DECK, HAND_SIZE), key=lambda hand: hand[::-1]))
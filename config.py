@@ -36,6 +36,8 @@ class GameConfig:
     WINNING_SCORE = 12
     CARDS_PER_HAND = 3
     DECK_SIZE = 40
+    # Rule variant for new tables: 'paulista' (vira) or 'mineiro' (fixed manilhas), see rules.py
+    RULE_VARIANT = 'paulista'
     
     # Truco values and names
     TRUCO_VALUES = [1, 3, 6, 9, 12]
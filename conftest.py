@@ -0,0 +1,8 @@
+"""
+Pytest configuration for Truco 2000.
+
+- Puts the repository root on sys.path for the tests/ package
+- Skips legacy/, whose scripts exec the old single-file game at import
+"""
+
+collect_ignore = ["legacy"]
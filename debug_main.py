@@ -1,4 +1,5 @@
 from game_controller import GameController
+from cards import card_to_str, cards_to_str, rank_to_str, str_to_card
 
 class DebugGameController(GameController):
     def __init__(self):
@@ -25,9 +26,11 @@ class DebugGameController(GameController):
         self.core.reiniciar_baralho()
         self.truco.reset_truco_state()
         self.core.player_starts_round = self.core.player_starts_hand
-        carta_vira, manilha = self.core.determinar_manilha()
-        mao_do_jogador = self.core.distribuir_cartas(self.config.CARDS_PER_HAND)
-        mao_do_oponente = self.core.distribuir_cartas(self.config.CARDS_PER_HAND)
+        vira_id, manilha_id = self.core.determinar_manilha()
+        # Cards are ids in the core; convert to display strings for the UI
+        carta_vira, manilha = card_to_str(vira_id), rank_to_str(manilha_id)
+        mao_do_jogador = cards_to_str(self.core.distribuir_cartas(self.config.CARDS_PER_HAND))
+        mao_do_oponente = cards_to_str(self.core.distribuir_cartas(self.config.CARDS_PER_HAND))
         resultados_rodadas = []
         primeira_vitoria = None
         vitorias_jogador = 0
@@ -139,7 +142,7 @@ class DebugGameController(GameController):
                 carta_jogador = mao_do_jogador.pop(carta_index)
             # Show both cards in battle zone
             battle_zone = {"carta_jogador": carta_jogador, "carta_oponente": carta_oponente}
-            vencedor = self.core.vencedor_rodada(carta_jogador, carta_oponente, manilha)
+            vencedor = self.core.vencedor_rodada(str_to_card(carta_jogador), str_to_card(carta_oponente), manilha_id)
             battle_zone.update({"round_result": f"Vencedor: {vencedor}", "show_result": True})
             self.ui.display_game_layout(
                 self.core, self.truco, rodada, mao_do_jogador, manilha, resultados_rodadas, carta_vira,
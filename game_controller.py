@@ -10,6 +10,7 @@ This is the central conductor of the game, keeping all modules in sync.
 """
 
 from game_core import GameCore
+from cards import card_to_str, cards_to_str, rank_to_str, str_to_card
 from truco_logic import TrucoLogic
 from ui.display import UIDisplay
 from ui.input import InputHandler
@@ -26,7 +27,8 @@ class GameController:
     def __init__(self):
         # Initialize all modules
         self.config = GameConfig
-        self.core = GameCore()
+        # The terminal game always turns a vira, so it plays Paulista rules
+        self.core = GameCore(variant="paulista")
         self.truco = TrucoLogic()
         self.ascii_art = ASCIIArt()
         self.ui = UIDisplay(self.ascii_art, screen_width=self.config.SCREEN_WIDTH)
@@ -43,8 +45,7 @@ class GameController:
 
             self.core.reset_game_state()
             self.truco.reset_truco_state()
-            self.core.baralho = self.core.baralho_original.copy()
-            self.core.embaralhar()
+            self.core.reiniciar_baralho()
 
             # Player always starts the first hand
             self.core.player_starts_hand = True
@@ -68,9 +69,11 @@ class GameController:
         self.truco.reset_truco_state()
         # Ensure the first round of the hand starts with the correct player
         self.core.player_starts_round = self.core.player_starts_hand
-        carta_vira, manilha = self.core.determinar_manilha()
-        mao_do_jogador = self.core.distribuir_cartas(self.config.CARDS_PER_HAND)
-        mao_do_oponente = self.core.distribuir_cartas(self.config.CARDS_PER_HAND)
+        vira_id, manilha_id = self.core.determinar_manilha()
+        # Cards are ids in the core; convert to display strings for the UI
+        carta_vira, manilha = card_to_str(vira_id), rank_to_str(manilha_id)
+        mao_do_jogador = cards_to_str(self.core.distribuir_cartas(self.config.CARDS_PER_HAND))
+        mao_do_oponente = cards_to_str(self.core.distribuir_cartas(self.config.CARDS_PER_HAND))
         resultados_rodadas = []
         primeira_vitoria = None
         vitorias_jogador = 0
@@ -228,7 +231,7 @@ class GameController:
             # Show both cards in battle zone
             battle_zone = {"carta_jogador": carta_jogador, "carta_oponente": carta_oponente}
             # Determine winner
-            vencedor = self.core.vencedor_rodada(carta_jogador, carta_oponente, manilha)
+            vencedor = self.core.vencedor_rodada(str_to_card(carta_jogador), str_to_card(carta_oponente), manilha_id)
             # Show result
             battle_zone.update({"round_result": f"Vencedor: {vencedor}", "show_result": True})
             self.ui.display_game_layout(
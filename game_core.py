@@ -4,14 +4,102 @@ Core Game Logic Module for Truco 2000
 This module contains pure game logic that is UI-independent:
 - Card deck management
 - Game rules (card values, round winners, manilha system)
-- Hand/round winner determination
+- Hand/round winner determination (hand rules compiled into a tiny
+  state-transition table, HAND_STEP)
 - Core game state management
 
 All functions here should work independently of any UI or display logic.
+Cards are integer ids (see cards.py); conversion to display strings is left
+to the UI layer.
 """
 
 import random
 
+from cards import BASE_VALUE, DECK
+from config import GameConfig
+# Result codes live in results.py (shared with rules.py) and are re-exported here
+from results import EMPATE, JOGADOR, OPONENTE, RESULT_NAMES
+from rules import get_variant
+
+# Round labels used by the controllers ("Você" is the player in the UI)
+_LABEL_CODES = {"Empate": EMPATE, "Jogador": JOGADOR, "Você": JOGADOR, "Oponente": OPONENTE}
+
+# Hand automaton states: result prefixes of 0-2 rounds, state (3**k - 1) // 2 + prefix
+HAND_START = 0
+HAND_END = 13  # HAND_END + code (EMPATE = void, JOGADOR, OPONENTE): the hand is over
+
+
+def _hand_outcome(codes):
+    """
+    Apply the truco hand rules to a round result sequence.
+
+    Returns:
+        int or None: Winner code (EMPATE if void) once decided, else None
+    """
+    vitorias = [codes.count(code) for code in (EMPATE, JOGADOR, OPONENTE)]
+    for lado in (JOGADOR, OPONENTE):
+        # Two wins, or one win plus a tie in the first two rounds
+        if vitorias[lado] >= 2 or (len(codes) == 2 and vitorias[lado] == 1 and vitorias[EMPATE] == 1):
+            return lado
+    if len(codes) < 3:
+        return None
+    if vitorias[JOGADOR] != vitorias[OPONENTE]:
+        return JOGADOR if vitorias[JOGADOR] > vitorias[OPONENTE] else OPONENTE
+    # Level on wins: the first round won decides, or the hand is void
+    return next((code for code in codes if code != EMPATE), EMPATE)
+
+
+def _compile_hand_automaton():
+    """
+    Compile the hand rules into HAND_STEP[state * 3 + code] -> next state.
+
+    Returns:
+        tuple: 39 transitions (13 prefix states x 3 round results)
+    """
+    step = []
+    for state in range(HAND_END):
+        rodadas = 0 if state == 0 else 1 if state < 4 else 2
+        prefix = state - (3 ** rodadas - 1) // 2
+        codes = [(prefix // 3 ** (rodadas - 1 - i)) % 3 for i in range(rodadas)]
+        for code in (EMPATE, JOGADOR, OPONENTE):
+            outcome = _hand_outcome(codes + [code])
+            if outcome is not None:
+                step.append(HAND_END + outcome)
+            else:
+                step.append((3 ** (rodadas + 1) - 1) // 2 + prefix * 3 + code)
+    return tuple(step)
+
+
+HAND_STEP = _compile_hand_automaton()
+
+
+def hand_message(codes):
+    """
+    Describe a finished hand for the UI.
+
+    Args:
+        codes (sequence): Round result codes of the hand, in order
+
+    Returns:
+        str: Portuguese message for the hand result
+    """
+    rodadas = len(codes)
+    vitorias_jogador = sum(code == JOGADOR for code in codes)
+    vitorias_oponente = sum(code == OPONENTE for code in codes)
+    vencedor = _hand_outcome(list(codes))
+    quem = "Você" if vencedor == JOGADOR else "Oponente"
+    if rodadas == 2:
+        if max(vitorias_jogador, vitorias_oponente) >= 2:
+            return f"{quem} venceu a mão (2 rodadas)!"
+        return f"{quem} venceu a mão (1 vitória + empate)!"
+    if vitorias_jogador > vitorias_oponente:
+        return f"Você venceu a mão ({vitorias_jogador}-{vitorias_oponente})!"
+    if vitorias_oponente > vitorias_jogador:
+        return f"Oponente venceu a mão ({vitorias_oponente}-{vitorias_jogador})!"
+    if vencedor == EMPATE:
+        return "Mão completamente empatada!"
+    return f"{quem} venceu a mão (empate decidido pela primeira vitória)!"
+
 
 class GameCore:
     """
@@ -21,11 +109,30 @@ class GameCore:
     It can be used for testing, different UI implementations, or AI training.
     """
     
-    def __init__(self):
-        """Initialize the core game components."""
-        # Card-related attributes
+    def __init__(self, rng=None, variant=None):
+        """
+        Initialize the core game components.
+        
+        Args:
+            rng (random.Random, optional): Generator owned by this table
+                (see rng.py); a fresh unseeded one is created if omitted
+            variant (RuleVariant or str, optional): Rule variant (see rules.py);
+                defaults to GameConfig.RULE_VARIANT
+        """
+        self.rng = rng if rng is not None else random.Random()
+        
+        # Compiled rules of this table's variant
+        if variant is None or isinstance(variant, str):
+            variant = get_variant(variant or GameConfig.RULE_VARIANT)
+        self.variant = variant
+        self.strength = variant.strength
+        self._strength_np = None  # NumPy copy for the batch helpers, built on first use
+        
+        # Card-related attributes: one preallocated buffer reused for every hand,
+        # plus a read cursor marking the next card to deal
         self.baralho = self.create_baralho()
-        self.baralho_original = self.baralho.copy()
+        self._baralho_view = memoryview(self.baralho).toreadonly()
+        self.cursor = 0
         
         # Game state attributes
         self.pontos_jogador = 0
@@ -39,29 +146,64 @@ class GameCore:
         """
         Create a standard Truco deck of 40 cards.
         
-        Uses Unicode suit symbols for better display.
-        Cards are ordered by value within each suit.
+        Cards are integer ids ordered by rank, then suit (see cards.py).
         
         Returns:
-            list: Complete deck of 40 cards with format 'RankSuit' (e.g., '4♣', 'A♠')
+            bytearray: Complete deck of 40 card ids (0-39) as a compact buffer
         """
-        return ['4♣', '5♣', '6♣', '7♣', 'Q♣', 'J♣', 'K♣', 'A♣', '2♣', '3♣',
-                '4♥', '5♥', '6♥', '7♥', 'Q♥', 'J♥', 'K♥', 'A♥', '2♥', '3♥',
-                '4♦', '5♦', '6♦', '7♦', 'Q♦', 'J♦', 'K♦', 'A♦', '2♦', '3♦',
-                '4♠', '5♠', '6♠', '7♠', 'Q♠', 'J♠', 'K♠', 'A♠', '2♠', '3♠']
+        return bytearray(DECK)
     
     def reiniciar_baralho(self):
         """
-        Reset the deck to its original state and shuffle it.
+        Rewind the deal cursor so the buffer can be reshuffled for a new hand.
         
-        This should be called at the beginning of each hand.
+        This should be called at the beginning of each hand. Dealt cards are
+        never removed from the buffer, so no new deck has to be allocated; the
+        shuffle itself happens lazily, one position per dealt card (embaralhar).
         """
-        self.baralho = self.baralho_original.copy()
-        self.embaralhar()
+        self.cursor = 0
     
-    def embaralhar(self):
-        """Shuffle the current deck randomly."""
-        random.shuffle(self.baralho)
+    def embaralhar(self, quantidade=None):
+        """
+        Shuffle cards into the next positions past the cursor, in place.
+        
+        Each position is drawn uniformly from the cards at or past it (one
+        Fisher-Yates step per position), so only the cards about to be dealt
+        cost a swap. The cursor does not move.
+        
+        Args:
+            quantidade (int, optional): Positions to settle; all remaining
+                cards if omitted (a full shuffle of the undealt deck)
+            
+        Returns:
+            int: Buffer position just past the last settled card
+        """
+        baralho = self.baralho
+        total = len(baralho)
+        inicio = self.cursor
+        fim = total if quantidade is None else min(inicio + quantidade, total)
+        aleatorio = self.rng.random
+        for i in range(inicio, fim):
+            j = i + int(aleatorio() * (total - i))
+            baralho[i], baralho[j] = baralho[j], baralho[i]
+        return fim
+    
+    def distribuir_posicao(self, quantidade):
+        """
+        Deal cards without creating any object for them.
+        
+        Args:
+            quantidade (int): Number of cards to deal
+            
+        Returns:
+            int: Buffer position of the first dealt card; the hand is
+            self.baralho[inicio:self.cursor] (fewer cards if the deck runs
+            out). Read the cards in place (see sim/engine.py); the buffer
+            must not be written to.
+        """
+        inicio = self.cursor
+        self.cursor = self.embaralhar(quantidade)
+        return inicio
     
     def distribuir_cartas(self, quantidade):
         """
@@ -71,67 +213,56 @@ class GameCore:
             quantidade (int): Number of cards to deal
             
         Returns:
-            list: List of cards dealt from the deck
+            memoryview: Read-only view of the dealt card ids (fewer cards if
+            the deck runs out)
             
         Note:
-            Cards are removed from self.baralho when dealt.
+            The deck itself is never copied, but the view is one small
+            object per call; use distribuir_posicao where even that matters.
+            The view points into the deck buffer and is overwritten by later
+            hands, so copy it (e.g. with list()) if the cards must outlive the
+            hand or be mutated.
         """
-        cartas = []
-        for _ in range(quantidade):
-            if self.baralho:
-                cartas.append(self.baralho.pop(0))
-        return cartas
+        inicio = self.distribuir_posicao(quantidade)
+        return self._baralho_view[inicio:self.cursor]
     
     def determinar_manilha(self):
         """
         Determine the 'vira' card and corresponding manilha rank.
         
-        In Truco, a random card is turned face up (vira), and the next rank
-        in sequence becomes the manilha (trump card).
+        In Paulista Truco, a random card is turned face up (vira), and the next
+        rank in sequence becomes the manilha (trump card). Other variants may
+        use fixed manilhas and no vira (see rules.py).
         
         Returns:
             tuple: (carta_vira, manilha_rank)
-                - carta_vira (str): The face-up card that determines the manilha
-                - manilha_rank (str): The rank that becomes the manilha (4, 5, 6, 7, Q, J, K, A, 2, 3)
+                - carta_vira (int): Card id of the face-up card that determines
+                  the manilha (None if the variant has no vira)
+                - manilha_rank (int): Manilha key of the variant; under Paulista,
+                  the rank index (0-9) that becomes the manilha
         """
-        # Card ranks in order
-        valores = ['4', '5', '6', '7', 'Q', 'J', 'K', 'A', '2', '3']
-        naipes = ['♦', '♠', '♥', '♣']
-        
-        # Choose a random card as "vira"
-        naipe_vira = random.choice(naipes)
-        valor_vira = random.choice(valores)
-        carta_vira = valor_vira + naipe_vira
-        
-        # Determine the manilha rank (next rank after the vira)
-        indice_atual = valores.index(valor_vira)
-        indice_manilha = (indice_atual + 1) % len(valores)
-        manilha = valores[indice_manilha]
-        
-        return carta_vira, manilha
+        return self.variant.draw_manilha(self.rng)
     
     def valor_carta(self, carta):
         """
         Get the base value of a card (without considering manilha status).
         
         Args:
-            carta (str): Card in format 'RankSuit' (e.g., '7♠', 'A♥')
+            carta (int): Card id (0-39)
             
         Returns:
             int: Base value from 1 (lowest: 4) to 10 (highest: 3)
         """
-        # Card values in ascending order
-        valores = {'4': 1, '5': 2, '6': 3, '7': 4, 'Q': 5, 'J': 6, 'K': 7, 'A': 8, '2': 9, '3': 10}
-        return valores.get(carta[0], 0)
+        return BASE_VALUE[carta]
     
     def vencedor_rodada(self, carta_jogador, carta_oponente, manilha):
         """
         Determine the winner of a single round based on card values and manilha rules.
         
         Args:
-            carta_jogador (str): Player's card
-            carta_oponente (str): Opponent's card
-            manilha (str): Current manilha rank (e.g., 'A', '7', 'Q')
+            carta_jogador (int): Player's card id
+            carta_oponente (int): Opponent's card id
+            manilha (int): Current manilha key (the rank index 0-9 under Paulista)
             
         Returns:
             str: 'Jogador', 'Oponente', or 'Empate' (tie)
@@ -141,37 +272,72 @@ class GameCore:
             - Between manilhas, suit order determines winner: ♣ > ♥ > ♠ > ♦
             - Between regular cards, higher rank wins
             - If same rank and both non-manilha, it's a tie
+            
+        All rules are baked into the variant's precomputed strength table, so
+        a round costs two lookups and a comparison.
         """
-        valor_jogador = self.valor_carta(carta_jogador)
-        valor_oponente = self.valor_carta(carta_oponente)
-        
-        # Check if cards are manilhas and add bonus value
-        if carta_jogador[0] == manilha:
-            valor_jogador += 10
-        if carta_oponente[0] == manilha:
-            valor_oponente += 10
+        forca = self.strength[manilha]
+        valor_jogador = forca[carta_jogador]
+        valor_oponente = forca[carta_oponente]
         
         if valor_jogador > valor_oponente:
             return "Jogador"
         elif valor_oponente > valor_jogador:
             return "Oponente"
-        else:
-            # Tie: check suit order only if both cards are manilhas
-            if carta_jogador[0] == manilha and carta_oponente[0] == manilha:
-                # Manilha suit hierarchy: ♣ > ♥ > ♠ > ♦
-                hierarchy = {'♣': 4, '♥': 3, '♠': 2, '♦': 1}
-                suit_jogador = hierarchy.get(carta_jogador[1], 0)
-                suit_oponente = hierarchy.get(carta_oponente[1], 0)
-                
-                if suit_jogador > suit_oponente:
-                    return "Jogador"
-                elif suit_oponente > suit_jogador:
-                    return "Oponente"
-                else:
-                    return "Empate"
-            else:
-                # Regular tie between non-manilhas
-                return "Empate"
+        return "Empate"
+    
+    def vencedor_rodada_times(self, cartas, manilha, primeiro=0):
+        """
+        Determine the winner of a round with any even number of seats (e.g. 2v2).
+
+        Args:
+            cartas (sequence): Card ids in play order
+            manilha (int): Current manilha key (the rank index 0-9 under Paulista)
+            primeiro (int): Seat that played the first card; seats alternate
+                teams, even seats on the 'Jogador' side
+
+        Returns:
+            tuple: (code, seat)
+                - code (int): JOGADOR, OPONENTE or EMPATE (the best cards of the
+                  two teams tie; partners tying each other does not count)
+                - seat (int): Seat holding the round's best card, earliest on
+                  ties (the first seat, primeiro, on EMPATE)
+
+        One pass over the cards keeps each team's best strength, so a round
+        costs one lookup per card whatever the number of seats.
+        """
+        forca = self.strength[manilha]
+        n = len(cartas)
+        melhor = [-1, -1]
+        assento = [primeiro, primeiro]
+        seat = primeiro
+        for carta in cartas:
+            valor = forca[carta]
+            equipe = seat & 1
+            if valor > melhor[equipe]:
+                melhor[equipe] = valor
+                assento[equipe] = seat
+            seat = seat + 1 if seat + 1 < n else 0
+        if melhor[0] > melhor[1]:
+            return JOGADOR, assento[0]
+        if melhor[1] > melhor[0]:
+            return OPONENTE, assento[1]
+        return EMPATE, primeiro
+
+    def vencedor_rodada_batch(self, cartas_jogador, cartas_oponente, manilhas):
+        """
+        Vectorized version of vencedor_rodada for many rounds at once.
+        
+        Requires NumPy; see sim/batch.py for details.
+        
+        Returns:
+            numpy.ndarray: Result codes (EMPATE, JOGADOR or OPONENTE) per round
+        """
+        import numpy as np
+        from sim.batch import vencedor_rodada_batch
+        if self._strength_np is None:
+            self._strength_np = np.asarray(self.strength, dtype=np.int8)
+        return vencedor_rodada_batch(cartas_jogador, cartas_oponente, manilhas, self._strength_np)
     
     def check_hand_winner(self, rodada, resultados_rodadas, vitorias_jogador, vitorias_oponente, primeira_vitoria):
         """
@@ -193,45 +359,32 @@ class GameCore:
             - First to win 2 rounds wins the hand
             - If first round is won and second is tied, first round winner wins
             - If all rounds are tied, primeira_vitoria determines winner
-        """
-        if rodada == 0:
-            # After first round, can only end if someone won
-            if vitorias_jogador >= 2:
-                return True, "Você venceu a mão (2-0)!"
-            elif vitorias_oponente >= 2:
-                return True, "Oponente venceu a mão (2-0)!"
-            
-        elif rodada == 1:
-            # After second round, check for decisive victories or special cases
-            if vitorias_jogador >= 2:
-                return True, "Você venceu a mão (2 rodadas)!"
-            elif vitorias_oponente >= 2:
-                return True, "Oponente venceu a mão (2 rodadas)!"
-            elif vitorias_jogador == 1 and vitorias_oponente == 0 and "Empate" in resultados_rodadas:
-                # Player won first round, second was tie -> player wins
-                return True, "Você venceu a mão (1 vitória + empate)!"
-            elif vitorias_oponente == 1 and vitorias_jogador == 0 and "Empate" in resultados_rodadas:
-                # Opponent won first round, second was tie -> opponent wins
-                return True, "Oponente venceu a mão (1 vitória + empate)!"
-                
-        elif rodada == 2:
-            # After third round, determine final winner
-            if vitorias_jogador > vitorias_oponente:
-                return True, f"Você venceu a mão ({vitorias_jogador}-{vitorias_oponente})!"
-            elif vitorias_oponente > vitorias_jogador:
-                return True, f"Oponente venceu a mão ({vitorias_oponente}-{vitorias_jogador})!"
-            else:
-                # All rounds were ties, use primeira_vitoria as tiebreaker
-                if primeira_vitoria == "Jogador":
-                    return True, "Você venceu a mão (empate decidido pela primeira vitória)!"
-                elif primeira_vitoria == "Oponente":
-                    return True, "Oponente venceu a mão (empate decidido pela primeira vitória)!"
-                else:
-                    return True, "Mão completamente empatada!"
         
+        The rules are compiled into HAND_STEP, so this walks one table
+        lookup per round; the message is only built once the hand is over.
+        The counters are implied by the results and kept for compatibility.
+        """
+        state = HAND_START
+        codes = [_LABEL_CODES[label] for label in resultados_rodadas[:rodada + 1]]
+        for code in codes:
+            state = HAND_STEP[state * 3 + code]
+            if state >= HAND_END:
+                return True, hand_message(codes)
         # Hand should continue
         return False, None
     
+    def check_hand_winner_batch(self, resultados, hand_values=1):
+        """
+        Vectorized hand resolution for many three-round result arrays.
+        
+        Requires NumPy; see sim/batch.py for details.
+        
+        Returns:
+            tuple: (winners, points, rounds_played) NumPy arrays
+        """
+        from sim.batch import check_hand_winner_batch
+        return check_hand_winner_batch(resultados, hand_values)
+    
     def reset_game_state(self):
         """
         Reset the game state for a new game.
@@ -0,0 +1,15 @@
+"""
+Result Codes Module for Truco 2000
+
+Numeric round/hand result codes shared by the rules, the core and the
+simulation / solver code:
+- EMPATE (tie, or a void hand), JOGADOR and OPONENTE
+- RESULT_NAMES: the TrucoLogic / GameCore name of each code
+
+Kept in their own module so rules.py and game_core.py can both import them.
+"""
+
+EMPATE = 0
+JOGADOR = 1
+OPONENTE = 2
+RESULT_NAMES = ("Empate", "Jogador", "Oponente")
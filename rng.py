@@ -0,0 +1,85 @@
+"""
+Random Stream Module for Truco 2000
+
+This module builds the per-instance random number generators used by the
+game objects:
+- One root NumPy SeedSequence per run, built from a single seed
+- Independent child streams spawned for tables and worker processes
+- random.Random / numpy Generator instances seeded from those streams
+
+Every GameCore, TrucoLogic and AI opponent owns its own generator instead
+of sharing the global `random` module, so a run reproduces exactly from its
+seed and forked workers never share a stream. NumPy is only needed when a
+seed is given; unseeded tables fall back to OS-entropy random.Random().
+"""
+
+import random
+
+# Streams spawned per table, in this order
+TABLE_STREAMS = ("core", "truco", "opponent")
+
+
+def seed_sequence(seed=None):
+    """
+    Return a NumPy SeedSequence for the given seed.
+
+    Args:
+        seed (int, SeedSequence or None): Root seed; None draws OS entropy
+
+    Returns:
+        numpy.random.SeedSequence: The root sequence (passed through if given)
+    """
+    from numpy.random import SeedSequence
+    if isinstance(seed, SeedSequence):
+        return seed
+    return SeedSequence(seed)
+
+
+def spawn_seeds(seed, n):
+    """
+    Spawn n independent child sequences (e.g. one per worker process).
+
+    Args:
+        seed (int, SeedSequence or None): Root seed
+        n (int): Number of children
+
+    Returns:
+        list: n SeedSequence children
+    """
+    return seed_sequence(seed).spawn(n)
+
+
+def python_rng(seed=None):
+    """
+    Create a random.Random seeded from a SeedSequence stream.
+
+    Args:
+        seed (int, SeedSequence or None): Seed for this stream
+
+    Returns:
+        random.Random: Independent generator
+    """
+    state = seed_sequence(seed).generate_state(4)
+    return random.Random(int.from_bytes(state.tobytes(), "little"))
+
+
+def numpy_rng(seed=None):
+    """Create a numpy.random.Generator seeded from a SeedSequence stream."""
+    import numpy as np
+    return np.random.default_rng(seed_sequence(seed))
+
+
+def table_rngs(seed=None):
+    """
+    Create the generators owned by one table.
+
+    Args:
+        seed (int, SeedSequence or None): Table seed; None for unseeded play
+
+    Returns:
+        dict: random.Random per name in TABLE_STREAMS
+    """
+    if seed is None:
+        return {name: random.Random() for name in TABLE_STREAMS}
+    children = spawn_seeds(seed, len(TABLE_STREAMS))
+    return {name: python_rng(child) for name, child in zip(TABLE_STREAMS, children)}
@@ -0,0 +1,139 @@
+"""
+Rule Variants Module for Truco 2000
+
+Compiled card rules for each supported way of playing:
+- Paulista: a random "vira" is turned and the next rank becomes the
+  manilha (four manilhas, ranked by suit: ♣ > ♥ > ♠ > ♦)
+- Mineiro: no vira; the manilhas are always 4♣ > 7♥ > A♠ > 7♦
+
+Each variant compiles its rules once, from GameConfig.CARD_RANKS and
+GameConfig.SUIT_HIERARCHY, into lookup tables indexed by a manilha key
+(the manilha rank under Paulista, always 0 under Mineiro):
+- strength[key][card]: higher wins, equal strengths tie
+- results[key][carta_jogador * 40 + carta_oponente]: round result code
+
+Only drawing the manilha differs between variants, once per hand; rounds
+are the same table lookup whatever the variant, so hosting several
+variants adds no per-round branching.
+"""
+
+from abc import ABC, abstractmethod
+
+from cards import CARD_IDS, CARD_NAMES, DECK, NUM_CARDS, NUM_RANKS, RANKS, SUITS, rank_of
+from config import GameConfig
+from results import EMPATE, JOGADOR, OPONENTE
+
+
+def _rank_strengths():
+    """Regular strength (0 = weakest) of each card id, from GameConfig.CARD_RANKS."""
+    return tuple(GameConfig.CARD_RANKS.index(RANKS[rank_of(card)]) for card in DECK)
+
+
+def _compile_results(strength):
+    """Round result code of every (carta_jogador, carta_oponente) pair of a strength row."""
+    results = []
+    for carta_jogador in DECK:
+        forca_jogador = strength[carta_jogador]
+        for carta_oponente in DECK:
+            forca_oponente = strength[carta_oponente]
+            if forca_jogador > forca_oponente:
+                results.append(JOGADOR)
+            elif forca_oponente > forca_jogador:
+                results.append(OPONENTE)
+            else:
+                results.append(EMPATE)
+    return tuple(results)
+
+
+class RuleVariant(ABC):
+    """
+    Base class for a compiled rule variant.
+
+    Subclasses build `strength` (one row per manilha key) and implement
+    draw_manilha and manilha_label; the results tables are derived here.
+    """
+
+    name = "base"
+
+    def __init__(self, strength):
+        """
+        Args:
+            strength (sequence): One NUM_CARDS strength row per manilha key
+        """
+        self.strength = tuple(tuple(row) for row in strength)
+        self.results = tuple(_compile_results(row) for row in self.strength)
+
+    @abstractmethod
+    def draw_manilha(self, rng):
+        """
+        Pick the manilha for a new hand.
+
+        Returns:
+            tuple: (carta_vira, manilha key); carta_vira is None without a vira
+        """
+
+    @abstractmethod
+    def manilha_label(self, key):
+        """Display string for a manilha key."""
+
+
+class ViraManilhas(RuleVariant):
+    """Paulista rules: the rank after the vira is the manilha."""
+
+    name = "paulista"
+
+    def __init__(self):
+        regular = _rank_strengths()
+        topo = len(GameConfig.CARD_RANKS)
+        strength = []
+        for manilha in range(NUM_RANKS):
+            strength.append([
+                topo + GameConfig.SUIT_HIERARCHY[SUITS[card % len(SUITS)]] - 1 if rank_of(card) == manilha
+                else regular[card]
+                for card in DECK
+            ])
+        super().__init__(strength)
+
+    def draw_manilha(self, rng):
+        carta_vira = rng.randrange(NUM_CARDS)
+        return carta_vira, (rank_of(carta_vira) + 1) % NUM_RANKS
+
+    def manilha_label(self, key):
+        return RANKS[key]
+
+
+class FixedManilhas(RuleVariant):
+    """Fixed manilhas (Mineiro style): the same four cards every hand."""
+
+    def __init__(self, name, manilhas):
+        """
+        Args:
+            name (str): Variant name
+            manilhas (sequence): Manilha card names, strongest first
+        """
+        self.name = name
+        self.manilhas = tuple(CARD_IDS[carta] for carta in manilhas)
+        strength = list(_rank_strengths())
+        topo = len(GameConfig.CARD_RANKS)
+        for posicao, card in enumerate(self.manilhas):
+            strength[card] = topo + len(self.manilhas) - 1 - posicao
+        super().__init__([strength])
+
+    def draw_manilha(self, rng):
+        return None, 0
+
+    def manilha_label(self, key):
+        return " ".join(CARD_NAMES[card] for card in self.manilhas)
+
+
+PAULISTA = ViraManilhas()
+MINEIRO = FixedManilhas("mineiro", ("4♣", "7♥", "A♠", "7♦"))
+VARIANTS = {variant.name: variant for variant in (PAULISTA, MINEIRO)}
+
+
+def get_variant(name):
+    """Return the compiled variant called `name` (e.g. 'paulista', 'mineiro')."""
+    try:
+        return VARIANTS[name]
+    except KeyError:
+        raise ValueError(f"Unknown rule variant {name!r}; choose one of {', '.join(VARIANTS)}") from None
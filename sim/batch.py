@@ -0,0 +1,89 @@
+"""
+Batch Game Logic Module for Truco 2000
+
+Vectorized (NumPy) counterparts of the GameCore round and hand rules:
+- Resolve millions of rounds in one pass over the strength table
+- Fold three-round result arrays into hand winners and points
+
+Results use the numeric codes from game_core (EMPATE, JOGADOR, OPONENTE).
+The hand table is derived from GameCore's hand automaton (the same table
+behind check_hand_winner), so the batch path can never drift from the
+scalar rules.
+"""
+
+import numpy as np
+
+from cards import STRENGTH
+from game_core import EMPATE, HAND_END, HAND_START, HAND_STEP
+
+# Strength table as a (10, 40) array for fancy indexing
+STRENGTH_NP = np.asarray(STRENGTH, dtype=np.int8)
+
+
+def _build_hand_table():
+    """
+    Run GameCore's hand automaton (HAND_STEP) over all 27 three-round sequences.
+
+    Sequence (r0, r1, r2) is stored at index r0 * 9 + r1 * 3 + r2.
+    Rounds after the hand has ended are ignored, exactly like the
+    controllers stop playing once check_hand_winner says so.
+
+    Returns:
+        tuple: (winners, rounds_played) as int8 arrays of length 27
+    """
+    winners = np.zeros(27, dtype=np.int8)
+    rounds_played = np.zeros(27, dtype=np.int8)
+    for idx in range(27):
+        state = HAND_START
+        for rodada, code in enumerate((idx // 9, (idx // 3) % 3, idx % 3)):
+            state = HAND_STEP[state * 3 + code]
+            if state >= HAND_END:
+                break
+        winners[idx] = state - HAND_END
+        rounds_played[idx] = rodada + 1
+    return winners, rounds_played
+
+
+HAND_WINNER, HAND_ROUNDS = _build_hand_table()
+
+
+def vencedor_rodada_batch(cartas_jogador, cartas_oponente, manilhas, strength=STRENGTH_NP):
+    """
+    Decide many rounds at once.
+
+    Args:
+        cartas_jogador (array-like): Player card ids
+        cartas_oponente (array-like): Opponent card ids
+        manilhas (array-like or int): Manilha key per round (broadcast)
+        strength (numpy.ndarray): Strength table (default: Paulista, see
+            rules.py; GameCore passes its own variant's table)
+
+    Returns:
+        numpy.ndarray: int8 result codes (EMPATE, JOGADOR or OPONENTE)
+    """
+    manilhas = np.asarray(manilhas, dtype=np.intp)
+    forca_jogador = strength[manilhas, np.asarray(cartas_jogador, dtype=np.intp)]
+    forca_oponente = strength[manilhas, np.asarray(cartas_oponente, dtype=np.intp)]
+    # sign is 1 (player), -1 (opponent) or 0 (tie); mod 3 maps -1 to OPONENTE
+    return (np.sign(forca_jogador - forca_oponente) % 3).astype(np.int8)
+
+
+def check_hand_winner_batch(resultados, hand_values=1):
+    """
+    Fold three-round result arrays into hand outcomes.
+
+    Args:
+        resultados (array-like): (N, 3) round result codes
+        hand_values (array-like or int): Hand value (truco level) per hand
+
+    Returns:
+        tuple: (winners, points, rounds_played)
+            - winners (ndarray): int8 hand winner codes (EMPATE if void)
+            - points (ndarray): Points awarded to the winner (0 if void)
+            - rounds_played (ndarray): Rounds actually needed (2 or 3)
+    """
+    resultados = np.asarray(resultados, dtype=np.intp)
+    idx = resultados[:, 0] * 9 + resultados[:, 1] * 3 + resultados[:, 2]
+    winners = HAND_WINNER[idx]
+    points = np.where(winners != EMPATE, hand_values, 0)
+    return winners, points, HAND_ROUNDS[idx]
@@ -0,0 +1,416 @@
+"""
+Benchmark Module for Truco 2000
+
+Small, dependency-free benchmarks for the engine hot paths, plus
+cross-checks of optimized code against the implementations it replaced.
+
+Run with:
+    python -m sim.benchmarks
+"""
+
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from itertools import permutations
+
+from ai.init_ram import InitRam
+from cards import CARD_NAMES, DECK, HANDS, RANKS
+from config import GameConfig
+from game_core import EMPATE, JOGADOR, OPONENTE, RESULT_NAMES, GameCore
+from truco_logic import NEGOTIATION_STATES, TrucoEnd, TrucoLogic, truco_step
+
+
+def _legacy_hand(baralho_original):
+    """Deal one hand the pre-cursor way: copy the deck, shuffle, pop(0)."""
+    baralho = list(baralho_original)
+    random.shuffle(baralho)
+    maos = []
+    for _ in range(2):
+        cartas = []
+        for _ in range(GameConfig.CARDS_PER_HAND):
+            cartas.append(baralho.pop(0))
+        maos.append(cartas)
+    return baralho, maos
+
+
+def _core_hand(core):
+    """Deal one hand through GameCore's buffer + cursor lifecycle."""
+    core.reiniciar_baralho()
+    mao_jogador = core.distribuir_cartas(GameConfig.CARDS_PER_HAND)
+    mao_oponente = core.distribuir_cartas(GameConfig.CARDS_PER_HAND)
+    return mao_jogador, mao_oponente
+
+
+def _cursor_hand(core):
+    """Deal one hand the way the engines do: buffer positions only, no views."""
+    core.reiniciar_baralho()
+    core.distribuir_posicao(GameConfig.CARDS_PER_HAND)
+    return core.distribuir_posicao(GameConfig.CARDS_PER_HAND)
+
+
+def _legacy_hand_strength(hand, manilha):
+    """InitRam hand classification the pre-mask way (substring scans)."""
+    strong_count = sum(1 for card in hand if any(rank in card for rank in ["3", "2", "A", manilha]))
+    weak_count = sum(1 for card in hand if any(rank in card for rank in ["4", "5", "6", "7"]))
+    if strong_count >= 2 or manilha in "".join(hand):
+        return "high"
+    elif strong_count >= 1 and weak_count <= 1:
+        return "medium"
+    return "low"
+
+
+def _legacy_strongest(hand, manilha):
+    for i, card in enumerate(hand):
+        if manilha in card:
+            return i
+    rank_order = {"3": 10, "2": 9, "A": 8, "K": 7, "J": 6, "Q": 5}
+    return max(range(len(hand)), key=lambda i: rank_order.get(hand[i][0], 0))
+
+
+def _legacy_medium(hand):
+    for i, card in enumerate(hand):
+        if any(rank in card for rank in ["3", "2", "A"]):
+            return i
+    return 0
+
+
+def _legacy_weakest(hand):
+    rank_order = {"3": 10, "2": 9, "A": 8, "K": 7, "J": 6, "Q": 5, "7": 4, "6": 3, "5": 2, "4": 1}
+    return min(range(len(hand)), key=lambda i: rank_order.get(hand[i][0], 0))
+
+
+def _legacy_check_hand_winner(rodada, resultados_rodadas, vitorias_jogador, vitorias_oponente, primeira_vitoria):
+    """GameCore.check_hand_winner the pre-automaton way (nested branches)."""
+    if rodada == 0:
+        # After first round, can only end if someone won
+        if vitorias_jogador >= 2:
+            return True, "Você venceu a mão (2-0)!"
+        elif vitorias_oponente >= 2:
+            return True, "Oponente venceu a mão (2-0)!"
+        
+    elif rodada == 1:
+        # After second round, check for decisive victories or special cases
+        if vitorias_jogador >= 2:
+            return True, "Você venceu a mão (2 rodadas)!"
+        elif vitorias_oponente >= 2:
+            return True, "Oponente venceu a mão (2 rodadas)!"
+        elif vitorias_jogador == 1 and vitorias_oponente == 0 and "Empate" in resultados_rodadas:
+            # Player won first round, second was tie -> player wins
+            return True, "Você venceu a mão (1 vitória + empate)!"
+        elif vitorias_oponente == 1 and vitorias_jogador == 0 and "Empate" in resultados_rodadas:
+            # Opponent won first round, second was tie -> opponent wins
+            return True, "Oponente venceu a mão (1 vitória + empate)!"
+            
+    elif rodada == 2:
+        # After third round, determine final winner
+        if vitorias_jogador > vitorias_oponente:
+            return True, f"Você venceu a mão ({vitorias_jogador}-{vitorias_oponente})!"
+        elif vitorias_oponente > vitorias_jogador:
+            return True, f"Oponente venceu a mão ({vitorias_oponente}-{vitorias_jogador})!"
+        else:
+            # All rounds were ties, use primeira_vitoria as tiebreaker
+            if primeira_vitoria == "Jogador":
+                return True, "Você venceu a mão (empate decidido pela primeira vitória)!"
+            elif primeira_vitoria == "Oponente":
+                return True, "Oponente venceu a mão (empate decidido pela primeira vitória)!"
+            else:
+                return True, "Mão completamente empatada!"
+    
+    # Hand should continue
+    return False, None
+
+
+def check_hand_automaton():
+    """
+    Cross-check GameCore.check_hand_winner (HAND_STEP) against the branchy version.
+
+    Walks every result sequence of 1-3 rounds, with both controller label
+    styles, until the legacy function ends the hand.
+
+    Returns:
+        tuple: (calls compared, list of mismatching label sequences)
+    """
+    core = GameCore()
+    casos = 0
+    erros = []
+    for rotulos in (RESULT_NAMES, ("Empate", "Você", "Oponente")):
+        for rodadas in range(1, 4):
+            for idx in range(3 ** rodadas):
+                codes = [(idx // 3 ** (rodadas - 1 - i)) % 3 for i in range(rodadas)]
+                resultados = []
+                primeira_vitoria = None
+                for rodada, code in enumerate(codes):
+                    resultados.append(rotulos[code])
+                    if code != EMPATE and primeira_vitoria is None:
+                        primeira_vitoria = RESULT_NAMES[code]
+                    args = (rodada, resultados, codes[:rodada + 1].count(JOGADOR),
+                            codes[:rodada + 1].count(OPONENTE), primeira_vitoria)
+                    esperado = _legacy_check_hand_winner(*args)
+                    casos += 1
+                    if core.check_hand_winner(*args) != esperado:
+                        erros.append(list(resultados))
+                    if esperado[0]:
+                        break
+    return casos, erros
+
+
+def check_init_ram_masks():
+    """
+    Cross-check InitRam's mask-based classification against the string scans.
+
+    Runs every ordering of every 1-3 card hand under every manilha through
+    hand strength and the three card picks.
+
+    Returns:
+        tuple: (cases checked, list of mismatching (manilha, hand) pairs)
+    """
+    ai = InitRam()
+    maos = [(card,) for card in DECK] + list(permutations(DECK, 2))
+    maos += [ordem for hand in HANDS for ordem in permutations(hand)]
+    erros = []
+    for manilha in RANKS:
+        for mao in maos:
+            hand = [CARD_NAMES[card] for card in mao]
+            if (ai._evaluate_hand_strength(hand, manilha) != _legacy_hand_strength(hand, manilha)
+                    or ai._pick_strongest_card(hand, manilha) != _legacy_strongest(hand, manilha)
+                    or ai._pick_medium_card(hand, manilha) != _legacy_medium(hand)
+                    or ai._pick_weakest_card(hand) != _legacy_weakest(hand)):
+                erros.append((manilha, hand))
+    return len(RANKS) * len(maos), erros
+
+
+def _measure(deal, hands):
+    """
+    Measure a deal function.
+
+    Returns:
+        dict: blocks allocated and kept alive per hand, peak bytes per hand,
+        and hands per second
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        # Blocks that each hand keeps alive while it is being played
+        blocks = 0
+        for _ in range(hands):
+            antes = sys.getallocatedblocks()
+            resultado = deal()
+            blocks += sys.getallocatedblocks() - antes
+            del resultado
+
+        # Peak transient memory of a single hand
+        tracemalloc.start()
+        deal()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        resultado = deal()
+        peak = tracemalloc.get_traced_memory()[1] - base
+        del resultado
+        tracemalloc.stop()
+
+        inicio = time.perf_counter()
+        for _ in range(hands):
+            deal()
+        elapsed = time.perf_counter() - inicio
+    finally:
+        gc.enable()
+    return {
+        "blocks_per_hand": blocks / hands,
+        "peak_bytes_per_hand": peak,
+        "hands_per_sec": hands / elapsed,
+    }
+
+
+def benchmark_hand_allocations(hands=20000):
+    """
+    Compare allocations per hand of the legacy deal against GameCore.
+
+    'core' deals memoryviews (distribuir_cartas, one view object per hand
+    dealt); 'cursor' deals buffer positions (distribuir_posicao), as the
+    headless engines do.
+
+    Args:
+        hands (int): Hands to deal per measurement
+
+    Returns:
+        dict: {'legacy': {...}, 'core': {...}, 'cursor': {...}} measurements
+    """
+    baralho_original = list(DECK)
+    core = GameCore()
+    return {
+        "legacy": _measure(lambda: _legacy_hand(baralho_original), hands),
+        "core": _measure(lambda: _core_hand(core), hands),
+        "cursor": _measure(lambda: _cursor_hand(core), hands),
+    }
+
+
+def _legacy_handle_truco_sequence(truco, initiator, current_value, input_handler, ui_handler):
+    """TrucoLogic.handle_truco_sequence as it was before truco_step (same arguments and return)."""
+    raiser = initiator
+    value = current_value
+    last_accepted_value = truco.current_hand_value
+
+    while value <= 12:
+        if raiser == "Oponente":
+            # Get player's response to opponent's truco
+            response = input_handler.get_truco_response(value, raiser, truco.truco_names)
+
+            if response == 'run':
+                # Player ran away
+                return False, value, "Jogador", raiser, last_accepted_value
+            elif response == 'accept':
+                # Player accepted
+                return True, value, None, raiser, value
+            elif response == 'reraise':
+                # Player wants to reraise
+                last_accepted_value = value
+                next_value = truco.get_next_truco_value(value)
+                if next_value is None or next_value > 12:
+                    # Cannot reraise further, must accept
+                    return True, value, None, raiser, value
+
+                # Show player's reraise
+                ui_handler.show_truco_call("Jogador", next_value, truco.truco_names)
+
+                # Update state for next iteration
+                raiser = "Jogador"
+                value = next_value
+        else:
+            # Get opponent's response to player's truco
+            response = truco.get_opponent_truco_response(value)
+
+            if response == 'run':
+                # Opponent ran away
+                ui_handler.show_opponent_runs(value, truco.truco_names)
+                return False, value, "Oponente", raiser, last_accepted_value
+            elif response == 'accept':
+                # Opponent accepted
+                ui_handler.show_truco_acceptance("Oponente", value, truco.truco_names)
+                return True, value, None, raiser, value
+            elif response == 'reraise':
+                # Opponent wants to reraise
+                last_accepted_value = value
+                next_value = truco.get_next_truco_value(value)
+                if next_value is None or next_value > 12:
+                    # Cannot reraise further, must accept
+                    ui_handler.show_truco_acceptance("Oponente", value, truco.truco_names)
+                    return True, value, None, raiser, value
+
+                # Show opponent's reraise
+                ui_handler.show_truco_call("Oponente", next_value, truco.truco_names)
+
+                # Update state for next iteration
+                raiser = "Oponente"
+                value = next_value
+
+    # Should never reach here, but safety fallback
+    return True, value, None, raiser, last_accepted_value
+
+
+class _ScriptedTable:
+    """Console stand-in for a negotiation: both sides answer from one script, shown calls are recorded."""
+
+    def __init__(self, respostas):
+        self.respostas = iter(respostas)
+        self.mostrado = []
+
+    def get_truco_response(self, value, raiser, truco_names):
+        return next(self.respostas)
+
+    def get_opponent_truco_response(self, value):
+        return next(self.respostas)
+
+    def show_truco_call(self, who, value, truco_names):
+        self.mostrado.append(("call", who, value))
+
+    def show_truco_acceptance(self, who, value, truco_names):
+        self.mostrado.append(("accept", who, value))
+
+    def show_opponent_runs(self, value, truco_names):
+        self.mostrado.append(("run", value))
+
+
+def _scripted_sequence(sequence, truco, initiator, respostas):
+    """Run a handle_truco_sequence-style loop with scripted answers; return (result, shown calls)."""
+    mesa = _ScriptedTable(respostas)
+    truco.get_opponent_truco_response = mesa.get_opponent_truco_response
+    resultado = sequence(truco, initiator, truco.get_next_truco_value(), mesa, mesa)
+    return resultado, mesa.mostrado
+
+
+def _kernel_outcome(inicio, initiator, respostas):
+    """Play the answers through truco_step alone: ("run", winner, points) or ("accept", value, raiser)."""
+    state = truco_step(*inicio, initiator, "raise")
+    quem = initiator
+    for resposta in respostas:
+        quem = "Oponente" if quem == "Jogador" else "Jogador"
+        state = truco_step(*state, quem, resposta)
+        if isinstance(state, TrucoEnd):
+            return "run", state.winner, state.points
+        if not state.pending:
+            return "accept", state.value, state.last_raiser
+    return None
+
+
+def check_truco_kernel():
+    """
+    Cross-check the truco_step kernel against the pre-kernel handle_truco_sequence.
+
+    From every settled negotiation state, each side allowed to raise (per
+    TrucoLogic.can_raise_truco) raises and every sequence of four scripted
+    answers (enough to reach 12) is played out on the old loop and on:
+    - TrucoLogic.handle_truco_sequence: same return tuple and same
+      reraise / acceptance / run calls shown to the UI
+    - truco_step alone, as the engines and UIController drive it: same
+      winner and points after a run, same value and raiser after an accept
+
+    Returns:
+        tuple: (negotiations compared, list of mismatching (state, raiser, answers))
+    """
+    casos = 0
+    erros = []
+    for inicio in NEGOTIATION_STATES:
+        if inicio.pending:
+            continue
+        for raiser in ("Jogador", "Oponente"):
+            truco = TrucoLogic()
+            truco.update_truco_state(inicio.value, inicio.last_raiser)
+            if not truco.can_raise_truco(raiser):
+                if truco_step(*inicio, raiser, "raise") is not None:
+                    erros.append((inicio, raiser, ()))
+                continue
+            for idx in range(3 ** 4):
+                respostas = tuple(("accept", "run", "reraise")[(idx // 3 ** i) % 3] for i in range(4))
+                esperado = _scripted_sequence(_legacy_handle_truco_sequence, truco, raiser, respostas)
+                obtido = _scripted_sequence(TrucoLogic.handle_truco_sequence, truco, raiser, respostas)
+                accepted, final_value, who_ran, final_raiser, last_accepted_value = esperado[0]
+                if accepted:
+                    desfecho = ("accept", final_value, final_raiser)
+                else:
+                    desfecho = ("run", *truco.calculate_points_for_runner(who_ran, final_value, last_accepted_value))
+                casos += 1
+                if obtido != esperado or _kernel_outcome(inicio, raiser, respostas) != desfecho:
+                    erros.append((inicio, raiser, respostas))
+    return casos, erros
+
+
+if __name__ == "__main__":
+    for nome, stats in benchmark_hand_allocations().items():
+        print(
+            f"{nome:>6}: {stats['blocks_per_hand']:.2f} blocks/hand, "
+            f"{stats['peak_bytes_per_hand']} peak bytes/hand, "
+            f"{stats['hands_per_sec']:,.0f} hands/s"
+        )
+    falhas = 0
+    casos, erros = check_hand_automaton()
+    print(f"Hand automaton: {casos} calls, {len(erros)} mismatches")
+    falhas += len(erros)
+    casos, erros = check_init_ram_masks()
+    print(f"InitRam masks: {casos:,} cases, {len(erros)} mismatches")
+    falhas += len(erros)
+    casos, erros = check_truco_kernel()
+    print(f"Truco kernel: {casos:,} negotiations, {len(erros)} mismatches")
+    falhas += len(erros)
+    sys.exit(1 if falhas else 0)
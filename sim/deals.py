@@ -0,0 +1,141 @@
+"""
+Batched Deal Generation Module for Truco 2000
+
+Produces many shuffled deals at once for simulations:
+- N deals as an (N, 40) matrix of card-id permutations from a NumPy Generator
+- Vira, both hands and the remaining deck exposed as array slices (no copies)
+- Optional background prefetch pool so servers never wait on shuffling
+
+Deal layout per row: [vira, player x3, opponent x3, remaining deck...].
+
+Paulista only: every deal turns a vira and DealBatch.manilhas applies the
+next-rank rule (rules.PAULISTA). Mineiro turns no vira and always uses
+manilha key 0, so its deals would need neither.
+"""
+
+import queue
+import threading
+
+import numpy as np
+
+from cards import DECK, NUM_RANKS, NUM_SUITS
+from config import GameConfig
+
+_DECK_NP = np.asarray(DECK, dtype=np.int8)
+
+_HAND = GameConfig.CARDS_PER_HAND
+_PLAYER = slice(1, 1 + _HAND)
+_OPPONENT = slice(1 + _HAND, 1 + 2 * _HAND)
+_REST = slice(1 + 2 * _HAND, None)
+
+
+class DealBatch:
+    """
+    A batch of N deals backed by a single (N, 40) permutation matrix.
+
+    All accessors return views into the matrix, so slicing a batch is free.
+    """
+
+    __slots__ = ("cards",)
+
+    def __init__(self, cards):
+        self.cards = cards
+
+    def __len__(self):
+        return self.cards.shape[0]
+
+    @property
+    def vira(self):
+        """(N,) vira card ids."""
+        return self.cards[:, 0]
+
+    @property
+    def manilhas(self):
+        """(N,) manilha rank indexes derived from the vira (Paulista: the next rank)."""
+        return (self.vira // NUM_SUITS + 1) % NUM_RANKS
+
+    @property
+    def player_hands(self):
+        """(N, 3) player hands."""
+        return self.cards[:, _PLAYER]
+
+    @property
+    def opponent_hands(self):
+        """(N, 3) opponent hands."""
+        return self.cards[:, _OPPONENT]
+
+    @property
+    def remaining(self):
+        """(N, 33) undealt cards in deal order."""
+        return self.cards[:, _REST]
+
+
+def generate_deals(n, rng=None):
+    """
+    Shuffle n independent decks in one call.
+
+    Args:
+        n (int): Number of deals
+        rng (numpy.random.Generator, optional): Source of randomness
+
+    Returns:
+        DealBatch: The shuffled deals
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    cards = rng.permuted(np.broadcast_to(_DECK_NP, (n, _DECK_NP.size)), axis=1)
+    return DealBatch(cards)
+
+
+class DealPrefetcher:
+    """
+    Background pool that keeps shuffled deal batches ready.
+
+    A daemon thread fills a bounded queue with DealBatch objects using its
+    own child Generator, so the consumer only pays for a queue get.
+
+    Usage:
+        with DealPrefetcher(batch_size=65536, seed=42) as deals:
+            batch = deals.next_batch()
+    """
+
+    def __init__(self, batch_size=65536, depth=4, seed=None):
+        """
+        Args:
+            batch_size (int): Deals per batch
+            depth (int): Number of batches kept ready
+            seed (int or numpy.random.SeedSequence, optional): Seed for the worker stream
+        """
+        self.batch_size = batch_size
+        self._rng = np.random.default_rng(seed)
+        self._queue = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._fill, name="deal-prefetch", daemon=True)
+        self._thread.start()
+
+    def _fill(self):
+        """Worker loop: produce batches until stopped."""
+        while not self._stop.is_set():
+            batch = generate_deals(self.batch_size, self._rng)
+            while not self._stop.is_set():
+                try:
+                    self._queue.put(batch, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    def next_batch(self):
+        """Return the next ready DealBatch (blocks only if the pool is drained)."""
+        return self._queue.get()
+
+    def close(self):
+        """Stop the worker thread."""
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
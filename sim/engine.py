@@ -0,0 +1,371 @@
+"""
+Headless Match Engine Module for Truco 2000
+
+Plays full matches between two AI opponents with no UI concerns:
+- No snapshots, no message strings, no defensive try/except per step
+- One reusable AIOpponentContext per seat, updated in place
+- Hands are read from GameCore's deck buffer by position (distribuir_posicao);
+  nothing is copied when a hand is dealt
+- Card names and round labels are only written into the contexts of AIs
+  that read them (BaseAIOpponent.context_fields); an AI that overrides no
+  decision hook gets no context upkeep at all
+- Any rule variant (see rules.py) at the same per-round cost
+- simulate(n_matches) reports matches/sec and hands/sec
+
+Seat 0 plays the "Jogador" side of GameCore/TrucoLogic and seat 1 the
+"Oponente" side. Each AI sees the table from its own point of view, exactly
+as the UIController presents it to the opponent AI (its own hand in
+`opponent_hand`, the other seat in `player_hand`).
+
+Run with:
+    python -m sim.engine
+"""
+
+import time
+
+from ai.opponents import AIOpponentContext, BaseAIOpponent
+from cards import CARD_NAMES, NUM_CARDS
+from config import GameConfig
+from game_core import EMPATE, HAND_END, HAND_START, HAND_STEP, RESULT_NAMES, GameCore
+from rng import python_rng, spawn_seeds, table_rngs
+from truco_logic import TrucoEnd, TrucoLogic, truco_step
+
+SEATS = ("Jogador", "Oponente")
+
+# TrucoLogic raiser names as seen by each seat ("player" is the other seat)
+_RAISER_KEYS = (
+    {"Jogador": "opponent", "Oponente": "player"},
+    {"Jogador": "player", "Oponente": "opponent"},
+)
+
+# Round result labels as seen by each seat ("Você" is the other seat)
+_ROUND_LABELS = (
+    ("Empate", "Oponente", "Você"),
+    ("Empate", "Você", "Oponente"),
+)
+
+
+def _new_context():
+    """Create an empty per-seat context that the engine updates in place."""
+    return AIOpponentContext(
+        opponent_hand=[],
+        player_hand=[],
+        played={"player": None, "opponent": None},
+        manilha="",
+        carta_vira="",
+        scores={"player": 0, "opponent": 0},
+        current_hand_value=1,
+        last_accepted_value=1,
+        pending_truco=None,
+        round_results=[],
+        player_starts_round=True,
+        player_starts_hand=True,
+    )
+
+
+def _fill_names(destino, baralho, inicio):
+    """Refill a context hand list, in place, with the names of a hand in the deck buffer."""
+    destino.clear()
+    for i in range(inicio, inicio + GameConfig.CARDS_PER_HAND):
+        destino.append(CARD_NAMES[baralho[i]])
+
+
+# _SLOTS[played][idx]: slot (0-2) of the idx-th card still in a hand whose
+# played slots are the bits of `played`
+_SLOTS = tuple(
+    tuple(slot for slot in range(GameConfig.CARDS_PER_HAND) if not played >> slot & 1)
+    for played in range(1 << GameConfig.CARDS_PER_HAND)
+)
+
+
+_DECISION_HOOKS = ("on_new_hand", "choose_card", "should_call_truco", "decide_truco_response")
+_TRUCO_FIELDS = frozenset({"current_hand_value", "last_accepted_value", "last_raiser"})
+
+
+def _context_fields(ai):
+    """
+    Context fields the engine keeps current for an AI.
+
+    An AI that overrides none of the decision hooks never sees a context
+    (the defaults ignore it), so nothing is kept; otherwise the AI's
+    `context_fields`, or every field if it does not say.
+    """
+    if ai.context_fields is not None:
+        return ai.context_fields
+    if all(getattr(type(ai), hook) is getattr(BaseAIOpponent, hook) for hook in _DECISION_HOOKS):
+        return frozenset()
+    return frozenset(AIOpponentContext.__slots__)
+
+
+class MatchEngine:
+    """
+    Plays AI-vs-AI matches as fast as the opponents allow.
+
+    Usage:
+        engine = MatchEngine(InitRam(), BaselineOpponent(), seed=42)
+        stats = engine.simulate(1000)
+    """
+
+    def __init__(self, ai_jogador, ai_oponente, seed=None, winning_score=GameConfig.WINNING_SCORE, variant=None):
+        """
+        Args:
+            ai_jogador (BaseAIOpponent): AI in seat 0 ("Jogador" side)
+            ai_oponente (BaseAIOpponent): AI in seat 1 ("Oponente" side)
+            seed (int or SeedSequence, optional): Seed for the table and both AIs
+            winning_score (int): Points needed to win a match
+            variant (RuleVariant or str, optional): Rule variant (see rules.py);
+                defaults to GameConfig.RULE_VARIANT
+        """
+        self._setup((ai_jogador, ai_oponente), seed, winning_score, variant)
+
+    def _setup(self, ais, seed, winning_score, variant):
+        """
+        Table setup shared with the team engine: one seat per AI, in order.
+
+        Seeds the table and every AI, builds the core for the variant (refusing
+        AIs that don't play it) and the per-seat contexts and flags.
+        """
+        if seed is not None:
+            table_seed, seats_seed = spawn_seeds(seed, 2)
+            rngs = table_rngs(table_seed)
+            for ai, s in zip(ais, spawn_seeds(seats_seed, len(ais))):
+                ai.rng = python_rng(s)
+        else:
+            rngs = table_rngs()
+        self.core = GameCore(rng=rngs["core"], variant=variant)
+        for ai in ais:
+            if ai.variants is not None and self.core.variant.name not in ai.variants:
+                raise ValueError(f"{ai.name} does not play {self.core.variant.name} rules")
+        self.truco = TrucoLogic(rng=rngs["truco"])
+        self.ais = tuple(ais)
+        # Skip the per-card truco check for AIs that never raise
+        self._may_raise = tuple(
+            getattr(type(ai), "should_call_truco", None) is not BaseAIOpponent.should_call_truco
+            for ai in self.ais
+        )
+        self.contexts = tuple(_new_context() for _ in self.ais)
+        # Per seat: which context views its AI reads (the others are never updated)
+        campos = tuple(_context_fields(ai) for ai in self.ais)
+        self._reads = tuple(bool(f) for f in campos)
+        self._reads_values = tuple(bool(f & _TRUCO_FIELDS) for f in campos)
+        self._reads_hand = tuple("opponent_hand" in f for f in campos)
+        self._reads_other_hand = tuple("player_hand" in f for f in campos)
+        self._reads_played = tuple("played" in f for f in campos)
+        self._reads_rounds = tuple(bool(f & {"seen_cards", "round_results", "player_starts_round"}) for f in campos)
+        self.winning_score = winning_score
+        self.hand_starter = 0
+        self.hands_played = 0
+
+    def _sync_values(self, seat):
+        """Refresh the truco values in a seat's context before a decision."""
+        ctx = self.contexts[seat]
+        if not self._reads_values[seat]:
+            return ctx
+        ctx.current_hand_value = self.truco.current_hand_value
+        ctx.last_accepted_value = self.truco.last_accepted_value
+        ctx.last_raiser = _RAISER_KEYS[seat].get(self.truco.last_raiser)
+        return ctx
+
+    def _negotiate(self, raiser):
+        """
+        Run a truco negotiation started by `raiser`.
+
+        Returns:
+            bool: True if someone ran (hand over), False if a value was accepted
+        """
+        truco = self.truco
+        state = truco_step(*truco.negotiation_state(), SEATS[raiser], "raise")
+        while True:
+            responder = 1 - raiser
+            ctx = self._sync_values(responder)
+            response = self.ais[responder].decide_truco_response(state.value, truco, ctx)
+            result = truco_step(*state, SEATS[responder], response)
+            if result is None:
+                result = truco_step(*state, SEATS[responder], "accept")
+            if isinstance(result, TrucoEnd):
+                self.core.update_score(result.winner, result.points)
+                self.hand_starter = raiser
+                return True
+            if not result.pending:
+                truco.update_truco_state(result.value, result.last_raiser)
+                return False
+            raiser = responder
+            state = result
+
+    def _new_hand_views(self, inicios, carta_vira, manilha, starter):
+        """Fill the per-hand context views of the seats whose AI reads them."""
+        core = self.core
+        baralho = core.baralho
+        manilha_label = core.variant.manilha_label(manilha)
+        vira = CARD_NAMES[carta_vira] if carta_vira is not None else ""
+        pontos = (core.pontos_jogador, core.pontos_oponente)
+        for seat in (0, 1):
+            if not self._reads[seat]:
+                continue
+            ctx = self.contexts[seat]
+            if self._reads_hand[seat]:
+                _fill_names(ctx.opponent_hand, baralho, inicios[seat])
+            if self._reads_other_hand[seat]:
+                _fill_names(ctx.player_hand, baralho, inicios[1 - seat])
+            ctx.played["player"] = ctx.played["opponent"] = None
+            ctx.manilha = manilha_label
+            ctx.carta_vira = vira
+            ctx.scores["player"] = pontos[1 - seat]
+            ctx.scores["opponent"] = pontos[seat]
+            ctx.pending_truco = None
+            ctx.round_results.clear()
+            ctx.seen_cards.clear()
+            ctx.player_starts_hand = ctx.player_starts_round = starter != seat
+            self._sync_values(seat)
+
+    def _end_round_views(self, jogadas, code, starter):
+        """Record a resolved round in the contexts of the seats that read rounds."""
+        for seat in (0, 1):
+            if self._reads_rounds[seat]:
+                ctx = self.contexts[seat]
+                ctx.seen_cards.append(CARD_NAMES[jogadas[0]])
+                ctx.seen_cards.append(CARD_NAMES[jogadas[1]])
+                ctx.round_results.append(_ROUND_LABELS[seat][code])
+                ctx.player_starts_round = starter != seat
+            if self._reads_played[seat]:
+                played = self.contexts[seat].played
+                played["player"] = played["opponent"] = None
+
+    def play_hand(self):
+        """
+        Play one complete hand, updating the core scores.
+
+        The hand itself is tracked as card ids in the deck buffer; card names
+        and round labels are only written into the contexts of AIs that read
+        them (see _context_fields).
+        """
+        core = self.core
+        truco = self.truco
+        ais = self.ais
+        contexts = self.contexts
+        self.hands_played += 1
+
+        core.reiniciar_baralho()
+        truco.reset_truco_state()
+        carta_vira, manilha = core.determinar_manilha()
+        # Hands are read straight from the deck buffer (no per-hand lists)
+        baralho = core.baralho
+        # (both hands in one deal: the same draws as dealing them one after the other)
+        inicio = core.distribuir_posicao(2 * GameConfig.CARDS_PER_HAND)
+        inicios = (inicio, inicio + GameConfig.CARDS_PER_HAND)
+        starter = self.hand_starter
+        if self._reads[0] or self._reads[1]:
+            self._new_hand_views(inicios, carta_vira, manilha, starter)
+        ais[0].on_new_hand(contexts[0])
+        ais[1].on_new_hand(contexts[1])
+
+        resultados = core.variant.results[manilha]
+        may_raise = self._may_raise
+        reads_values = self._reads_values
+        reads_hand = self._reads_hand
+        reads_other_hand = self._reads_other_hand
+        reads_played = self._reads_played
+        views = self._reads[0] or self._reads[1]
+        state = HAND_START
+        jogadas = [0, 0]
+        usadas = [0, 0]  # played slots of each hand, as bits
+        for _ in range(3):
+            for seat in (starter, 1 - starter):
+                if (may_raise[seat] and truco.can_raise_truco(SEATS[seat])
+                        and ais[seat].should_call_truco(truco, self._sync_values(seat))):
+                    if self._negotiate(seat):
+                        return
+                ctx = contexts[seat]
+                if reads_values[seat]:
+                    self._sync_values(seat)
+                slots = _SLOTS[usadas[seat]]
+                idx = ais[seat].choose_card(ctx)
+                if idx is None or idx < 0 or idx >= len(slots):
+                    idx = 0
+                slot = slots[idx]
+                usadas[seat] |= 1 << slot
+                card = jogadas[seat] = baralho[inicios[seat] + slot]
+                if views:
+                    outro = 1 - seat
+                    if reads_hand[seat]:
+                        ctx.opponent_hand.pop(idx)
+                    if reads_other_hand[outro]:
+                        contexts[outro].player_hand.pop(idx)
+                    if reads_played[seat]:
+                        ctx.played["opponent"] = CARD_NAMES[card]
+                    if reads_played[outro]:
+                        contexts[outro].played["player"] = CARD_NAMES[card]
+
+            # Same rule as GameCore.vencedor_rodada, precompiled per variant
+            code = resultados[jogadas[0] * NUM_CARDS + jogadas[1]]
+            state = HAND_STEP[state * 3 + code]
+            if code != EMPATE:
+                starter = code - 1
+            if state >= HAND_END:
+                break
+            if views:
+                self._end_round_views(jogadas, code, starter)
+
+        winner = state - HAND_END
+        if winner != EMPATE:
+            core.update_score(RESULT_NAMES[winner], truco.current_hand_value)
+            self.hand_starter = winner - 1
+
+    def play_match(self, first_starter=0):
+        """
+        Play a full match from 0-0.
+
+        Args:
+            first_starter (int): Seat that starts the first hand
+
+        Returns:
+            int: Winning seat (0 or 1)
+        """
+        core = self.core
+        core.pontos_jogador = core.pontos_oponente = 0
+        self.hand_starter = first_starter
+        alvo = self.winning_score
+        while core.pontos_jogador < alvo and core.pontos_oponente < alvo:
+            self.play_hand()
+        return 0 if core.pontos_jogador >= alvo else 1
+
+    def simulate(self, n_matches):
+        """
+        Play n_matches, alternating which seat starts each match.
+
+        Args:
+            n_matches (int): Number of matches
+
+        Returns:
+            dict: matches, hands, wins per seat, elapsed seconds,
+            matches_per_sec and hands_per_sec
+        """
+        wins = [0, 0]
+        hands_before = self.hands_played
+        inicio = time.perf_counter()
+        for match in range(n_matches):
+            wins[self.play_match(match & 1)] += 1
+        elapsed = time.perf_counter() - inicio
+        hands = self.hands_played - hands_before
+        return {
+            "matches": n_matches,
+            "hands": hands,
+            "wins": wins,
+            "elapsed": elapsed,
+            "matches_per_sec": n_matches / elapsed if elapsed else float("inf"),
+            "hands_per_sec": hands / elapsed if elapsed else float("inf"),
+        }
+
+
+if __name__ == "__main__":
+    from ai.init_ram import InitRam
+    from ai.opponents import BaselineOpponent
+
+    # Baseline vs Baseline measures the engine itself; InitRam adds its own decision cost
+    for ais in ((BaselineOpponent(), BaselineOpponent()), (InitRam(), BaselineOpponent())):
+        stats = MatchEngine(*ais, seed=2000).simulate(2000)
+        print(
+            f"{ais[0].name} vs {ais[1].name}: {stats['matches']} matches, {stats['hands']} hands "
+            f"in {stats['elapsed']:.2f}s: {stats['matches_per_sec']:,.0f} matches/s, "
+            f"{stats['hands_per_sec']:,.0f} hands/s, wins {stats['wins']}"
+        )
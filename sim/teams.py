@@ -0,0 +1,238 @@
+"""
+Team (2v2) Match Engine Module for Truco 2000
+
+Plays four-seat matches between two teams of AI opponents:
+- Seats 0 and 2 form the "Jogador" team, seats 1 and 3 the "Oponente" team
+- Each round resolves all four cards in one pass (GameCore.vencedor_rodada_times);
+  if the two teams' best cards tie, the round is "empate"
+- Truco is raised and answered per team; points go through update_score
+- The first seat to play ("mão") moves one seat on every hand
+
+Every AI keeps the heads-up view of the table it already understands: its
+own hand in `opponent_hand`, the best card its team has on the table in
+played["opponent"] and the best enemy card in played["player"], so it plays
+against the card it has to beat. `player_hand` mirrors the next seat (an
+enemy). Results, scores and raisers are seen from the seat's team. As in
+the heads-up engine, hands are read from the deck buffer and a seat's view
+is only kept current for the fields its AI reads (sim/engine._context_fields).
+
+Run with:
+    python -m sim.teams
+"""
+
+from cards import CARD_NAMES
+from config import GameConfig
+from game_core import EMPATE, HAND_END, HAND_START, HAND_STEP, RESULT_NAMES
+from sim.engine import _RAISER_KEYS, _ROUND_LABELS, _SLOTS, SEATS, MatchEngine, _fill_names
+from truco_logic import TrucoEnd, truco_step
+
+NUM_SEATS = 4
+# Seats of each team (team 0 plays the "Jogador" side)
+TEAM_SEATS = ((0, 2), (1, 3))
+
+
+class TeamMatchEngine(MatchEngine):
+    """
+    Plays 2v2 matches; `simulate` reports wins per team (0 = seats 0 and 2).
+
+    Usage:
+        engine = TeamMatchEngine([InitRam(), BaselineOpponent(), InitRam(), BaselineOpponent()], seed=42)
+        stats = engine.simulate(1000)
+    """
+
+    def __init__(self, ais, seed=None, winning_score=GameConfig.WINNING_SCORE, variant=None):
+        """
+        Args:
+            ais (sequence): Four BaseAIOpponent instances, in seat order
+            seed (int or SeedSequence, optional): Seed for the table and every AI
+            winning_score (int): Points a team needs to win a match
+            variant (RuleVariant or str, optional): Rule variant (see rules.py);
+                defaults to GameConfig.RULE_VARIANT
+        """
+        if len(ais) != NUM_SEATS:
+            raise ValueError(f"A team table needs {NUM_SEATS} AIs, got {len(ais)}")
+        for ai in ais:
+            if ai.heads_up_only:
+                raise ValueError(f"{ai.name} only plays heads-up")
+        self._setup(ais, seed, winning_score, variant)
+
+    def _sync_values(self, seat):
+        """Refresh the truco values in a seat's context before a decision."""
+        ctx = self.contexts[seat]
+        if not self._reads_values[seat]:
+            return ctx
+        ctx.current_hand_value = self.truco.current_hand_value
+        ctx.last_accepted_value = self.truco.last_accepted_value
+        ctx.last_raiser = _RAISER_KEYS[seat & 1].get(self.truco.last_raiser)
+        return ctx
+
+    def _negotiate(self, raiser):
+        """
+        Run a truco negotiation started by seat `raiser`.
+
+        The next seat (always an enemy) answers for its team; after a
+        reraise the answer comes from the seat after the new raiser.
+
+        Returns:
+            bool: True if a team ran (hand over), False if a value was accepted
+        """
+        truco = self.truco
+        state = truco_step(*truco.negotiation_state(), SEATS[raiser & 1], "raise")
+        while True:
+            responder = (raiser + 1) % NUM_SEATS
+            ctx = self._sync_values(responder)
+            response = self.ais[responder].decide_truco_response(state.value, truco, ctx)
+            result = truco_step(*state, SEATS[responder & 1], response)
+            if result is None:
+                result = truco_step(*state, SEATS[responder & 1], "accept")
+            if isinstance(result, TrucoEnd):
+                self.core.update_score(result.winner, result.points)
+                return True
+            if not result.pending:
+                truco.update_truco_state(result.value, result.last_raiser)
+                return False
+            raiser = responder
+            state = result
+
+    def _new_hand_views(self, inicios, carta_vira, manilha, starter):
+        """Fill the per-hand context views of the seats whose AI reads them."""
+        core = self.core
+        baralho = core.baralho
+        manilha_label = core.variant.manilha_label(manilha)
+        vira = CARD_NAMES[carta_vira] if carta_vira is not None else ""
+        pontos = (core.pontos_jogador, core.pontos_oponente)
+        for seat in range(NUM_SEATS):
+            if not self._reads[seat]:
+                continue
+            ctx = self.contexts[seat]
+            equipe = seat & 1
+            if self._reads_hand[seat]:
+                _fill_names(ctx.opponent_hand, baralho, inicios[seat])
+            if self._reads_other_hand[seat]:
+                _fill_names(ctx.player_hand, baralho, inicios[(seat + 1) % NUM_SEATS])
+            ctx.played["player"] = ctx.played["opponent"] = None
+            ctx.manilha = manilha_label
+            ctx.carta_vira = vira
+            ctx.scores["player"] = pontos[1 - equipe]
+            ctx.scores["opponent"] = pontos[equipe]
+            ctx.pending_truco = None
+            ctx.round_results.clear()
+            ctx.seen_cards.clear()
+            ctx.player_starts_hand = ctx.player_starts_round = (starter & 1) != equipe
+            self._sync_values(seat)
+
+    def _end_round_views(self, jogadas, code, starter):
+        """Record a resolved round in the contexts of the seats that read rounds."""
+        vistas = None
+        for seat in range(NUM_SEATS):
+            ctx = self.contexts[seat]
+            if self._reads_rounds[seat]:
+                if vistas is None:
+                    vistas = [CARD_NAMES[c] for c in jogadas]
+                ctx.seen_cards.extend(vistas)
+                ctx.round_results.append(_ROUND_LABELS[seat & 1][code])
+                ctx.player_starts_round = (starter & 1) != (seat & 1)
+            if self._reads_played[seat]:
+                ctx.played["player"] = ctx.played["opponent"] = None
+
+    def play_hand(self):
+        """
+        Play one complete hand, updating the core (team) scores.
+
+        As in MatchEngine.play_hand, card names, table cards and round labels
+        are only written into the contexts of seats whose AI reads them.
+        """
+        core = self.core
+        truco = self.truco
+        ais = self.ais
+        contexts = self.contexts
+        self.hands_played += 1
+
+        core.reiniciar_baralho()
+        truco.reset_truco_state()
+        carta_vira, manilha = core.determinar_manilha()
+        # Hands are read straight from the deck buffer; all four in one deal
+        # (the same draws as dealing them one after the other)
+        baralho = core.baralho
+        inicio = core.distribuir_posicao(NUM_SEATS * GameConfig.CARDS_PER_HAND)
+        inicios = tuple(inicio + seat * GameConfig.CARDS_PER_HAND for seat in range(NUM_SEATS))
+        starter = self.hand_starter
+        self.hand_starter = (starter + 1) % NUM_SEATS
+        views = any(self._reads)
+        if views:
+            self._new_hand_views(inicios, carta_vira, manilha, starter)
+        for seat in range(NUM_SEATS):
+            ais[seat].on_new_hand(contexts[seat])
+
+        forca = core.strength[manilha]
+        may_raise = self._may_raise
+        reads_values = self._reads_values
+        reads_hand = self._reads_hand
+        reads_other_hand = self._reads_other_hand
+        reads_played = self._reads_played
+        state = HAND_START
+        jogadas = []
+        usadas = [0] * NUM_SEATS  # played slots of each hand, as bits
+        for _ in range(3):
+            jogadas.clear()
+            melhor = [-1, -1]
+            seat = starter
+            for _ in range(NUM_SEATS):
+                equipe = seat & 1
+                if (may_raise[seat] and truco.can_raise_truco(SEATS[equipe])
+                        and ais[seat].should_call_truco(truco, self._sync_values(seat))):
+                    if self._negotiate(seat):
+                        return
+                ctx = contexts[seat]
+                if reads_values[seat]:
+                    self._sync_values(seat)
+                slots = _SLOTS[usadas[seat]]
+                idx = ais[seat].choose_card(ctx)
+                if idx is None or idx < 0 or idx >= len(slots):
+                    idx = 0
+                slot = slots[idx]
+                usadas[seat] |= 1 << slot
+                card = baralho[inicios[seat] + slot]
+                jogadas.append(card)
+                if views:
+                    if reads_hand[seat]:
+                        ctx.opponent_hand.pop(idx)
+                    if reads_other_hand[seat - 1]:
+                        contexts[seat - 1].player_hand.pop(idx)
+                    if forca[card] > melhor[equipe]:
+                        # New best card of the team: partners see it as theirs, enemies as the card to beat
+                        melhor[equipe] = forca[card]
+                        name = CARD_NAMES[card]
+                        for outro in TEAM_SEATS[equipe]:
+                            if reads_played[outro]:
+                                contexts[outro].played["opponent"] = name
+                        for outro in TEAM_SEATS[1 - equipe]:
+                            if reads_played[outro]:
+                                contexts[outro].played["player"] = name
+                seat = (seat + 1) % NUM_SEATS
+
+            code, vencedor = core.vencedor_rodada_times(jogadas, manilha, starter)
+            state = HAND_STEP[state * 3 + code]
+            if code != EMPATE:
+                starter = vencedor
+            if views:
+                self._end_round_views(jogadas, code, starter)
+
+            if state >= HAND_END:
+                break
+
+        winner = state - HAND_END
+        if winner != EMPATE:
+            core.update_score(RESULT_NAMES[winner], truco.current_hand_value)
+
+
+if __name__ == "__main__":
+    from ai.init_ram import InitRam
+    from ai.opponents import BaselineOpponent
+
+    stats = TeamMatchEngine([InitRam(), BaselineOpponent(), InitRam(), BaselineOpponent()], seed=2000).simulate(2000)
+    print(
+        f"{stats['matches']} matches, {stats['hands']} hands in {stats['elapsed']:.2f}s: "
+        f"{stats['matches_per_sec']:,.0f} matches/s, {stats['hands_per_sec']:,.0f} hands/s, "
+        f"team wins {stats['wins']}"
+    )
@@ -0,0 +1,159 @@
+"""
+Tournament Runner Module for Truco 2000
+
+Round-robin tournaments between AI opponent classes on all CPU cores:
+- Every pairing is split into chunks of matches and run in a ProcessPoolExecutor
+- Each chunk gets its own child seed stream, so a tournament reproduces from one seed
+- Results are aggregated as chunks finish (streamed, no barrier per pairing)
+- Output is a win-rate matrix with Wilson confidence intervals
+
+Run with:
+    python -m sim.tournament
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from itertools import combinations
+from typing import List, Optional
+
+from rng import spawn_seeds
+from sim.engine import MatchEngine
+
+
+def _play_chunk(cls_a, cls_b, n_matches, seed, variant=None):
+    """
+    Worker entry point: play a chunk of matches between two opponent classes.
+
+    Seats alternate every chunk half so neither class keeps the "Jogador" side.
+
+    Returns:
+        tuple: (wins_a, wins_b)
+    """
+    seat_seeds = spawn_seeds(seed, 2)
+    primeira = n_matches // 2
+    wins_a = wins_b = 0
+    if primeira:
+        stats = MatchEngine(cls_a(), cls_b(), seed=seat_seeds[0], variant=variant).simulate(primeira)
+        wins_a += stats["wins"][0]
+        wins_b += stats["wins"][1]
+    if n_matches - primeira:
+        stats = MatchEngine(cls_b(), cls_a(), seed=seat_seeds[1], variant=variant).simulate(n_matches - primeira)
+        wins_a += stats["wins"][1]
+        wins_b += stats["wins"][0]
+    return wins_a, wins_b
+
+
+@dataclass
+class TournamentResult:
+    """Aggregated round-robin results.
+
+    `wins[i][j]` counts matches opponent i won against opponent j.
+    """
+
+    names: List[str]
+    wins: List[List[int]] = field(default_factory=list)
+
+    def __post_init__(self):
+        if not self.wins:
+            n = len(self.names)
+            self.wins = [[0] * n for _ in range(n)]
+
+    def games(self, i: int, j: int) -> int:
+        """Number of matches played between opponents i and j."""
+        return self.wins[i][j] + self.wins[j][i]
+
+    def win_rate(self, i: int, j: int) -> Optional[float]:
+        """Fraction of matches i won against j (None if they never met)."""
+        total = self.games(i, j)
+        return self.wins[i][j] / total if total else None
+
+    def confidence_interval(self, i: int, j: int, z: float = 1.96):
+        """Wilson score interval for i's win rate against j.
+
+        Returns:
+            tuple: (low, high), or None if they never met
+        """
+        total = self.games(i, j)
+        if not total:
+            return None
+        p = self.wins[i][j] / total
+        denom = 1 + z * z / total
+        centre = (p + z * z / (2 * total)) / denom
+        margin = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denom
+        return centre - margin, centre + margin
+
+    def win_rate_matrix(self):
+        """Matrix of win rates (None on the diagonal / for pairs that never met)."""
+        n = len(self.names)
+        return [[self.win_rate(i, j) if i != j else None for j in range(n)] for i in range(n)]
+
+    def format_table(self) -> str:
+        """Render the win-rate matrix with 95% intervals as plain text."""
+        largura = max(len(name) for name in self.names)
+        linhas = [" " * (largura + 2) + "  ".join(f"{name[:19]:^19}" for name in self.names)]
+        for i, name in enumerate(self.names):
+            celulas = []
+            for j in range(len(self.names)):
+                rate = self.win_rate(i, j) if i != j else None
+                if rate is None:
+                    celulas.append(f"{'-':^19}")
+                else:
+                    low, high = self.confidence_interval(i, j)
+                    # Rounding error can push a bound at 0 or 1 just outside (-0.000)
+                    low, high = max(low, 0.0), min(high, 1.0)
+                    celulas.append(f"{rate:.3f} [{low:.3f},{high:.3f}]")
+            linhas.append(f"{name:<{largura}}  " + "  ".join(celulas))
+        return "\n".join(linhas)
+
+
+def run_tournament(opponent_classes, matches_per_pair=1000, workers=None, seed=None,
+                   chunk_size=250, on_progress=None, variant=None):
+    """
+    Play every pairing of the given opponent classes.
+
+    Args:
+        opponent_classes (list): BaseAIOpponent subclasses (importable, no-arg constructible)
+        matches_per_pair (int): Matches played for each pairing
+        workers (int, optional): Worker processes (default: os.cpu_count())
+        seed (int or SeedSequence, optional): Root seed for the whole tournament
+        chunk_size (int): Matches per work unit
+        on_progress (callable, optional): Called as on_progress(result, done, total)
+            after each chunk is merged
+        variant (str, optional): Rule variant name (see rules.py; default:
+            GameConfig.RULE_VARIANT)
+
+    Returns:
+        TournamentResult: Aggregated wins and helpers for win rates/intervals
+    """
+    result = TournamentResult(names=[getattr(cls, "name", cls.__name__) for cls in opponent_classes])
+    tarefas = []
+    for i, j in combinations(range(len(opponent_classes)), 2):
+        restantes = matches_per_pair
+        while restantes > 0:
+            n = min(chunk_size, restantes)
+            tarefas.append((i, j, n))
+            restantes -= n
+    seeds = spawn_seeds(seed, len(tarefas))
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = {
+            pool.submit(_play_chunk, opponent_classes[i], opponent_classes[j], n, child, variant): (i, j)
+            for (i, j, n), child in zip(tarefas, seeds)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            i, j = futures[future]
+            wins_i, wins_j = future.result()
+            result.wins[i][j] += wins_i
+            result.wins[j][i] += wins_j
+            if on_progress is not None:
+                on_progress(result, done, len(tarefas))
+    return result
+
+
+if __name__ == "__main__":
+    from ai.init_ram import InitRam
+    from ai.opponents import BaselineOpponent
+
+    print(run_tournament([BaselineOpponent, InitRam], matches_per_pair=1000, seed=2000).format_table())
@@ -0,0 +1,176 @@
+"""
+Hand Abstraction Module for Truco 2000
+
+Clusters the 9,880 three-card hands (under every manilha) into a
+configurable number of strength buckets:
+- Each hand's feature is its equity distribution: the histogram, over all
+  opponent hands, of its equity in that matchup (win + half a void)
+- Hands with similar distributions share a bucket (weighted k-means on the
+  cumulative histograms, i.e. 1-D earth mover's distance)
+- Buckets are numbered by mean equity, so bucket 0 holds the weakest hands
+
+Under a fixed manilha a hand only matters through its strength classes
+(see solver/equity_table.py), so clustering runs on the class multisets
+and every real hand inherits its multiset's bucket. The result is a
+(10, 9880) uint8 lookup array (under 100 KB) that CFR, search and
+table-driven opponents index instead of raw hands. Like the equity table
+it is built from, it covers Paulista rules only.
+
+Run with:
+    python -m solver.abstraction [n_buckets] [path]
+"""
+
+import os
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+from cards import NUM_HANDS, NUM_RANKS, hand_index
+from solver.equity_table import NUM_MULTISETS, _hand_multisets, class_matchups
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+HISTOGRAM_BINS = 20
+
+
+def default_path(n_buckets):
+    """Default file for an abstraction with n_buckets buckets."""
+    return os.path.join(DATA_DIR, f"buckets_{n_buckets}.npy")
+
+
+def equity_distributions(bins=HISTOGRAM_BINS):
+    """
+    Equity distribution of every class multiset.
+
+    Returns:
+        tuple: (histograms, mean_equity, hand_counts) where histograms is a
+        (NUM_MULTISETS, bins) float64 array of probabilities, mean_equity the
+        overall equity per multiset and hand_counts how many real hands (per
+        manilha) map onto each multiset
+    """
+    histograms = np.zeros((NUM_MULTISETS, bins))
+    mean = np.zeros(NUM_MULTISETS)
+    for inicio in range(0, NUM_MULTISETS, 32):
+        chunk = range(inicio, min(inicio + 32, NUM_MULTISETS))
+        win, void, pesos = class_matchups(chunk)
+        equity = win + 0.5 * void
+        pesos = pesos / pesos.sum(axis=1, keepdims=True)
+        bin_idx = np.minimum((equity * bins).astype(np.intp), bins - 1)
+        for linha, i in enumerate(chunk):
+            histograms[i] = np.bincount(bin_idx[linha], weights=pesos[linha], minlength=bins)
+        mean[chunk.start:chunk.stop] = (pesos * equity).sum(axis=1)
+    hand_counts = np.bincount(_hand_multisets()[0], minlength=NUM_MULTISETS).astype(np.float64)
+    return histograms, mean, hand_counts
+
+
+def cluster(features, weights, order_key, n_buckets, max_iter=100):
+    """
+    Weighted k-means with a deterministic equal-weight quantile start.
+
+    Args:
+        features (numpy.ndarray): (n, d) points
+        weights (numpy.ndarray): (n,) point weights
+        order_key (numpy.ndarray): (n,) key used for the initial split and
+            for numbering the final clusters (ascending)
+        n_buckets (int): Number of clusters
+        max_iter (int): Iteration cap
+
+    Returns:
+        numpy.ndarray: (n,) cluster id per point, 0 = lowest mean order_key
+    """
+    ordem = np.argsort(order_key, kind="stable")
+    acumulado = np.cumsum(weights[ordem]) / weights.sum()
+    labels = np.empty(len(features), dtype=np.intp)
+    labels[ordem] = np.minimum((acumulado * n_buckets - 1e-9).astype(np.intp), n_buckets - 1)
+
+    for _ in range(max_iter):
+        centros = np.zeros((n_buckets, features.shape[1]))
+        massa = np.bincount(labels, weights=weights, minlength=n_buckets)
+        np.add.at(centros, labels, features * weights[:, None])
+        vivos = massa > 0
+        centros[vivos] /= massa[vivos, None]
+        dist = ((features[:, None, :] - centros[None, :, :]) ** 2).sum(axis=2)
+        dist[:, ~vivos] = np.inf
+        novos = dist.argmin(axis=1)
+        if np.array_equal(novos, labels):
+            break
+        labels = novos
+
+    # Renumber clusters by weighted mean key, dropping empty ones
+    usados = np.unique(labels)
+    chave = np.array([np.average(order_key[labels == c], weights=weights[labels == c]) for c in usados])
+    renumera = np.empty(labels.max() + 1, dtype=np.intp)
+    renumera[usados[np.argsort(chave)]] = np.arange(len(usados))
+    return renumera[labels]
+
+
+def build_buckets(n_buckets, bins=HISTOGRAM_BINS):
+    """
+    Compute the bucket lookup array.
+
+    Args:
+        n_buckets (int): Number of buckets (at most 255)
+        bins (int): Equity histogram resolution
+
+    Returns:
+        numpy.ndarray: (10, 9880) uint8 bucket per (manilha, hand_index)
+    """
+    if not 1 <= n_buckets <= min(255, NUM_MULTISETS):
+        raise ValueError(f"n_buckets must be between 1 and {min(255, NUM_MULTISETS)}")
+    histograms, mean, hand_counts = equity_distributions(bins)
+    por_multiset = cluster(np.cumsum(histograms, axis=1), hand_counts, mean, n_buckets)
+    return por_multiset[_hand_multisets()].astype(np.uint8)
+
+
+def save_buckets(buckets, path):
+    """Write a bucket array atomically as .npy."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp.npy"
+    np.save(tmp, buckets)
+    os.replace(tmp, path)
+    return path
+
+
+@lru_cache(maxsize=None)
+def bucket_table(n_buckets, path=None):
+    """
+    Bucket lookup array, memory-mapped from disk when available.
+
+    Loads `path` (default: data/buckets_<n>.npy) read-only with mmap so every
+    process shares one copy; if the file does not exist the buckets are
+    built and saved there first.
+
+    Returns:
+        numpy.ndarray: (10, 9880) uint8 bucket per (manilha, hand_index)
+    """
+    path = path or default_path(n_buckets)
+    if not os.path.exists(path):
+        try:
+            save_buckets(build_buckets(n_buckets), path)
+        except OSError:
+            return build_buckets(n_buckets)
+    buckets = np.load(path, mmap_mode="r")
+    if buckets.shape != (NUM_RANKS, NUM_HANDS) or int(buckets.max()) >= n_buckets:
+        raise ValueError(f"{path} is not a {n_buckets}-bucket abstraction")
+    return buckets
+
+
+def hand_bucket(hand, manilha, n_buckets):
+    """
+    Bucket of a three-card hand.
+
+    Args:
+        hand (sequence): Three card ids
+        manilha (int): Manilha rank index
+        n_buckets (int): Abstraction size
+
+    Returns:
+        int: Bucket id (0 = weakest)
+    """
+    return int(bucket_table(n_buckets)[manilha, hand_index(hand)])
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    caminho = sys.argv[2] if len(sys.argv) > 2 else default_path(n)
+    print(save_buckets(build_buckets(n), caminho))
@@ -0,0 +1,437 @@
+"""
+Best Response Module for Truco 2000
+
+Lower-bounds how exploitable an opponent is, in points per hand:
+- Works with any BaseAIOpponent (class or instance) or an exported
+  TrucoPolicy table from solver/cfr.py
+- Samples deals and, in parallel worker processes, expands the full
+  betting and card tree of each one against the opponent. Opponent action
+  probabilities are cached per information set, so every distinct
+  decision is asked once
+- Computes a best response over the expanded trees in the master process
+  and reports the points per hand the opponent loses to it
+
+The best response lives in the abstract game of solver/cfr.py and
+solver/policy_table.py: it sees its own hand bucket, the round history,
+the table and the truco state; it chooses every truco action, and every
+card as "the k-th strongest card left" (the card information sets of
+policy_table). A best response in the real game can only do better, so
+the result is a lower bound on the true exploitability: an objective,
+low-variance yardstick between bots that does not need millions of
+head-to-head matches, not the exploitability itself.
+
+Opponents whose decisions depend on state carried between calls of a hand
+(BaseAIOpponent.order_dependent, e.g. PIMC samples or ISMCTS plans) are
+reset with on_new_hand before every query, since the tree asks its
+decision points out of play order. Deals follow Paulista rules
+(cards.STRENGTH), the only variant the abstraction covers.
+
+Run with:
+    python -m solver.best_response [hands]
+"""
+
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+
+from ai.opponents import AIOpponentContext
+from cards import CARD_NAMES, DECK, NUM_RANKS, NUM_SUITS, RANKS, STRENGTH
+from config import GameConfig
+from game_core import EMPATE, JOGADOR, OPONENTE
+from sim.batch import HAND_ROUNDS, HAND_WINNER
+from solver.abstraction import hand_bucket
+from solver.cfr import (DEFAULT_BUCKETS, NUM_ACTIONS, NUM_HISTORIES, NUM_KINDS, NUM_TABLES, RESPONSE_NAMES,
+                        TrucoPolicy, card_policy, infoset_index, num_infosets)
+from solver.policy_table import NUM_BEATS, card_infoset_index, default_card_table, num_card_infosets
+from truco_logic import TrucoLogic
+
+_HAND_WINNER = tuple(HAND_WINNER.tolist())
+_ENDS_AFTER_TWO = tuple(HAND_ROUNDS[prefix * 3] == 2 for prefix in range(9))
+_VALUE_INDEX = {1: 0, 3: 1, 6: 2, 9: 3, 12: 4}
+_NEXT_VALUE = {1: 3, 3: 6, 6: 9, 9: 12}
+
+# Expanded tree nodes: a number (points to the best responder), or
+# (_BR, infoset, children) / (_OPP, probabilities, children)
+_BR = 0
+_OPP = 1
+
+
+class BestResponse(NamedTuple):
+    """Result of an abstract best-response run."""
+
+    lower_bound: float  # points per hand the opponent loses, at least
+    std_error: float
+    hands: int
+    passes: int
+    strategy: np.ndarray  # action per truco information set
+    card_strategy: np.ndarray  # k (k-th strongest card left) per card information set
+    elapsed: float
+
+
+class _PolicyOracle:
+    """Action probabilities of an exported TrucoPolicy (cards by cfr.card_policy)."""
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.bucket = 0
+
+    def new_hand(self, context, hand, manilha):
+        self.bucket = self.policy.hand_bucket(hand, manilha)
+
+    def raise_probs(self, context, truco):
+        p = self.policy.raise_probability(context, self.bucket)
+        return (1.0 - p, p)
+
+    def response_probs(self, value, context, truco):
+        return self.policy.response_probabilities(value, context, self.bucket)
+
+    def card_probs(self, context, hand, mesa, forca):
+        card = card_policy(tuple(hand), mesa, forca)
+        return tuple(1.0 if c == card else 0.0 for c in hand)
+
+
+class _AiOracle:
+    """Action probabilities of a BaseAIOpponent, estimated by repeated queries and cached."""
+
+    def __init__(self, ai, samples, seed):
+        self.ai = ai
+        self.samples = samples
+        self.rng = random.Random(seed)
+        self.ai.rng = random.Random(self.rng.getrandbits(64))
+        self.cache = {}
+
+    @staticmethod
+    def _key(tag, context, extra=None):
+        return (tag, extra, tuple(context.opponent_hand), context.manilha, len(context.player_hand),
+                context.played["player"], context.played["opponent"], tuple(context.round_results),
+                tuple(context.seen_cards), context.current_hand_value, context.last_accepted_value,
+                context.last_raiser, context.scores["player"], context.scores["opponent"],
+                context.player_starts_round)
+
+    def new_hand(self, context, hand, manilha):
+        self.ai.on_new_hand(context)
+
+    def _estimate(self, key, n, ask, context):
+        probs = self.cache.get(key)
+        if probs is None:
+            contagem = [0] * n
+            for _ in range(self.samples):
+                if self.ai.order_dependent:
+                    # Forget samples / plans from other decision points of the tree
+                    self.ai.on_new_hand(context)
+                contagem[ask()] += 1
+            probs = tuple(c / self.samples for c in contagem)
+            self.cache[key] = probs
+        return probs
+
+    def raise_probs(self, context, truco):
+        return self._estimate(self._key("raise", context), 2,
+                              lambda: int(bool(self.ai.should_call_truco(truco, context))), context)
+
+    def response_probs(self, value, context, truco):
+        def ask():
+            resposta = self.ai.decide_truco_response(value, truco, context)
+            if resposta == "reraise" and value >= 12:
+                resposta = "accept"
+            return RESPONSE_NAMES.index(resposta) if resposta in RESPONSE_NAMES else 0
+        return self._estimate(self._key("respond", context, value), NUM_ACTIONS, ask, context)
+
+    def card_probs(self, context, hand, mesa, forca):
+        def ask():
+            idx = self.ai.choose_card(context)
+            return idx if idx is not None and 0 <= idx < len(hand) else 0
+        return self._estimate(self._key("card", context), len(hand), ask, context)
+
+
+class _TreeBuilder:
+    """Expands the betting tree of one deal against the opponent oracle."""
+
+    def __init__(self, oracle, n_buckets, scores, seed):
+        self.oracle = oracle
+        self.n_buckets = n_buckets
+        self.scores = scores
+        self.truco = TrucoLogic(rng=random.Random(seed))
+        self.card_offset = num_infosets(n_buckets)
+        alvo = GameConfig.WINNING_SCORE
+        self.need = (max(alvo - scores[0], 1), max(alvo - scores[1], 1))
+
+    def build(self, deal, manilha, starter, br):
+        """Tree of a deal with the best responder in seat `br` (0 or 1)."""
+        self.forca = STRENGTH[manilha]
+        self.manilha = manilha
+        self.br = br
+        self.opp = 1 - br
+        self.hand_starter = starter
+        maos = (tuple(deal[:3]), tuple(deal[3:]))
+        self.br_bucket = hand_bucket(maos[br], manilha, self.n_buckets)
+        self.oracle.new_hand(self._context(maos, starter, None, (), 1, 1, None, ()), maos[self.opp], manilha)
+        return self._play(maos, starter, None, (), 1, 1, None, True, ())
+
+    def _context(self, maos, starter, mesa, codes, value, last_accepted, last_raiser, vistas):
+        """The opponent's view, exactly as a controller would build it."""
+        opp = self.opp
+        labels = []
+        for code in codes:
+            labels.append("Empate" if code == EMPATE else "Oponente" if code - 1 == opp else "Você")
+        played = {"player": None, "opponent": None}
+        if mesa is not None:
+            played["opponent" if starter == opp else "player"] = CARD_NAMES[mesa]
+        return AIOpponentContext(
+            opponent_hand=[CARD_NAMES[c] for c in maos[opp]],
+            player_hand=[CARD_NAMES[c] for c in maos[self.br]],
+            played=played,
+            manilha=RANKS[self.manilha],
+            carta_vira=CARD_NAMES[((self.manilha - 1) % NUM_RANKS) * NUM_SUITS],
+            scores={"player": self.scores[self.br], "opponent": self.scores[opp]},
+            current_hand_value=value,
+            last_accepted_value=last_accepted,
+            pending_truco=None,
+            round_results=labels,
+            player_starts_round=starter != opp,
+            player_starts_hand=self.hand_starter != opp,
+            seen_cards=[CARD_NAMES[c] for c in vistas],
+            last_raiser=None if last_raiser is None else ("opponent" if last_raiser == opp else "player"),
+        )
+
+    def _truco(self, value, last_accepted, last_raiser):
+        truco = self.truco
+        truco.current_hand_value = value
+        truco.last_accepted_value = last_accepted
+        truco.last_raiser = None if last_raiser is None else ("Oponente" if last_raiser == self.opp else "Jogador")
+        return truco
+
+    def _prefix(self, codes):
+        """Round history from the best responder's side (1 = it won the round)."""
+        prefix = 0
+        for code in codes:
+            prefix = prefix * 3 + (code if self.br == 0 or not code else 3 - code)
+        return prefix
+
+    def _infoset(self, codes, starter, mesa, kind):
+        table = 0 if mesa is None else (1 if starter == self.br else 2)
+        return infoset_index(self.n_buckets, self.need[self.br], self.need[self.opp], self.br_bucket,
+                             len(codes), self._prefix(codes), table, kind)
+
+    def _card_infoset(self, codes, mesa, mao):
+        """Card information set (after the truco ones in the strategy) of a best-responder card."""
+        beats = 0 if mesa is None else sum(self.forca[c] > self.forca[mesa] for c in mao)
+        return self.card_offset + card_infoset_index(self.n_buckets, self.need[self.br], self.need[self.opp],
+                                                     self.br_bucket, len(codes), self._prefix(codes),
+                                                     0 if mesa is None else 2, beats)
+
+    def _points(self, winner_seat, pontos):
+        return pontos if winner_seat == self.br else -pontos
+
+    def _opp_node(self, probs, children):
+        vivos = [(p, child) for p, child in zip(probs, children) if p > 0]
+        return (_OPP, tuple(p for p, _ in vivos), tuple(child() for _, child in vivos))
+
+    def _play(self, maos, starter, mesa, codes, value, last_accepted, last_raiser, may_raise, vistas):
+        mover = starter if mesa is None else 1 - starter
+        if may_raise and value < 12 and (value == 1 or last_raiser != mover):
+            sem = lambda: self._play(maos, starter, mesa, codes, value, last_accepted, last_raiser, False, vistas)
+            com = lambda: self._respond(maos, starter, mesa, codes, mover, _NEXT_VALUE[value], last_accepted,
+                                        vistas, (value, last_accepted, last_raiser))
+            if mover == self.br:
+                kind = _VALUE_INDEX[value]
+                return (_BR, self._infoset(codes, starter, mesa, kind), (sem(), com()))
+            context = self._context(maos, starter, mesa, codes, value, last_accepted, last_raiser, vistas)
+            probs = self.oracle.raise_probs(context, self._truco(value, last_accepted, last_raiser))
+            return self._opp_node(probs, (sem, com))
+
+        mao = maos[mover]
+        if mover == self.br:
+            # Action k plays the k-th strongest card left (policy_table's card actions)
+            cards = sorted(mao, key=self.forca.__getitem__, reverse=True)
+        else:
+            cards = mao
+        children = [lambda card=card: self._after_card(maos, mover, card, starter, mesa, codes, value,
+                                                       last_accepted, last_raiser, vistas)
+                    for card in cards]
+        if len(children) == 1:
+            return children[0]()
+        if mover == self.br:
+            return (_BR, self._card_infoset(codes, mesa, mao), tuple(child() for child in children))
+        context = self._context(maos, starter, mesa, codes, value, last_accepted, last_raiser, vistas)
+        return self._opp_node(self.oracle.card_probs(context, mao, mesa, self.forca), children)
+
+    def _after_card(self, maos, mover, card, starter, mesa, codes, value, last_accepted, last_raiser, vistas):
+        resto = tuple(c for c in maos[mover] if c != card)
+        maos = (resto, maos[1]) if mover == 0 else (maos[0], resto)
+        if mesa is None:
+            return self._play(maos, starter, card, codes, value, last_accepted, last_raiser, True, vistas)
+
+        forca = self.forca
+        a, b = (card, mesa) if mover == 0 else (mesa, card)
+        code = JOGADOR if forca[a] > forca[b] else OPONENTE if forca[b] > forca[a] else EMPATE
+        codes = codes + (code,)
+        vistas = vistas + (mesa, card)
+        prefix = 0
+        for c in codes:
+            prefix = prefix * 3 + c
+        if len(codes) == 3:
+            winner = _HAND_WINNER[prefix]
+        elif len(codes) == 2 and _ENDS_AFTER_TWO[prefix]:
+            winner = _HAND_WINNER[prefix * 3]
+        else:
+            starter = code - 1 if code != EMPATE else starter
+            return self._play(maos, starter, None, codes, value, last_accepted, last_raiser, True, vistas)
+        return 0.0 if winner == EMPATE else self._points(winner - 1, value)
+
+    def _respond(self, maos, starter, mesa, codes, raiser, pending, neg_accepted, vistas, antes):
+        """Pending raise; `antes` is the (value, last_accepted, last_raiser) before the negotiation."""
+        responder = 1 - raiser
+        children = [
+            lambda: self._play(maos, starter, mesa, codes, pending, pending, raiser, False, vistas),
+            lambda: self._points(raiser, neg_accepted),
+        ]
+        if pending < 12:
+            children.append(lambda: self._respond(maos, starter, mesa, codes, responder,
+                                                  _NEXT_VALUE[pending], pending, vistas, antes))
+        if responder == self.br:
+            infoset = self._infoset(codes, starter, mesa, 3 + _VALUE_INDEX[pending])
+            return (_BR, infoset, tuple(child() for child in children))
+        # Controllers only update the truco state once a negotiation ends, so
+        # the opponent sees the values from before the first raise
+        context = self._context(maos, starter, mesa, codes, *antes, vistas)
+        probs = self.oracle.response_probs(pending, context, self._truco(*antes))
+        return self._opp_node(probs, children)
+
+
+def _make_oracle(opponent, samples, seed):
+    """Wrap whatever was passed as the opponent."""
+    if isinstance(opponent, TrucoPolicy):
+        return _PolicyOracle(opponent)
+    if isinstance(opponent, type):
+        opponent = opponent()
+    return _AiOracle(opponent, samples, seed)
+
+
+def _build_chunk(opponent, n_buckets, samples, scores, seed, deals):
+    """
+    Worker entry point: expand the trees of a chunk of deals.
+
+    Returns:
+        list: Two trees per deal (best responder in seat 0, then seat 1)
+    """
+    rng = random.Random(seed)
+    builder = _TreeBuilder(_make_oracle(opponent, samples, rng.getrandbits(64)), n_buckets, scores,
+                           rng.getrandbits(64))
+    trees = []
+    for deal, manilha, starter in deals:
+        for br in (0, 1):
+            trees.append(builder.build(deal, manilha, starter, br))
+    return trees
+
+
+def _evaluate(node, reach, strategy, q):
+    """Best responder's value of a tree; accumulates reach-weighted action values in q."""
+    if node.__class__ is not tuple:
+        return node
+    if node[0] == _BR:
+        _, infoset, children = node
+        valores = [_evaluate(child, reach, strategy, q) for child in children]
+        if q is not None:
+            base = infoset * NUM_ACTIONS
+            for a, valor in enumerate(valores):
+                q[base + a] += reach * valor
+        return valores[strategy[infoset]]
+    _, probs, children = node
+    return sum(p * _evaluate(child, reach * p, strategy, q) for p, child in zip(probs, children))
+
+
+def _legal_actions(infoset, card_offset):
+    if infoset >= card_offset:
+        # One action per card left in hand
+        history = (infoset - card_offset) // (NUM_TABLES * NUM_BEATS) % NUM_HISTORIES
+        return 3 if history == 0 else 2 if history < 4 else 1
+    kind = infoset % NUM_KINDS
+    return 2 if kind < 4 or kind == NUM_KINDS - 1 else 3
+
+
+def exploitability_lower_bound(opponent, hands=2000, workers=None, samples=8, seed=None,
+                               n_buckets=DEFAULT_BUCKETS, scores=(0, 0), chunk_size=50, max_passes=30):
+    """
+    Points per hand an opponent loses, at least, to an abstract best response.
+
+    Args:
+        opponent: BaseAIOpponent subclass or instance, or a cfr.TrucoPolicy
+        hands (int): Deals to sample (each is played with the best
+            responder in both seats)
+        workers (int, optional): Worker processes (default: os.cpu_count())
+        samples (int): Queries per opponent decision to estimate its action
+            probabilities (1 is exact for deterministic opponents)
+        seed (int, optional): Seed for deals and opponent queries
+        n_buckets (int): Hand abstraction of the best responder
+        scores (tuple): Match score (best responder seat 0, seat 1) to evaluate at
+        chunk_size (int): Deals per work unit
+        max_passes (int): Cap on best-response improvement passes
+
+    Returns:
+        BestResponse: lower bound in points per hand (positive = the
+        opponent loses), standard error, hands, passes used, best-response
+        truco action and card per information set and elapsed seconds
+    """
+    inicio = time.perf_counter()
+    rng = random.Random(seed)
+    deals = [(tuple(rng.sample(DECK, 6)), rng.randrange(NUM_RANKS), rng.randrange(2)) for _ in range(hands)]
+    chunks = [deals[i:i + chunk_size] for i in range(0, hands, chunk_size)]
+    seeds = [rng.getrandbits(64) for _ in chunks]
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(chunks) > 1:
+        hand_bucket(deals[0][0][:3], 0, n_buckets)  # build the shared bucket file once, before forking
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            partes = list(pool.map(_build_chunk, [opponent] * len(chunks), [n_buckets] * len(chunks),
+                                   [samples] * len(chunks), [scores] * len(chunks), seeds, chunks))
+    else:
+        partes = [_build_chunk(opponent, n_buckets, samples, scores, s, c) for s, c in zip(seeds, chunks)]
+    trees = [tree for parte in partes for tree in parte]
+
+    # Policy iteration over the fixed trees: a node's action values only
+    # depend on later decisions, so this settles within the tree depth.
+    # Card information sets follow the truco ones and start from cfr.card_policy
+    offset = num_infosets(n_buckets)
+    size = offset + num_card_infosets(n_buckets)
+    strategy = [0] * offset + default_card_table(n_buckets).tolist()
+    for passes in range(1, max_passes + 1):
+        q = [0.0] * (size * NUM_ACTIONS)
+        for tree in trees:
+            _evaluate(tree, 1.0, strategy, q)
+        novo = list(strategy)
+        for infoset in range(size):
+            base = infoset * NUM_ACTIONS
+            valores = q[base:base + _legal_actions(infoset, offset)]
+            if any(valores):
+                novo[infoset] = max(range(len(valores)), key=valores.__getitem__)
+        if novo == strategy:
+            break
+        strategy = novo
+
+    valores = np.array([_evaluate(tree, 1.0, strategy, None) for tree in trees])
+    return BestResponse(
+        lower_bound=float(valores.mean()),
+        std_error=float(valores.std(ddof=1) / np.sqrt(len(valores))) if len(valores) > 1 else 0.0,
+        hands=len(valores),
+        passes=passes,
+        strategy=np.asarray(strategy[:offset], dtype=np.int8),
+        card_strategy=np.asarray(strategy[offset:], dtype=np.uint8),
+        elapsed=time.perf_counter() - inicio,
+    )
+
+
+if __name__ == "__main__":
+    from ai.init_ram import InitRam
+    from ai.opponents import BaselineOpponent
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    for cls in (BaselineOpponent, InitRam):
+        resultado = exploitability_lower_bound(cls, hands=n, seed=2000)
+        print(f"{cls.name}: loses at least {resultado.lower_bound:+.3f} +/- {resultado.std_error:.3f} points/hand "
+              f"to an abstract-game best response ({resultado.hands} hands, {resultado.passes} passes, "
+              f"{resultado.elapsed:.1f}s)")
@@ -0,0 +1,436 @@
+"""
+CFR Trainer Module for Truco 2000
+
+Counterfactual regret minimization for the truco betting game:
+- External-sampling Monte Carlo CFR with regret matching+
+- Regrets and average strategies live in flat NumPy float64 arrays
+  (NUM_INFOSETS x NUM_ACTIONS), never in dicts
+- Iterations run in batches across worker processes; each batch returns
+  regret / strategy deltas that are summed into the master arrays
+- Checkpoints are written atomically to disk, so long runs resume
+
+Abstraction (one information set per combination of):
+- Score: points each side still needs, in 4 bands each
+- Hand bucket: equity-distribution bucket of the three cards dealt
+  (solver/abstraction.py)
+- Round history: results of the rounds played so far (13 prefixes)
+- Table: no card, own card or the other side's card on the table
+- Decision: raise-or-not at hand value 1/3/6/9, or respond to 3/6/9/12
+
+`last_raiser` needs no slot of its own: a raise decision is only offered
+when the rules allow it, which already fixes who raised last, and a
+response is always to the other side's raise.
+
+Cards are not part of the learned game: both sides play them with
+`card_policy` (lead the strongest card, answer with the cheapest winner
+or the weakest card). Utilities are hand points, capped at what each side
+still needs to win the match, so the score genuinely changes the policy.
+Training deals are Paulista (random manilha rank, cards.STRENGTH), and so
+are the policies it exports.
+
+Run with:
+    python -m solver.cfr [iterations] [checkpoint]
+"""
+
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cards import DECK, NUM_RANKS, STRENGTH, hand_index
+from config import GameConfig
+from game_core import EMPATE, JOGADOR, OPONENTE
+from sim.batch import HAND_ROUNDS, HAND_WINNER
+from solver.abstraction import bucket_table
+
+DEFAULT_CHECKPOINT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "cfr.npz")
+
+_HAND_WINNER = tuple(HAND_WINNER.tolist())
+_ENDS_AFTER_TWO = tuple(HAND_ROUNDS[prefix * 3] == 2 for prefix in range(9))
+
+# Actions; raise decisions only use the first two slots
+NO_RAISE, RAISE = 0, 1
+ACCEPT, RUN, RERAISE = 0, 1, 2
+NUM_ACTIONS = 3
+RESPONSE_NAMES = ("accept", "run", "reraise")
+
+# Abstraction dimensions
+DEFAULT_BUCKETS = 8
+NUM_SCORE_BANDS = 4
+NUM_SCORES = NUM_SCORE_BANDS * NUM_SCORE_BANDS
+NUM_HISTORIES = 13  # 1 + 3 + 9 result prefixes
+NUM_TABLES = 3  # empty, own card, other side's card
+NUM_KINDS = 8  # raise at 1/3/6/9, respond to 3/6/9/12
+
+_VALUE_INDEX = {1: 0, 3: 1, 6: 2, 9: 3, 12: 4}
+_NEXT_VALUE = {1: 3, 3: 6, 6: 9, 9: 12}
+# Band of the points a side still needs: 1-2, 3-5, 6-8, 9-12
+_NEED_BAND = (0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 3)
+
+
+def num_infosets(n_buckets=DEFAULT_BUCKETS):
+    """Size of the information-set index for a bucket count."""
+    return NUM_SCORES * n_buckets * NUM_HISTORIES * NUM_TABLES * NUM_KINDS
+
+
+def infoset_index(n_buckets, need_me, need_them, bucket, rodadas, prefix, table, kind):
+    """
+    Flat information-set index.
+
+    Args:
+        n_buckets (int): Bucket count of the abstraction
+        need_me, need_them (int): Points each side still needs (1-12)
+        bucket (int): Hand bucket of the deciding side
+        rodadas (int): Rounds resolved so far
+        prefix (int): Base-3 encoded results, from the deciding side's view
+        table (int): 0 empty, 1 own card, 2 other side's card on the table
+        kind (int): 0-3 raise at value 1/3/6/9, 4-7 respond to 3/6/9/12
+
+    Returns:
+        int: Row of the regret / strategy arrays
+    """
+    score = _NEED_BAND[need_me] * NUM_SCORE_BANDS + _NEED_BAND[need_them]
+    history = (3 ** rodadas - 1) // 2 + prefix
+    return (((score * n_buckets + bucket) * NUM_HISTORIES + history) * NUM_TABLES + table) * NUM_KINDS + kind
+
+
+def card_policy(mao, mesa, forca):
+    """
+    Fixed card play used on both sides of the betting game.
+
+    Args:
+        mao (tuple): Card ids in hand
+        mesa (int or None): Card on the table to answer, if any
+        forca (tuple): STRENGTH row of the manilha
+
+    Returns:
+        int: Card id to play
+    """
+    if mesa is None:
+        return max(mao, key=forca.__getitem__)
+    alvo = forca[mesa]
+    vencedoras = [c for c in mao if forca[c] > alvo]
+    if vencedoras:
+        return min(vencedoras, key=forca.__getitem__)
+    return min(mao, key=forca.__getitem__)
+
+
+class _Traversal:
+    """One external-sampling traversal over a sampled deal."""
+
+    __slots__ = ("regrets", "strategy", "n_buckets", "forca", "buckets", "need", "traverser", "rng")
+
+    def __init__(self, regrets, strategy, n_buckets, forca, buckets, need, traverser, rng):
+        self.regrets = regrets
+        self.strategy = strategy
+        self.n_buckets = n_buckets
+        self.forca = forca
+        self.buckets = buckets
+        self.need = need
+        self.traverser = traverser
+        self.rng = rng
+
+    def _infoset(self, seat, rodadas, prefix, starter, mesa, kind):
+        if seat == 1:
+            # Results are stored from seat 0's view; swap wins for seat 1
+            visto = 0
+            for i in range(rodadas - 1, -1, -1):
+                code = (prefix // 3 ** i) % 3
+                visto = visto * 3 + (3 - code if code else 0)
+            prefix = visto
+        table = 0 if mesa is None else (1 if starter == seat else 2)
+        return infoset_index(self.n_buckets, self.need[seat], self.need[1 - seat], self.buckets[seat],
+                             rodadas, prefix, table, kind)
+
+    def _sigma(self, base, n):
+        """Current regret-matching strategy at a row."""
+        regrets = self.regrets
+        positivos = regrets[base:base + n]
+        total = sum(positivos)
+        if total > 0:
+            return [p / total for p in positivos]
+        return [1.0 / n] * n
+
+    def _decide(self, seat, infoset, n, children):
+        """Regret update for the traverser, sampled action for the other side."""
+        base = infoset * NUM_ACTIONS
+        sigma = self._sigma(base, n)
+        if seat == self.traverser:
+            valores = [child() for child in children]
+            esperado = sum(p * v for p, v in zip(sigma, valores))
+            # Regret matching+: cumulative regrets are floored at zero
+            regrets = self.regrets
+            for a in range(n):
+                regrets[base + a] = max(regrets[base + a] + valores[a] - esperado, 0.0)
+            return esperado
+        strategy = self.strategy
+        for a in range(n):
+            strategy[base + a] += sigma[a]
+        r = self.rng.random()
+        for a in range(n - 1):
+            r -= sigma[a]
+            if r < 0:
+                return children[a]()
+        return children[n - 1]()
+
+    def _payoff(self, winner_seat, pontos):
+        """Points to the traverser, capped at what the winner still needs."""
+        pontos = min(pontos, self.need[winner_seat])
+        return pontos if winner_seat == self.traverser else -pontos
+
+    def play(self, maos, starter, mesa, prefix, rodadas, value, last_accepted, last_raiser, may_raise):
+        """Value (to the traverser) of the position before a card play."""
+        mover = starter if mesa is None else 1 - starter
+        if may_raise and value < 12 and (value == 1 or last_raiser != mover):
+            infoset = self._infoset(mover, rodadas, prefix, starter, mesa, _VALUE_INDEX[value])
+            return self._decide(mover, infoset, 2, (
+                lambda: self.play(maos, starter, mesa, prefix, rodadas, value, last_accepted, last_raiser, False),
+                lambda: self.respond(maos, starter, mesa, prefix, rodadas, mover, _NEXT_VALUE[value], last_accepted),
+            ))
+
+        forca = self.forca
+        card = card_policy(maos[mover], mesa, forca)
+        resto = tuple(c for c in maos[mover] if c != card)
+        maos = (resto, maos[1]) if mover == 0 else (maos[0], resto)
+        if mesa is None:
+            return self.play(maos, starter, card, prefix, rodadas, value, last_accepted, last_raiser, True)
+
+        a, b = (card, mesa) if mover == 0 else (mesa, card)
+        code = JOGADOR if forca[a] > forca[b] else OPONENTE if forca[b] > forca[a] else EMPATE
+        prefix = prefix * 3 + code
+        rodadas += 1
+        if rodadas == 3:
+            winner = _HAND_WINNER[prefix]
+        elif rodadas == 2 and _ENDS_AFTER_TWO[prefix]:
+            winner = _HAND_WINNER[prefix * 3]
+        else:
+            starter = code - 1 if code != EMPATE else starter
+            return self.play(maos, starter, None, prefix, rodadas, value, last_accepted, last_raiser, True)
+        if winner == EMPATE:
+            return 0.0
+        return self._payoff(winner - 1, value)
+
+    def respond(self, maos, starter, mesa, prefix, rodadas, raiser, pending, neg_accepted):
+        """Value (to the traverser) of a pending raise."""
+        responder = 1 - raiser
+        infoset = self._infoset(responder, rodadas, prefix, starter, mesa, 3 + _VALUE_INDEX[pending])
+        children = [
+            lambda: self.play(maos, starter, mesa, prefix, rodadas, pending, pending, raiser, False),
+            lambda: self._payoff(raiser, neg_accepted),
+        ]
+        if pending < 12:
+            children.append(lambda: self.respond(maos, starter, mesa, prefix, rodadas, responder,
+                                                 _NEXT_VALUE[pending], pending))
+        return self._decide(responder, infoset, len(children), children)
+
+
+def _iterate(regrets, strategy, n_buckets, iterations, rng, buckets):
+    """Run external-sampling iterations in place on flat arrays (lists)."""
+    alvo = GameConfig.WINNING_SCORE
+    for _ in range(iterations):
+        deal = rng.sample(DECK, 6)
+        manilha = rng.randrange(NUM_RANKS)
+        forca = STRENGTH[manilha]
+        maos = (tuple(deal[:3]), tuple(deal[3:]))
+        seat_buckets = (buckets[manilha][hand_index(maos[0])], buckets[manilha][hand_index(maos[1])])
+        need = (alvo - rng.randrange(alvo), alvo - rng.randrange(alvo))
+        starter = rng.randrange(2)
+        for traverser in (0, 1):
+            _Traversal(regrets, strategy, n_buckets, forca, seat_buckets, need, traverser, rng).play(
+                maos, starter, None, 0, 0, 1, 1, None, True)
+
+
+def _train_batch(regrets, n_buckets, iterations, seed):
+    """
+    Worker entry point: run a batch from the master regrets.
+
+    Returns:
+        tuple: (regret delta, strategy delta) as float64 arrays
+    """
+    buckets = bucket_table(n_buckets).tolist()
+    inicial = regrets
+    local = regrets.tolist()
+    strategy = [0.0] * len(local)
+    _iterate(local, strategy, n_buckets, iterations, random.Random(seed), buckets)
+    return np.asarray(local) - inicial, np.asarray(strategy)
+
+
+class CfrTrainer:
+    """
+    Parallel, checkpointed MCCFR trainer.
+
+    Usage:
+        trainer = CfrTrainer.resume("data/cfr.npz")
+        trainer.train(1_000_000, checkpoint="data/cfr.npz")
+        strategy = trainer.average_strategy()
+    """
+
+    VERSION = 2
+
+    def __init__(self, n_buckets=DEFAULT_BUCKETS, seed=None):
+        """
+        Args:
+            n_buckets (int): Hand buckets of the abstraction
+            seed (int, optional): Seed for the batch seeds (reproducible runs)
+        """
+        self.n_buckets = n_buckets
+        size = num_infosets(n_buckets) * NUM_ACTIONS
+        self.regrets = np.zeros(size, dtype=np.float64)
+        self.strategy_sum = np.zeros(size, dtype=np.float64)
+        self.iterations = 0
+        self.rng = random.Random(seed)
+
+    def train(self, iterations, workers=None, batch_size=2000, checkpoint=None, checkpoint_every=60.0,
+              on_progress=None):
+        """
+        Run iterations in parallel batches.
+
+        Every worker starts each batch from the current master regrets; the
+        deltas of all batches in a round are summed, then clipped at zero.
+
+        Args:
+            iterations (int): Iterations to add (each traverses both seats)
+            workers (int, optional): Worker processes (default: os.cpu_count())
+            batch_size (int): Iterations per worker per round
+            checkpoint (str, optional): File to save to periodically and at the end
+            checkpoint_every (float): Seconds between checkpoints
+            on_progress (callable, optional): Called with total iterations after each round
+
+        Returns:
+            CfrTrainer: self
+        """
+        workers = workers or os.cpu_count() or 1
+        bucket_table(self.n_buckets)  # build the shared bucket file once, before forking
+        ultimo = time.monotonic()
+        restantes = iterations
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while restantes > 0:
+                lotes = []
+                while restantes > 0 and len(lotes) < workers:
+                    n = min(batch_size, restantes)
+                    lotes.append(n)
+                    restantes -= n
+                futures = [pool.submit(_train_batch, self.regrets, self.n_buckets, n, self.rng.getrandbits(64))
+                           for n in lotes]
+                for future in futures:
+                    delta_regrets, delta_strategy = future.result()
+                    self.regrets += delta_regrets
+                    self.strategy_sum += delta_strategy
+                np.maximum(self.regrets, 0.0, out=self.regrets)
+                self.iterations += sum(lotes)
+                if on_progress is not None:
+                    on_progress(self.iterations)
+                if checkpoint and time.monotonic() - ultimo >= checkpoint_every:
+                    self.save(checkpoint)
+                    ultimo = time.monotonic()
+        if checkpoint:
+            self.save(checkpoint)
+        return self
+
+    def average_strategy(self):
+        """
+        Average strategy per information set.
+
+        Rows never reached are uniform over the two raise actions (raise
+        kinds) or the three responses (respond kinds).
+
+        Returns:
+            numpy.ndarray: (NUM_INFOSETS, NUM_ACTIONS) probabilities
+        """
+        soma = self.strategy_sum.reshape(-1, NUM_ACTIONS)
+        legal = np.ones_like(soma)
+        kinds = np.arange(len(soma)) % NUM_KINDS
+        legal[kinds < 4, RERAISE] = 0.0
+        legal[kinds == NUM_KINDS - 1, RERAISE] = 0.0
+        total = soma.sum(axis=1, keepdims=True)
+        uniforme = legal / legal.sum(axis=1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(total > 0, soma / total, uniforme)
+
+    def save(self, path=DEFAULT_CHECKPOINT):
+        """Write a checkpoint atomically (temp file + rename)."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, version=self.VERSION, n_buckets=self.n_buckets, iterations=self.iterations,
+                 regrets=self.regrets, strategy_sum=self.strategy_sum)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path=DEFAULT_CHECKPOINT, seed=None):
+        """Load a checkpoint written by save()."""
+        with np.load(path) as dados:
+            if int(dados["version"]) != cls.VERSION:
+                raise ValueError(f"{path} is not a version {cls.VERSION} CFR checkpoint")
+            trainer = cls(int(dados["n_buckets"]), seed=seed)
+            trainer.iterations = int(dados["iterations"])
+            trainer.regrets[:] = dados["regrets"]
+            trainer.strategy_sum[:] = dados["strategy_sum"]
+        return trainer
+
+    @classmethod
+    def resume(cls, path=DEFAULT_CHECKPOINT, n_buckets=DEFAULT_BUCKETS, seed=None):
+        """Load `path` if it exists, else start a fresh trainer."""
+        if os.path.exists(path):
+            return cls.load(path, seed=seed)
+        return cls(n_buckets, seed=seed)
+
+
+class TrucoPolicy:
+    """
+    Trained truco policy queried from an AIOpponentContext.
+
+    The hand bucket comes from the three cards dealt, which the context no
+    longer shows once cards are played, so callers compute it once per hand
+    with hand_bucket() (e.g. in on_new_hand).
+    """
+
+    def __init__(self, strategy, n_buckets=DEFAULT_BUCKETS):
+        """
+        Args:
+            strategy (numpy.ndarray): (NUM_INFOSETS, NUM_ACTIONS) average strategy
+            n_buckets (int): Bucket count it was trained with
+        """
+        self.strategy = strategy
+        self.n_buckets = n_buckets
+        self.buckets = bucket_table(n_buckets)
+
+    def hand_bucket(self, hand, manilha):
+        """Bucket of a three-card hand (card ids) under a manilha rank index."""
+        return int(self.buckets[manilha, hand_index(hand)])
+
+    def _infoset(self, context, bucket, kind):
+        from solver.visible_state import from_context
+
+        state = from_context(context)
+        prefix = 0
+        for code in state.results:
+            prefix = prefix * 3 + code
+        table = 1 if state.my_played is not None else 2 if state.their_played is not None else 0
+        alvo = GameConfig.WINNING_SCORE
+        need_me = min(max(alvo - context.scores["opponent"], 1), alvo)
+        need_them = min(max(alvo - context.scores["player"], 1), alvo)
+        return infoset_index(self.n_buckets, need_me, need_them, bucket, len(state.results), prefix, table, kind)
+
+    def raise_probability(self, context, bucket):
+        """Probability of calling truco now, at context.current_hand_value."""
+        kind = _VALUE_INDEX[context.current_hand_value]
+        return float(self.strategy[self._infoset(context, bucket, kind), RAISE])
+
+    def response_probabilities(self, proposed_value, context, bucket):
+        """(accept, run, reraise) probabilities for a raise to proposed_value."""
+        kind = 3 + _VALUE_INDEX[proposed_value]
+        return tuple(float(p) for p in self.strategy[self._infoset(context, bucket, kind)])
+
+
+if __name__ == "__main__":
+    alvo = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    caminho = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_CHECKPOINT
+    treino = CfrTrainer.resume(caminho)
+    inicio = time.perf_counter()
+    treino.train(max(0, alvo - treino.iterations), checkpoint=caminho,
+                 on_progress=lambda n: print(f"\r{n:,} iterations", end="", flush=True))
+    print(f"\n{treino.iterations:,} iterations in {time.perf_counter() - inicio:.1f}s -> {caminho}")
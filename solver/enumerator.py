@@ -0,0 +1,157 @@
+"""
+Exact Conditional Odds Module for Truco 2000
+
+Exact per-card win probabilities for the current hand:
+- Enumerates every opponent holding consistent with the cards already seen
+  (own hand, cards on the table, cards from resolved rounds)
+- Remaining cards are played in uniformly random order by both sides,
+  the same play model as the equity table and Monte Carlo estimator
+- Results are memoized on a canonical key, so repeated queries within a
+  hand return in microseconds
+
+Only card strengths matter once the manilha is fixed, so the canonical key
+is the strength multiset of each group of cards (own hand, table cards,
+unseen pool) plus the round results; holdings are enumerated as strength
+multisets weighted by how many real hands map onto them.
+
+Paulista only: the manilha is a rank and strengths come from cards.STRENGTH.
+"""
+
+from functools import lru_cache
+from itertools import permutations
+from math import comb
+from typing import NamedTuple
+
+from cards import NUM_RANKS, NUM_SUITS, STRENGTH
+from game_core import EMPATE, JOGADOR, OPONENTE
+from sim.batch import HAND_WINNER
+from solver.visible_state import VisibleState, from_context
+
+_HAND_WINNER = tuple(HAND_WINNER.tolist())
+NUM_STRENGTHS = NUM_RANKS + NUM_SUITS
+
+
+class CardOdds(NamedTuple):
+    """Exact outcome probabilities of playing one card."""
+
+    win: float
+    void: float
+
+    @property
+    def equity(self):
+        """Win probability plus half the void probability."""
+        return self.win + 0.5 * self.void
+
+
+def _holdings(unseen_counts, hidden):
+    """
+    Yield (strengths, weight) for every strength multiset the hidden hand
+    can be, where weight is the number of real holdings behind it.
+    """
+    def recurse(start, left, chosen, weight):
+        if left == 0:
+            yield tuple(chosen), weight
+            return
+        for s in range(start, NUM_STRENGTHS):
+            available = unseen_counts[s]
+            for k in range(1, min(available, left) + 1):
+                yield from recurse(s + 1, left - k, chosen + [s] * k, weight * comb(available, k))
+    yield from recurse(0, hidden, [], 1)
+
+
+def _outcome(prefix, mine, theirs, pad):
+    """Hand winner after playing two aligned strength sequences."""
+    for a, b in zip(mine, theirs):
+        prefix = prefix * 3 + (JOGADOR if a > b else OPONENTE if b > a else EMPATE)
+    return _HAND_WINNER[prefix * pad]
+
+
+@lru_cache(maxsize=65536)
+def _solve(my_strengths, my_played, their_played, results, unseen_counts, hidden):
+    """
+    Exact odds for each distinct candidate strength (memoized).
+
+    All arguments are hashable strength-level descriptions of the position;
+    my_played/their_played are None when that side has no card on the table.
+
+    Returns:
+        dict: candidate strength -> CardOdds (single entry keyed by the table
+        card if the AI has already played this round)
+    """
+    base = 0
+    for code in results:
+        base = base * 3 + code
+    restantes = len(my_strengths) + (my_played is not None)
+    pad = 3 ** max(0, 3 - len(results) - restantes)
+
+    if my_played is not None:
+        candidatos = {my_played: list(my_strengths)}
+    else:
+        candidatos = {}
+        for i, s in enumerate(my_strengths):
+            candidatos.setdefault(s, list(my_strengths[:i] + my_strengths[i + 1:]))
+
+    holdings = list(_holdings(unseen_counts, hidden))
+    total_weight = sum(weight for _, weight in holdings)
+    odds = {}
+    for candidato, resto in candidatos.items():
+        my_orders = [(candidato,) + order for order in permutations(resto)]
+        win = void = 0.0
+        for strengths, weight in holdings:
+            their_orders = list(permutations(strengths))
+            if their_played is not None:
+                their_orders = [(their_played,) + order for order in their_orders]
+            if not their_orders:
+                their_orders = [()]
+            wins = voids = 0
+            for mine in my_orders:
+                for theirs in their_orders:
+                    winner = _outcome(base, mine, theirs, pad)
+                    wins += winner == JOGADOR
+                    voids += winner == EMPATE
+            scale = weight / (len(my_orders) * len(their_orders))
+            win += wins * scale
+            void += voids * scale
+        odds[candidato] = CardOdds(win / total_weight, void / total_weight)
+    return odds
+
+
+def card_odds(state):
+    """
+    Exact odds of winning the hand for each card the AI could play now.
+
+    Args:
+        state (AIOpponentContext or VisibleState): Position to evaluate
+
+    Returns:
+        list: CardOdds per index of the AI's hand; a single entry if the AI
+        already has a card on the table
+    """
+    if not isinstance(state, VisibleState):
+        state = from_context(state)
+    forca = STRENGTH[state.manilha]
+    unseen_counts = [0] * NUM_STRENGTHS
+    for card in state.unseen:
+        unseen_counts[forca[card]] += 1
+    my_strengths = [forca[card] for card in state.my_hand]
+    odds = _solve(
+        tuple(sorted(my_strengths)),
+        forca[state.my_played] if state.my_played is not None else None,
+        forca[state.their_played] if state.their_played is not None else None,
+        state.results,
+        tuple(unseen_counts),
+        state.hidden_count,
+    )
+    if state.my_played is not None:
+        return [odds[forca[state.my_played]]]
+    return [odds[s] for s in my_strengths]
+
+
+def cache_info():
+    """Hit/miss statistics of the memo cache."""
+    return _solve.cache_info()
+
+
+def clear_cache():
+    """Drop every memoized position."""
+    _solve.cache_clear()
@@ -0,0 +1,235 @@
+"""
+Hand Equity Table Module for Truco 2000
+
+Offline builder and zero-copy loader for exact three-card hand equities:
+- For every manilha (10) and every three-card hand (9,880), the probability
+  of winning / voiding the hand against a uniformly random opponent hand
+- Built in parallel across processes, resumable from per-chunk part files
+- Stored as a compact uint16 binary file that workers map with mmap
+
+Play model: the opponent holds three cards drawn uniformly from the 37
+cards we don't hold, and both sides play their cards in uniformly random
+order; rounds and hands follow GameCore.vencedor_rodada/check_hand_winner.
+
+Under a fixed manilha only a card's strength class matters (9 regular ranks
+of 4 cards each, plus 4 distinct manilhas), so the builder works on the
+403 feasible class multisets (NUM_MULTISETS; a manilha class never repeats)
+and maps every real hand onto them. The table is therefore Paulista-only
+(cards.STRENGTH, one manilha rank per row); Mineiro would need its own.
+
+Run with:
+    python -m solver.equity_table [path]
+"""
+
+import os
+import shutil
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations_with_replacement, permutations
+
+import numpy as np
+
+from cards import HANDS, NUM_CARDS, NUM_HANDS, NUM_RANKS, NUM_SUITS, STRENGTH, hand_index
+from game_core import EMPATE, JOGADOR
+from sim.batch import HAND_WINNER
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "hand_equity.bin")
+
+# Binary layout: 32-byte header, then uint16 little-endian [manilha][hand][plane]
+MAGIC = b"TRUCOEQ\0"
+VERSION = 1
+_HEADER = struct.Struct("<8sIIII")
+HEADER_SIZE = 32
+PLANES = ("win", "void")
+SCALE = 65535
+
+# Strength classes under any manilha: 9 regular ranks, then 4 manilhas
+NUM_CLASSES = (NUM_RANKS - 1) + NUM_SUITS
+CLASS_COUNTS = np.array([NUM_SUITS] * (NUM_RANKS - 1) + [1] * NUM_SUITS, dtype=np.int64)
+
+
+def card_class(card, manilha):
+    """
+    Return the dense strength class (0-12) of a card under a manilha.
+
+    Classes are ordered like STRENGTH: equal classes tie, higher wins.
+    """
+    forca = STRENGTH[manilha][card]
+    if forca >= NUM_RANKS:
+        return forca - 1
+    return forca - (forca > manilha)
+
+
+def _build_multisets():
+    """All feasible sorted class triples, and their index lookup."""
+    multisets = []
+    for triple in combinations_with_replacement(range(NUM_CLASSES), 3):
+        if all(triple.count(c) <= CLASS_COUNTS[c] for c in set(triple)):
+            multisets.append(triple)
+    return tuple(multisets), {ms: i for i, ms in enumerate(multisets)}
+
+
+MULTISETS, MULTISET_INDEX = _build_multisets()
+NUM_MULTISETS = len(MULTISETS)
+
+
+def _class_tables():
+    """Arrays used by the builder: ordered plays and class counts per multiset."""
+    orders = np.array([list(permutations(ms)) for ms in MULTISETS], dtype=np.int8)  # (M, 6, 3)
+    counts = np.zeros((NUM_MULTISETS, NUM_CLASSES), dtype=np.int64)
+    for i, ms in enumerate(MULTISETS):
+        for c in ms:
+            counts[i, c] += 1
+    return orders, counts
+
+
+# _COMB[n, k] = C(n, k) for 0 <= n <= 4, 0 <= k <= 3
+_COMB = np.array([[1, 0, 0, 0], [1, 1, 0, 0], [1, 2, 1, 0], [1, 3, 3, 1], [1, 4, 6, 4]], dtype=np.int64)
+
+
+def class_matchups(chunk):
+    """
+    Outcome probabilities of a chunk of our class multisets against every multiset.
+
+    Args:
+        chunk (sequence): Multiset indexes to evaluate
+
+    Returns:
+        tuple: (win, void, weights) as (len(chunk), NUM_MULTISETS) float64
+        arrays; weights count the real opponent hands behind each multiset
+    """
+    orders, counts = _class_tables()
+    chunk = np.asarray(chunk, dtype=np.intp)
+    nossas = orders[chunk]
+
+    # Round results for every (our order, their order) pairing: (k, M, 6, 6, 3)
+    diff = nossas[:, None, :, None, :].astype(np.int16) - orders[None, :, None, :, :]
+    resultados = np.sign(diff) % 3
+    idx = resultados[..., 0] * 9 + resultados[..., 1] * 3 + resultados[..., 2]
+    vencedores = HAND_WINNER[idx]
+    win = (vencedores == JOGADOR).mean(axis=(2, 3))
+    void = (vencedores == EMPATE).mean(axis=(2, 3))
+
+    # Number of real opponent hands behind each multiset, given ours
+    restantes = CLASS_COUNTS[None, :] - counts[chunk]
+    pesos = np.prod(_COMB[restantes[:, None, :], counts[None, :, :]], axis=2).astype(np.float64)
+    return win, void, pesos
+
+
+def class_equities(chunk):
+    """
+    Compute win/void probabilities for a chunk of our class multisets.
+
+    Args:
+        chunk (sequence): Multiset indexes to evaluate
+
+    Returns:
+        numpy.ndarray: (len(chunk), 2) float64 [win, void] probabilities
+    """
+    win, void, pesos = class_matchups(chunk)
+    total = pesos.sum(axis=1)
+    return np.stack([(pesos * win).sum(axis=1) / total, (pesos * void).sum(axis=1) / total], axis=1)
+
+
+def _hand_multisets():
+    """(10, 9880) multiset index of every real hand under every manilha."""
+    table = np.empty((NUM_RANKS, NUM_HANDS), dtype=np.intp)
+    for manilha in range(NUM_RANKS):
+        classes = [card_class(card, manilha) for card in range(NUM_CARDS)]
+        for idx, hand in enumerate(HANDS):
+            table[manilha, idx] = MULTISET_INDEX[tuple(sorted(classes[c] for c in hand))]
+    return table
+
+
+def _part_path(parts_dir, chunk_id):
+    return os.path.join(parts_dir, f"chunk_{chunk_id:03d}.npy")
+
+
+def _compute_part(parts_dir, chunk_id, chunk):
+    """Worker entry point: compute one chunk and persist it atomically."""
+    result = class_equities(chunk)
+    destino = _part_path(parts_dir, chunk_id)
+    tmp = destino + ".tmp.npy"
+    np.save(tmp, result)
+    os.replace(tmp, destino)
+    return chunk_id
+
+
+def build_equity_table(path=DEFAULT_PATH, workers=None, chunk_size=16):
+    """
+    Build the equity table file, resuming any chunks already computed.
+
+    Per-chunk results live in `<path>.parts/` until the final file is written,
+    so an interrupted build only recomputes missing chunks.
+
+    Args:
+        path (str): Output file
+        workers (int, optional): Worker processes (default: os.cpu_count())
+        chunk_size (int): Class multisets per work unit
+
+    Returns:
+        str: Path of the written table
+    """
+    parts_dir = path + ".parts"
+    os.makedirs(parts_dir, exist_ok=True)
+    chunks = [range(i, min(i + chunk_size, NUM_MULTISETS)) for i in range(0, NUM_MULTISETS, chunk_size)]
+    pendentes = [i for i in range(len(chunks)) if not os.path.exists(_part_path(parts_dir, i))]
+    if pendentes:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            list(pool.map(_compute_part, [parts_dir] * len(pendentes), pendentes,
+                          [list(chunks[i]) for i in pendentes]))
+
+    por_multiset = np.concatenate([np.load(_part_path(parts_dir, i)) for i in range(len(chunks))])
+    dados = por_multiset[_hand_multisets()]  # (10, 9880, 2)
+    quantizado = np.rint(dados * SCALE).astype("<u2")
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, NUM_RANKS, NUM_HANDS, len(PLANES)).ljust(HEADER_SIZE, b"\0"))
+        f.write(quantizado.tobytes())
+    os.replace(tmp, path)
+    shutil.rmtree(parts_dir, ignore_errors=True)
+    return path
+
+
+class EquityTable:
+    """
+    Read-only, memory-mapped view of a hand equity file.
+
+    The file is mapped, not read, so every process that opens the same
+    table shares one copy of it through the page cache.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        with open(path, "rb") as f:
+            magic, version, n_manilhas, n_hands, n_planes = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} equity table")
+        self.path = path
+        self.data = np.memmap(path, dtype="<u2", mode="r", offset=HEADER_SIZE,
+                              shape=(n_manilhas, n_hands, n_planes))
+
+    def probabilities(self, hand, manilha):
+        """
+        Exact (quantized) outcome probabilities of a hand.
+
+        Args:
+            hand (sequence): Three card ids
+            manilha (int): Manilha rank index
+
+        Returns:
+            tuple: (win, void) probabilities
+        """
+        win, void = self.data[manilha, hand_index(hand)].tolist()
+        return win / SCALE, void / SCALE
+
+    def equity(self, hand, manilha):
+        """Win probability plus half the void probability of a hand."""
+        win, void = self.data[manilha, hand_index(hand)].tolist()
+        return (win + 0.5 * void) / SCALE
+
+
+if __name__ == "__main__":
+    print(build_equity_table(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH))
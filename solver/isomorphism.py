@@ -0,0 +1,154 @@
+"""
+Suit Isomorphism Module for Truco 2000
+
+Canonical representatives and dense indexes for hands and hand states:
+- Once the manilha is fixed, the suit of a regular card never matters
+  (equal ranks tie), so the suits within each regular rank can be
+  relabelled freely; only the four manilhas keep their suits
+- canonical_hand / hand_class map a hand onto its canonical representative
+  and a dense index (403 classes per manilha instead of 9,880 hands)
+- canonicalize maps a VisibleState onto its canonical representative plus
+  the card relabelling, so answers can be translated back to real cards
+- state_key is a deterministic, hashable key of a partial-hand state's
+  class; StateIndex hands out dense ids to those keys as they are met, for
+  in-process caches only (see StateIndex)
+
+Within a regular rank, suits are handed out in a fixed role order (own
+card on the table, the other side's card on the table, own hand, cards
+from resolved rounds, unseen cards), lowest suit first. Two states that
+differ only by such relabelling therefore get the same representative.
+
+The manilha is a rank here, as in Paulista; Mineiro hands are not covered.
+"""
+
+from cards import DECK, NUM_RANKS, NUM_SUITS
+from solver.equity_table import MULTISET_INDEX, MULTISETS, NUM_MULTISETS, card_class
+from solver.visible_state import VisibleState
+
+# Dense hand classes per manilha (same numbering as the equity table multisets)
+NUM_HAND_CLASSES = NUM_MULTISETS
+
+
+def _relabel(grupos, manilha):
+    """
+    Card relabelling that sends each group's regular cards to the lowest free suits.
+
+    Args:
+        grupos (iterable): Card groups in role order (None entries are skipped)
+        manilha (int): Manilha rank index
+
+    Returns:
+        list: NUM_CARDS entries, mapa[card] = canonical card
+    """
+    mapa = list(DECK)
+    proximo = [0] * NUM_RANKS
+    for grupo in grupos:
+        for card in grupo:
+            if card is None:
+                continue
+            rank = card // NUM_SUITS
+            if rank != manilha:
+                mapa[card] = rank * NUM_SUITS + proximo[rank]
+                proximo[rank] += 1
+    return mapa
+
+
+def canonical_hand(hand, manilha):
+    """
+    Canonical representative of a hand under a manilha.
+
+    Args:
+        hand (sequence): Card ids (any size)
+        manilha (int): Manilha rank index
+
+    Returns:
+        tuple: Sorted canonical card ids
+    """
+    mapa = _relabel((hand,), manilha)
+    return tuple(sorted(mapa[card] for card in hand))
+
+
+def hand_class(hand, manilha):
+    """
+    Dense index (0 to NUM_HAND_CLASSES - 1) of a three-card hand's class.
+
+    Hands share an index exactly when they share a canonical representative.
+    """
+    return MULTISET_INDEX[tuple(sorted(card_class(card, manilha) for card in hand))]
+
+
+def class_representative(index, manilha):
+    """Canonical three-card hand of a dense hand class under a manilha."""
+    hand = []
+    proximo = [0] * NUM_RANKS
+    for classe in MULTISETS[index]:
+        if classe >= NUM_RANKS - 1:
+            hand.append(manilha * NUM_SUITS + classe - (NUM_RANKS - 1))
+        else:
+            rank = classe + (classe >= manilha)
+            hand.append(rank * NUM_SUITS + proximo[rank])
+            proximo[rank] += 1
+    return tuple(sorted(hand))
+
+
+def canonicalize(state):
+    """
+    Canonical representative of a partial-hand state.
+
+    Args:
+        state (VisibleState): State from solver.visible_state.from_context
+
+    Returns:
+        tuple: (canonical VisibleState, mapa) where mapa[card] is the
+        canonical id of real card `card`; the canonical my_hand keeps the
+        order of the real one, so card indexes carry over unchanged
+    """
+    visiveis = set(state.my_hand)
+    visiveis.update(card for card in (state.my_played, state.their_played) if card is not None)
+    unseen = set(state.unseen)
+    rodadas = sorted(card for card in DECK if card not in unseen and card not in visiveis)
+    mapa = _relabel(((state.my_played,), (state.their_played,), sorted(state.my_hand), rodadas,
+                     state.unseen), state.manilha)
+    canonico = state._replace(
+        my_hand=tuple(mapa[card] for card in state.my_hand),
+        my_played=None if state.my_played is None else mapa[state.my_played],
+        their_played=None if state.their_played is None else mapa[state.their_played],
+        unseen=tuple(sorted(mapa[card] for card in state.unseen)),
+    )
+    return canonico, mapa
+
+
+def state_key(state):
+    """Hashable canonical key of a state (own hand order ignored)."""
+    canonico, _ = canonicalize(state)
+    return canonico._replace(my_hand=tuple(sorted(canonico.my_hand)))
+
+
+class StateIndex:
+    """
+    Dense ids for canonical states, assigned in first-seen order.
+
+    Ids depend on the order states are met, so they only mean something in
+    the process (and the run) that assigned them: use them for in-memory
+    caches, never to index files saved to disk or shared between workers.
+    Those should key on hand_class (three-card hands) or on state_key itself,
+    which is the same in every process.
+
+    Usage:
+        indice = StateIndex()
+        linha = indice.index(state)  # same id for every isomorphic state
+    """
+
+    def __init__(self):
+        self._ids = {}
+
+    def index(self, state: VisibleState) -> int:
+        """Id of the state's class, allocating the next id for new classes."""
+        chave = state_key(state)
+        idx = self._ids.get(chave)
+        if idx is None:
+            idx = self._ids[chave] = len(self._ids)
+        return idx
+
+    def __len__(self):
+        return len(self._ids)
@@ -0,0 +1,204 @@
+"""
+Perfect-Information Solver Module for Truco 2000
+
+Exact minimax over the card phase of a hand when both hands are known:
+- Returns the game-theoretic hand outcome and the best card to play
+- Handles partial hands (rounds already played, a card on the table)
+- Solved positions are stored in a transposition table, so repeated
+  subtrees (and repeated deals) are solved once
+
+Used for post-game analysis and as the leaf solver of determinized search
+opponents. Truco raises are not part of the search: the outcome is who
+takes the hand points, whatever they are.
+
+Only card strengths matter once the manilha is fixed, so positions are
+keyed by the sorted strength tuple of each hand plus the round-result
+prefix, the round starter and the strength on the table. Jogador maximizes
+the outcome and Oponente minimizes it; ties on value are broken towards the
+cheapest card.
+
+Paulista only: strengths are read from cards.STRENGTH by manilha rank.
+"""
+
+from typing import NamedTuple, Optional
+
+from cards import STRENGTH
+from game_core import EMPATE, JOGADOR, OPONENTE
+from sim.batch import HAND_ROUNDS, HAND_WINNER
+
+_HAND_WINNER = tuple(HAND_WINNER.tolist())
+_ENDS_AFTER_TWO = tuple(HAND_ROUNDS[prefix * 3] == 2 for prefix in range(9))
+
+# Result code <-> minimax value (Jogador's point of view)
+_VALUE = {JOGADOR: 1, EMPATE: 0, OPONENTE: -1}
+_CODE = {1: JOGADOR, 0: EMPATE, -1: OPONENTE}
+
+# Transposition table: canonical position -> minimax value
+_TABLE = {}
+
+
+class Solution(NamedTuple):
+    """Solved position."""
+
+    outcome: int
+    card: Optional[int]
+
+
+def _terminal(prefix, rodadas):
+    """Hand winner code if the hand is over after `rodadas` rounds, else None."""
+    if rodadas == 3:
+        return _HAND_WINNER[prefix]
+    if rodadas == 2 and _ENDS_AFTER_TWO[prefix]:
+        return _HAND_WINNER[prefix * 3]
+    return None
+
+
+def _child(jogador, oponente, prefix, rodadas, starter, mesa, mover, forca):
+    """Value of the position after `mover` plays strength `forca`."""
+    if mesa is None:
+        return _search(jogador, oponente, prefix, rodadas, starter, forca)
+
+    # Second card of the round: resolve it like GameCore.vencedor_rodada
+    forca_jogador, forca_oponente = (forca, mesa) if mover == JOGADOR else (mesa, forca)
+    if forca_jogador > forca_oponente:
+        code = JOGADOR
+    elif forca_oponente > forca_jogador:
+        code = OPONENTE
+    else:
+        code = EMPATE
+    prefix = prefix * 3 + code
+    rodadas += 1
+    winner = _terminal(prefix, rodadas)
+    if winner is not None:
+        return _VALUE[winner]
+    return _search(jogador, oponente, prefix, rodadas, code or starter, None)
+
+
+def _search(jogador, oponente, prefix, rodadas, starter, mesa):
+    """
+    Minimax value of a canonical position (memoized in _TABLE).
+
+    Args:
+        jogador, oponente (tuple): Sorted strengths still in each hand
+        prefix (int): Base-3 encoded round results so far
+        rodadas (int): Rounds already resolved
+        starter (int): JOGADOR or OPONENTE, who leads this round
+        mesa (int or None): Strength the starter has on the table
+    """
+    key = (jogador, oponente, prefix, rodadas, starter, mesa)
+    value = _TABLE.get(key)
+    if value is not None:
+        return value
+
+    mover = starter if mesa is None else 3 - starter
+    sinal = 1 if mover == JOGADOR else -1
+    mao = jogador if mover == JOGADOR else oponente
+    best = -2
+    anterior = None
+    for i, forca in enumerate(mao):
+        if forca == anterior:
+            continue
+        anterior = forca
+        resto = mao[:i] + mao[i + 1:]
+        if mover == JOGADOR:
+            value = _child(resto, oponente, prefix, rodadas, starter, mesa, mover, forca)
+        else:
+            value = _child(jogador, resto, prefix, rodadas, starter, mesa, mover, forca)
+        if value * sinal > best:
+            best = value * sinal
+            if best == 1:
+                break
+
+    value = best * sinal
+    _TABLE[key] = value
+    return value
+
+
+def _root(player_hand, opponent_hand, manilha, player_starts_round, results, table_card):
+    """Translate a card-id position into the canonical search arguments."""
+    forca = STRENGTH[manilha]
+    prefix = 0
+    for code in results:
+        prefix = prefix * 3 + code
+    starter = JOGADOR if player_starts_round else OPONENTE
+    mesa = forca[table_card] if table_card is not None else None
+    mover = starter if table_card is None else 3 - starter
+    jogador = tuple(sorted(forca[c] for c in player_hand))
+    oponente = tuple(sorted(forca[c] for c in opponent_hand))
+    return forca, jogador, oponente, prefix, len(results), starter, mesa, mover
+
+
+def card_outcomes(player_hand, opponent_hand, manilha, player_starts_round=True, results=(), table_card=None):
+    """
+    Hand outcome, with best play afterwards, of each card the side to move can play.
+
+    The side to move is the round starter, or the other side if the starter
+    already has `table_card` on the table (then it is no longer in their hand).
+
+    Args:
+        player_hand (sequence): Jogador's remaining card ids
+        opponent_hand (sequence): Oponente's remaining card ids
+        manilha (int): Manilha rank index
+        player_starts_round (bool): Whether Jogador leads the current round
+        results (sequence): Result codes of the rounds already played
+        table_card (int, optional): Card the round starter has on the table
+
+    Returns:
+        list: Result code (EMPATE, JOGADOR or OPONENTE) per card of the
+        mover's hand, in the order given
+    """
+    forca, jogador, oponente, prefix, rodadas, starter, mesa, mover = _root(
+        player_hand, opponent_hand, manilha, player_starts_round, results, table_card)
+    mao = player_hand if mover == JOGADOR else opponent_hand
+    outcomes = []
+    for card in mao:
+        strength = forca[card]
+        if mover == JOGADOR:
+            resto = list(jogador)
+            resto.remove(strength)
+            value = _child(tuple(resto), oponente, prefix, rodadas, starter, mesa, mover, strength)
+        else:
+            resto = list(oponente)
+            resto.remove(strength)
+            value = _child(jogador, tuple(resto), prefix, rodadas, starter, mesa, mover, strength)
+        outcomes.append(_CODE[value])
+    return outcomes
+
+
+def solve(player_hand, opponent_hand, manilha, player_starts_round=True, results=(), table_card=None):
+    """
+    Solve the rest of a hand with both hands known.
+
+    Args: see card_outcomes.
+
+    Returns:
+        Solution: Hand result code with best play from both sides, and the
+        cheapest card id achieving it for the side to move (None if the
+        hand is already decided)
+    """
+    forca, jogador, oponente, prefix, rodadas, starter, mesa, mover = _root(
+        player_hand, opponent_hand, manilha, player_starts_round, results, table_card)
+    winner = _terminal(prefix, rodadas)
+    if winner is not None:
+        return Solution(winner, None)
+
+    mao = player_hand if mover == JOGADOR else opponent_hand
+    sinal = 1 if mover == JOGADOR else -1
+    best_value = best_card = None
+    for card, code in zip(mao, card_outcomes(player_hand, opponent_hand, manilha,
+                                             player_starts_round, results, table_card)):
+        value = _VALUE[code] * sinal
+        if (best_value is None or value > best_value
+                or (value == best_value and forca[card] < forca[best_card])):
+            best_value, best_card = value, card
+    return Solution(_CODE[best_value * sinal], best_card)
+
+
+def table_size():
+    """Number of positions stored in the transposition table."""
+    return len(_TABLE)
+
+
+def clear_table():
+    """Drop every stored position."""
+    _TABLE.clear()
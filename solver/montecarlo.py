@@ -0,0 +1,138 @@
+"""
+Monte Carlo Equity Module for Truco 2000
+
+Anytime equity estimates for positions the exact tables don't cover
+(mid-hand, known played cards, a card already on the table):
+- Samples hidden opponent holdings consistent with the visible state
+- Plays the remaining cards of both sides in random order
+- Refines the estimate in small batches and stops as soon as the
+  confidence interval is narrow enough or the time budget runs out
+
+Equity is the probability of winning the hand plus half the probability
+of a void hand, from the AI's point of view. Budgets default to a few
+milliseconds so opponents can call this from choose_card and
+decide_truco_response without visibly lagging the UI.
+
+Rounds are resolved with cards.STRENGTH, so estimates assume Paulista rules.
+"""
+
+import math
+import random
+import time
+from typing import NamedTuple
+
+from cards import STRENGTH
+from game_core import EMPATE, JOGADOR, OPONENTE
+from sim.batch import HAND_WINNER
+from solver.visible_state import VisibleState, from_context
+
+_HAND_WINNER = tuple(HAND_WINNER.tolist())
+_HAND_VALUE = {JOGADOR: 1.0, EMPATE: 0.5, OPONENTE: 0.0}
+
+
+class Estimate(NamedTuple):
+    """Result of an anytime estimate."""
+
+    equity: float
+    win: float
+    half_width: float
+    samples: int
+    elapsed: float
+
+
+def estimate_equity(state, card_index=None, rng=None, tolerance=0.02, time_budget=0.005,
+                    z=1.96, min_samples=64, max_samples=200000, batch_size=32):
+    """
+    Estimate the hand equity from the visible state.
+
+    Args:
+        state (AIOpponentContext or VisibleState): Position to evaluate
+        card_index (int, optional): Card (index into the AI's hand) to commit
+            to this round; None plays a random card if none is on the table
+        rng (random.Random, optional): Sampling stream (pass the AI's self.rng)
+        tolerance (float): Stop once the CI half-width is at most this
+        time_budget (float): Stop after this many seconds
+        z (float): Normal quantile for the confidence interval
+        min_samples (int): Never stop on tolerance before this many samples
+        max_samples (int): Hard cap on samples
+        batch_size (int): Samples between stopping checks
+
+    Returns:
+        Estimate: equity, win probability, CI half-width, samples, elapsed seconds
+    """
+    if not isinstance(state, VisibleState):
+        state = from_context(state)
+    rng = rng or random.Random()
+    inicio = time.perf_counter()
+    deadline = inicio + time_budget
+
+    forca = STRENGTH[state.manilha]
+    base = 0
+    for code in state.results:
+        base = base * 3 + code
+
+    my_cards = list(state.my_hand)
+    fixed = state.my_played
+    if fixed is None and card_index is not None:
+        fixed = my_cards.pop(card_index)
+    their_fixed = state.their_played
+    unseen = list(state.unseen)
+    hidden = state.hidden_count
+    restantes = len(my_cards) + (fixed is not None)
+    pad = 3 ** max(0, 3 - len(state.results) - restantes)
+
+    shuffle = rng.shuffle
+    sample = rng.sample
+    total = 0.0
+    wins = 0
+    n = 0
+    half_width = float("inf")
+    while True:
+        for _ in range(batch_size):
+            shuffle(my_cards)
+            theirs = sample(unseen, hidden)
+            if their_fixed is not None:
+                theirs.insert(0, their_fixed)
+            mine = [fixed] + my_cards if fixed is not None else my_cards
+            prefix = base
+            for a, b in zip(mine, theirs):
+                fa = forca[a]
+                fb = forca[b]
+                prefix = prefix * 3 + (JOGADOR if fa > fb else OPONENTE if fb > fa else EMPATE)
+            winner = _HAND_WINNER[prefix * pad]
+            value = _HAND_VALUE[winner]
+            total += value
+            wins += winner == JOGADOR
+        n += batch_size
+
+        # Outcomes lie in [0, 1], so p(1 - p) bounds their variance; the +1/+2
+        # smoothing keeps an unlucky all-loss (or all-win) start from
+        # reporting a zero-width interval
+        smoothed = (total + 1.0) / (n + 2.0)
+        half_width = z * math.sqrt(smoothed * (1.0 - smoothed) / n)
+        if n >= min_samples and half_width <= tolerance:
+            break
+        if n >= max_samples or time.perf_counter() >= deadline:
+            break
+
+    return Estimate(total / n, wins / n, half_width, n, time.perf_counter() - inicio)
+
+
+def estimate_card_equities(state, rng=None, time_budget=0.005, **kwargs):
+    """
+    Estimate the equity of playing each card in the AI's hand this round.
+
+    The time budget is split evenly between the candidate cards. If the AI
+    already has a card on the table there is nothing to choose and a single
+    estimate is returned.
+
+    Returns:
+        list: One Estimate per card index
+    """
+    if not isinstance(state, VisibleState):
+        state = from_context(state)
+    if state.my_played is not None or not state.my_hand:
+        return [estimate_equity(state, rng=rng, time_budget=time_budget, **kwargs)]
+    fatia = time_budget / len(state.my_hand)
+    return [estimate_equity(state, card_index=i, rng=rng, time_budget=fatia, **kwargs)
+            for i in range(len(state.my_hand))]
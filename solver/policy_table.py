@@ -0,0 +1,154 @@
+"""
+Policy Table Module for Truco 2000
+
+Compact binary policy files for table-driven opponents:
+- Truco table: quantized (uint8) raise / response probabilities per CFR
+  information set (see solver/cfr.py)
+- Card table: which card to play (k-th strongest of the remaining cards)
+  per card information set
+- Loaded with mmap, and cached per path, so every table in a process (and
+  every process on the machine, through the page cache) shares one copy
+
+Card information sets use the same score / bucket / history / table slots
+as the CFR ones, plus how many of the AI's cards beat the card it must
+answer. The default card table reproduces cfr.card_policy, the card play
+the truco policy was trained with.
+
+Run with:
+    python -m solver.policy_table [checkpoint] [path]
+"""
+
+import os
+import struct
+import sys
+
+import numpy as np
+
+from solver.cfr import (_NEED_BAND, DEFAULT_BUCKETS, DEFAULT_CHECKPOINT, NUM_ACTIONS, NUM_HISTORIES,
+                        NUM_SCORE_BANDS, NUM_SCORES, NUM_TABLES, CfrTrainer, num_infosets)
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "policy.bin")
+
+# Binary layout: 32-byte header, uint8 truco table, then uint8 card table
+MAGIC = b"TRUCOPL\0"
+VERSION = 1
+_HEADER = struct.Struct("<8sIIII")
+HEADER_SIZE = 32
+SCALE = 255
+
+# Cards of the AI that beat the card on the table (0-3)
+NUM_BEATS = 4
+
+
+def num_card_infosets(n_buckets=DEFAULT_BUCKETS):
+    """Size of the card information-set index for a bucket count."""
+    return NUM_SCORES * n_buckets * NUM_HISTORIES * NUM_TABLES * NUM_BEATS
+
+
+def card_infoset_index(n_buckets, need_me, need_them, bucket, rodadas, prefix, table, beats):
+    """
+    Flat card information-set index (slots as in cfr.infoset_index).
+
+    Args:
+        beats (int): Cards in hand that beat the card on the table (0 when leading)
+
+    Returns:
+        int: Row of the card table
+    """
+    score = _NEED_BAND[need_me] * NUM_SCORE_BANDS + _NEED_BAND[need_them]
+    history = (3 ** rodadas - 1) // 2 + prefix
+    return (((score * n_buckets + bucket) * NUM_HISTORIES + history) * NUM_TABLES + table) * NUM_BEATS + beats
+
+
+def default_card_table(n_buckets=DEFAULT_BUCKETS):
+    """
+    Card table matching cfr.card_policy.
+
+    Entries count down from the strongest remaining card: lead with the
+    strongest (0), answer with the cheapest winner (beats - 1), or with the
+    weakest card (hand size - 1) when nothing wins.
+
+    Returns:
+        numpy.ndarray: (num_card_infosets,) uint8
+    """
+    table = np.zeros((num_card_infosets(n_buckets) // (NUM_TABLES * NUM_BEATS), NUM_TABLES, NUM_BEATS),
+                     dtype=np.uint8)
+    historias = np.arange(table.shape[0]) % NUM_HISTORIES
+    rodadas = np.select([historias == 0, historias < 4], [0, 1], 2)
+    restantes = 3 - rodadas
+    table[:, 2, 0] = restantes - 1
+    for beats in range(1, NUM_BEATS):
+        table[:, 2, beats] = beats - 1
+    return table.reshape(-1)
+
+
+def quantize(strategy):
+    """
+    Quantize probability rows to uint8 that sum exactly to SCALE.
+
+    Rounds the cumulative distribution, so rounding errors never pile up
+    on one action.
+    """
+    acumulado = np.rint(np.cumsum(strategy, axis=1) * SCALE)
+    acumulado[:, -1] = SCALE
+    return np.diff(acumulado, axis=1, prepend=0).clip(0, SCALE).astype(np.uint8)
+
+
+def write_policy(path, strategy, n_buckets=DEFAULT_BUCKETS, card_table=None):
+    """
+    Write a policy file atomically.
+
+    Args:
+        path (str): Output file
+        strategy (numpy.ndarray): (num_infosets, NUM_ACTIONS) probabilities
+        n_buckets (int): Bucket count the strategy was trained with
+        card_table (numpy.ndarray, optional): Card choices (default: default_card_table)
+
+    Returns:
+        str: Path written
+    """
+    if card_table is None:
+        card_table = default_card_table(n_buckets)
+    truco = quantize(np.asarray(strategy, dtype=np.float64).reshape(num_infosets(n_buckets), NUM_ACTIONS))
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, n_buckets, len(truco), len(card_table)).ljust(HEADER_SIZE, b"\0"))
+        f.write(truco.tobytes())
+        f.write(np.asarray(card_table, dtype=np.uint8).tobytes())
+    os.replace(tmp, path)
+    return path
+
+
+class PolicyTable:
+    """Read-only, memory-mapped view of a policy file."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        with open(path, "rb") as f:
+            magic, version, n_buckets, n_truco, n_cards = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} policy table")
+        self.path = path
+        self.n_buckets = n_buckets
+        self.truco = np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER_SIZE, shape=(n_truco, NUM_ACTIONS))
+        self.cards = np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER_SIZE + n_truco * NUM_ACTIONS,
+                               shape=(n_cards,))
+
+
+_LOADED = {}
+
+
+def load_policy(path=DEFAULT_PATH):
+    """Return the shared PolicyTable for a path (mapped once per process)."""
+    path = os.path.abspath(path)
+    table = _LOADED.get(path)
+    if table is None:
+        table = _LOADED[path] = PolicyTable(path)
+    return table
+
+
+if __name__ == "__main__":
+    checkpoint = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CHECKPOINT
+    destino = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PATH
+    treino = CfrTrainer.load(checkpoint)
+    print(write_policy(destino, treino.average_strategy(), treino.n_buckets))
@@ -0,0 +1,66 @@
+"""
+Visible State Module for Truco 2000
+
+Translates an AIOpponentContext into the card-id view used by solvers:
+- The AI's own remaining cards and the card it has on the table
+- The other side's card on the table and how many cards it still hides
+- Round results so far, coded from the AI's point of view
+- The pool of unseen cards the hidden hand must come from
+
+The AI is always JOGADOR (code 1) in solver terms and the other side is
+OPONENTE (code 2). The vira is not removed from the pool because GameCore
+draws it independently of the deck.
+"""
+
+from typing import NamedTuple, Optional, Tuple
+
+from cards import CARD_IDS, DECK, RANK_IDS
+from game_core import EMPATE, JOGADOR, OPONENTE
+
+# Context round labels ("Você" is the human/other side) to AI-POV codes
+_RESULT_CODES = {"Oponente": JOGADOR, "Você": OPONENTE, "Empate": EMPATE}
+
+
+class VisibleState(NamedTuple):
+    """Everything an AI may legitimately know about the current hand."""
+
+    my_hand: Tuple[int, ...]
+    my_played: Optional[int]
+    their_played: Optional[int]
+    results: Tuple[int, ...]
+    hidden_count: int
+    unseen: Tuple[int, ...]
+    manilha: int
+
+
+def from_context(context):
+    """
+    Build the solver view of a context, ignoring its `player_hand` contents.
+
+    Args:
+        context (AIOpponentContext): Context handed to the AI
+
+    Returns:
+        VisibleState: Card-id view of the hand from the AI's side
+    """
+    my_hand = tuple(CARD_IDS[name] for name in context.opponent_hand)
+    played = context.played or {}
+    my_played = CARD_IDS[played["opponent"]] if played.get("opponent") else None
+    their_played = CARD_IDS[played["player"]] if played.get("player") else None
+
+    seen = set(my_hand)
+    seen.update(CARD_IDS[name] for name in getattr(context, "seen_cards", ()))
+    if my_played is not None:
+        seen.add(my_played)
+    if their_played is not None:
+        seen.add(their_played)
+
+    return VisibleState(
+        my_hand=my_hand,
+        my_played=my_played,
+        their_played=their_played,
+        results=tuple(_RESULT_CODES[label] for label in context.round_results),
+        hidden_count=len(context.player_hand),
+        unseen=tuple(card for card in DECK if card not in seen),
+        manilha=RANK_IDS[context.manilha],
+    )
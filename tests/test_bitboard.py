@@ -0,0 +1,51 @@
+"""
+Bitboard tests for Truco 2000.
+"""
+
+import random
+
+from bitboard import BEATS, FULL_DECK, LOSES, TIES, cards_of, cheapest_winner, count_beating
+from cards import CARD_BITS, CARD_IDS, DECK, NUM_RANKS, RANKS, STRENGTH, card_mask
+from game_core import GameCore
+
+
+def test_outcome_sets_match_vencedor_rodada():
+    """BEATS / TIES / LOSES agree with GameCore.vencedor_rodada on every manilha and card pair."""
+    core = GameCore(variant="paulista")
+    for manilha in range(NUM_RANKS):
+        for card in DECK:
+            assert not (BEATS[manilha][card] | TIES[manilha][card] | LOSES[manilha][card]) & CARD_BITS[card]
+            for outra in DECK:
+                if outra == card:
+                    continue
+                esperado = core.vencedor_rodada(outra, card, manilha)
+                bit = CARD_BITS[outra]
+                assert bool(BEATS[manilha][card] & bit) == (esperado == "Jogador")
+                assert bool(TIES[manilha][card] & bit) == (esperado == "Empate")
+                assert bool(LOSES[manilha][card] & bit) == (esperado == "Oponente")
+
+
+def test_cheapest_winner_and_count_beating():
+    """Masked queries agree with a scan over the strength table."""
+    rng = random.Random(2000)
+    for _ in range(2000):
+        manilha = rng.randrange(NUM_RANKS)
+        forca = STRENGTH[manilha]
+        hand = rng.sample(DECK, 3)
+        card = rng.choice([c for c in DECK if c not in hand])
+        vencedoras = [c for c in hand if forca[c] > forca[card]]
+        obtido = cheapest_winner(card_mask(hand), card, manilha)
+        if vencedoras:
+            assert forca[obtido] == min(forca[c] for c in vencedoras)
+            assert obtido in vencedoras
+        else:
+            assert obtido is None
+        pool = FULL_DECK & ~card_mask(hand)
+        assert count_beating(card, pool, manilha) == sum(forca[c] > forca[card] for c in cards_of(pool))
+
+
+def test_cheapest_winner_none_when_nothing_wins():
+    """Nothing beats the strongest manilha (4♣ when the vira is a 3)."""
+    manilha = RANKS.index("4")
+    hand = card_mask([CARD_IDS["3♣"], CARD_IDS["2♥"], CARD_IDS["A♠"]])
+    assert cheapest_winner(hand, CARD_IDS["4♣"], manilha) is None
@@ -0,0 +1,43 @@
+"""
+Batched deal tests for Truco 2000.
+"""
+
+import numpy as np
+
+from cards import DECK
+from rules import PAULISTA
+from sim.deals import DealPrefetcher, generate_deals
+
+
+def test_rows_are_permutations_and_views_line_up():
+    """Every deal is a permutation of the deck, split into vira, hands and remaining cards."""
+    batch = generate_deals(500, np.random.default_rng(2000))
+    assert len(batch) == 500
+    assert (np.sort(batch.cards, axis=1) == np.asarray(DECK)).all()
+    juntos = np.column_stack([batch.vira, batch.player_hands, batch.opponent_hands, batch.remaining])
+    assert (juntos == batch.cards).all()
+
+
+def test_manilhas_follow_paulista_rule():
+    """DealBatch.manilhas is the rank after the vira, as rules.PAULISTA draws it."""
+    class _Vira:
+        """Stands in for the rng so draw_manilha turns a given card."""
+
+        def __init__(self, card):
+            self.card = card
+
+        def randrange(self, n):
+            return self.card
+
+    batch = generate_deals(200, np.random.default_rng(1))
+    for vira, manilha in zip(batch.vira.tolist(), batch.manilhas.tolist()):
+        assert PAULISTA.draw_manilha(_Vira(vira)) == (vira, manilha)
+
+
+def test_same_seed_same_deals():
+    """A seed reproduces the deals, directly and through the prefetcher."""
+    primeiro = generate_deals(100, np.random.default_rng(42))
+    assert (generate_deals(100, np.random.default_rng(42)).cards == primeiro.cards).all()
+    assert not (generate_deals(100, np.random.default_rng(43)).cards == primeiro.cards).all()
+    with DealPrefetcher(batch_size=100, depth=2, seed=42) as deals:
+        assert (deals.next_batch().cards == primeiro.cards).all()
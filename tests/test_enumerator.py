@@ -0,0 +1,35 @@
+"""
+Exact odds enumerator tests for Truco 2000.
+"""
+
+import random
+
+import pytest
+
+from cards import DECK, HANDS, NUM_RANKS
+from solver.enumerator import card_odds
+from solver.equity_table import SCALE, EquityTable, build_equity_table
+from solver.visible_state import VisibleState
+
+def _fresh_hand(hand, manilha):
+    """Start-of-hand state: three cards each, nothing played."""
+    return VisibleState(my_hand=tuple(hand), my_played=None, their_played=None, results=(),
+                        hidden_count=3, unseen=tuple(c for c in DECK if c not in hand), manilha=manilha)
+
+
+@pytest.fixture(scope="module")
+def equity_table(tmp_path_factory):
+    return EquityTable(build_equity_table(str(tmp_path_factory.mktemp("equity") / "hand_equity.bin"), workers=1))
+
+
+def test_equity_table_matches_enumerator_average(equity_table):
+    """The table's random-order equity is the enumerator's odds averaged over the first card."""
+    rng = random.Random(2000)
+    for _ in range(200):
+        hand = rng.choice(HANDS)
+        manilha = rng.randrange(NUM_RANKS)
+        odds = card_odds(_fresh_hand(hand, manilha))
+        win, void = equity_table.probabilities(hand, manilha)
+        # Stored as uint16 fractions of SCALE
+        assert abs(win - sum(o.win for o in odds) / 3) <= 1 / SCALE
+        assert abs(void - sum(o.void for o in odds) / 3) <= 1 / SCALE
@@ -0,0 +1,12 @@
+"""
+GameCore tests for Truco 2000.
+"""
+
+from sim.benchmarks import check_hand_automaton
+
+
+def test_hand_automaton_matches_legacy():
+    """HAND_STEP ends every round sequence exactly like the branchy check_hand_winner."""
+    casos, erros = check_hand_automaton()
+    assert casos > 0
+    assert erros == []
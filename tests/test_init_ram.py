@@ -0,0 +1,12 @@
+"""
+INIT-RAM opponent tests for Truco 2000.
+"""
+
+from sim.benchmarks import check_init_ram_masks
+
+
+def test_masks_match_string_scans():
+    """Mask-based strength and card picks agree with the string scans on every hand and manilha."""
+    casos, erros = check_init_ram_masks()
+    assert casos > 0
+    assert erros == []
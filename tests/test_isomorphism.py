@@ -0,0 +1,74 @@
+"""
+Suit isomorphism tests for Truco 2000.
+"""
+
+import random
+
+from cards import DECK, NUM_RANKS, NUM_SUITS
+from solver.isomorphism import StateIndex, canonicalize, state_key
+from solver.visible_state import VisibleState
+
+
+def _random_state(rng):
+    """A partial-hand state from a random deal: rounds played, cards on the table, unseen pool."""
+    baralho = list(DECK)
+    rng.shuffle(baralho)
+    rodadas = rng.randrange(3)
+    my_played = baralho.pop() if rng.random() < 0.5 else None
+    their_played = baralho.pop() if rng.random() < 0.5 else None
+    del baralho[:2 * rodadas]  # resolved rounds
+    tamanho = 3 - rodadas - (my_played is not None)
+    my_hand = tuple(baralho.pop() for _ in range(max(tamanho, 1)))
+    return VisibleState(
+        my_hand=my_hand,
+        my_played=my_played,
+        their_played=their_played,
+        results=tuple(rng.randrange(3) for _ in range(rodadas)),
+        hidden_count=3 - rodadas - (their_played is not None),
+        unseen=tuple(sorted(baralho)),
+        manilha=rng.randrange(NUM_RANKS),
+    )
+
+
+def _relabelled(state, rng):
+    """The same state with the suits of every regular rank permuted at random."""
+    permutacoes = [rng.sample(range(NUM_SUITS), NUM_SUITS) for _ in range(NUM_RANKS)]
+
+    def mapa(card):
+        if card is None or card // NUM_SUITS == state.manilha:
+            return card
+        rank, suit = divmod(card, NUM_SUITS)
+        return rank * NUM_SUITS + permutacoes[rank][suit]
+
+    return state._replace(
+        my_hand=tuple(mapa(card) for card in state.my_hand),
+        my_played=mapa(state.my_played),
+        their_played=mapa(state.their_played),
+        unseen=tuple(sorted(mapa(card) for card in state.unseen)),
+    )
+
+
+def test_suit_relabelling_keeps_key_and_index():
+    """States that differ only by regular-suit relabelling share a state_key and a StateIndex id."""
+    rng = random.Random(2000)
+    indice = StateIndex()
+    for _ in range(500):
+        state = _random_state(rng)
+        outro = _relabelled(state, rng)
+        assert state_key(outro) == state_key(state)
+        assert indice.index(outro) == indice.index(state)
+
+
+def test_canonicalize_mapping_gives_real_cards_back():
+    """Inverting canonicalize's mapping recovers the real hand, table cards and unseen pool."""
+    rng = random.Random(7)
+    for _ in range(500):
+        state = _random_state(rng)
+        canonico, mapa = canonicalize(state)
+        assert sorted(mapa) == list(DECK)
+        real = {canon: card for card, canon in enumerate(mapa)}
+        assert tuple(real[card] for card in canonico.my_hand) == state.my_hand
+        for campo in ("my_played", "their_played"):
+            card = getattr(canonico, campo)
+            assert (None if card is None else real[card]) == getattr(state, campo)
+        assert sorted(real[card] for card in canonico.unseen) == sorted(state.unseen)
@@ -0,0 +1,27 @@
+"""
+Monte Carlo equity tests for Truco 2000.
+"""
+
+import random
+
+from cards import DECK, NUM_RANKS
+from solver.enumerator import card_odds
+from solver.montecarlo import estimate_equity
+from solver.visible_state import VisibleState
+
+
+def test_montecarlo_within_standard_error_of_enumerator():
+    """Monte Carlo estimates land within their z=3 half-width (three standard errors) of the exact odds."""
+    rng = random.Random(7)
+    for _ in range(10):
+        baralho = rng.sample(DECK, 10)
+        state = VisibleState(
+            my_hand=tuple(baralho[:2]), my_played=None, their_played=baralho[2], results=(rng.randrange(3),),
+            hidden_count=1, unseen=tuple(c for c in DECK if c not in baralho[:5]),
+            manilha=rng.randrange(NUM_RANKS),
+        )
+        exatos = card_odds(state)
+        for i, exato in enumerate(exatos):
+            estimativa = estimate_equity(state, card_index=i, rng=random.Random(i), tolerance=0.01,
+                                         time_budget=60.0, z=3.0)
+            assert abs(estimativa.equity - exato.equity) <= estimativa.half_width
@@ -0,0 +1,88 @@
+"""
+Team (2v2) engine tests for Truco 2000.
+"""
+
+import random
+
+import pytest
+
+from ai.init_ram import InitRam
+from ai.opponents import BaselineOpponent
+from ai.pimc import PimcOpponent
+from cards import DECK, NUM_RANKS, STRENGTH
+from game_core import EMPATE, JOGADOR, OPONENTE, RESULT_NAMES, GameCore
+from sim.teams import NUM_SEATS, TeamMatchEngine
+
+
+def _brute_force_round(cartas, manilha, primeiro):
+    """Team best strengths compared directly; winner is the earliest seat holding the best card."""
+    forca = STRENGTH[manilha]
+    assentos = [(primeiro + i) % len(cartas) for i in range(len(cartas))]
+    melhor = [max(forca[c] for c, s in zip(cartas, assentos) if s % 2 == equipe) for equipe in (0, 1)]
+    if melhor[0] == melhor[1]:
+        return EMPATE, primeiro
+    equipe = 0 if melhor[0] > melhor[1] else 1
+    seat = next(s for c, s in zip(cartas, assentos) if s % 2 == equipe and forca[c] == melhor[equipe])
+    return (JOGADOR if equipe == 0 else OPONENTE), seat
+
+
+def test_vencedor_rodada_times_matches_brute_force():
+    """Tie rule and winning seat of 4-seat rounds, from every first seat."""
+    core = GameCore(variant="paulista")
+    rng = random.Random(2000)
+    for _ in range(20000):
+        manilha = rng.randrange(NUM_RANKS)
+        primeiro = rng.randrange(NUM_SEATS)
+        cartas = rng.sample(DECK, NUM_SEATS)
+        assert core.vencedor_rodada_times(cartas, manilha, primeiro) == _brute_force_round(cartas, manilha, primeiro)
+
+
+def test_vencedor_rodada_times_heads_up_agrees_with_vencedor_rodada():
+    """With two cards the team rule is the heads-up rule."""
+    core = GameCore(variant="paulista")
+    for manilha in range(NUM_RANKS):
+        for a in DECK:
+            for b in DECK:
+                if a != b:
+                    code, _ = core.vencedor_rodada_times((a, b), manilha)
+                    assert RESULT_NAMES[code] == core.vencedor_rodada(a, b, manilha)
+
+
+class _CheckingOpponent(BaselineOpponent):
+    """Reads every context field and checks the team view it is given."""
+
+    def choose_card(self, context):
+        assert len(context.opponent_hand) == 3 - len(context.round_results)
+        assert len(context.seen_cards) == NUM_SEATS * len(context.round_results)
+        for card in context.played.values():
+            assert card is None or card not in context.opponent_hand
+        return 0
+
+
+def test_team_match_is_reproducible_and_scored():
+    """Same seed, same results; every match ends with one team at the winning score."""
+    def jogar():
+        engine = TeamMatchEngine([_CheckingOpponent(), InitRam(), BaselineOpponent(), InitRam()], seed=11)
+        stats = engine.simulate(50)
+        return engine, stats
+
+    engine, stats = jogar()
+    assert sum(stats["wins"]) == 50
+    assert max(engine.core.pontos_jogador, engine.core.pontos_oponente) >= engine.winning_score
+    assert jogar()[1]["wins"] == stats["wins"]
+
+
+def test_team_engine_only_fills_views_that_are_read():
+    """Baseline seats read no context, so their views are never filled."""
+    engine = TeamMatchEngine([InitRam(), BaselineOpponent(), InitRam(), BaselineOpponent()], seed=3)
+    engine.simulate(5)
+    assert engine.contexts[1].opponent_hand == [] and engine.contexts[1].seen_cards == []
+    assert engine.contexts[0].manilha != ""
+
+
+def test_team_engine_refuses_bad_tables():
+    """Wrong seat count, or a heads-up-only AI, is refused."""
+    with pytest.raises(ValueError):
+        TeamMatchEngine([BaselineOpponent()] * 2)
+    with pytest.raises(ValueError):
+        TeamMatchEngine([PimcOpponent(), BaselineOpponent(), BaselineOpponent(), BaselineOpponent()])
@@ -0,0 +1,35 @@
+"""
+Tournament runner tests for Truco 2000.
+"""
+
+import pytest
+
+from ai.init_ram import InitRam
+from ai.opponents import BaselineOpponent
+from sim.tournament import TournamentResult, run_tournament
+
+
+def test_small_tournament_is_complete_and_reproducible():
+    """Two chunks per pairing on one worker: every match is counted once, and a seed replays it."""
+    classes = [BaselineOpponent, InitRam]
+    result = run_tournament(classes, matches_per_pair=20, workers=1, seed=2000, chunk_size=10)
+    assert result.names == ["Baseline", "INIT-RAM"]
+    for i in range(len(classes)):
+        for j in range(len(classes)):
+            if i != j:
+                assert result.wins[i][j] + result.wins[j][i] == 20
+    again = run_tournament(classes, matches_per_pair=20, workers=1, seed=2000, chunk_size=10)
+    assert again.wins == result.wins
+
+
+def test_wilson_interval_known_values():
+    """0 of 5 and 5 of 5 give the textbook Wilson bounds; never-met pairs give None."""
+    result = TournamentResult(names=["a", "b", "c"], wins=[[0, 0, 0], [5, 0, 0], [0, 0, 0]])
+    low, high = result.confidence_interval(0, 1)
+    assert low == pytest.approx(0.0, abs=1e-12)
+    assert high == pytest.approx(0.4345, abs=1e-4)
+    low, high = result.confidence_interval(1, 0)
+    assert low == pytest.approx(0.5655, abs=1e-4)
+    assert high == pytest.approx(1.0, abs=1e-12)
+    assert result.confidence_interval(0, 2) is None
+    assert "-0.000" not in result.format_table()
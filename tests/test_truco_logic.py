@@ -0,0 +1,40 @@
+"""
+Truco negotiation tests for Truco 2000.
+"""
+
+from ai.opponents import BaselineOpponent
+from sim.benchmarks import check_truco_kernel
+from ui.ui_controller import UIController
+
+
+class _ScriptedOpponent(BaselineOpponent):
+    """Answers raises from a fixed script."""
+
+    def __init__(self, respostas):
+        super().__init__()
+        self.respostas = list(respostas)
+
+    def decide_truco_response(self, proposed_value, truco, context):
+        return self.respostas.pop(0)
+
+
+def test_kernel_matches_legacy_negotiation():
+    """handle_truco_sequence and bare truco_step settle every scripted answer sequence like the pre-kernel loop."""
+    casos, erros = check_truco_kernel()
+    assert casos > 0
+    assert erros == []
+
+
+def test_opponent_runs_from_player_reraise():
+    """Player raises, opponent reraises, player reraises, opponent runs: the hand ends on 6 points."""
+    controller = UIController(opponent_ai=_ScriptedOpponent(["reraise", "run"]), seed=1)
+
+    snapshot = controller.call_truco()
+    assert snapshot["pending_truco"] == {"value": 6, "raiser": "Oponente", "last_accepted": 3}
+    assert not snapshot["hand_ended"]
+
+    snapshot = controller.respond_to_truco("reraise")
+    assert snapshot["hand_ended"]
+    assert snapshot["pending_truco"] is None
+    assert snapshot["scores"] == {"player": 6, "opponent": 0}
+    assert controller.core.player_starts_hand
@@ -0,0 +1,23 @@
+"""
+UI controller tests for Truco 2000.
+"""
+
+import pytest
+
+from ai.init_ram import InitRam
+from ai.opponents import BaselineOpponent
+from config import GameConfig
+from ui.ui_controller import UIController
+
+
+def test_refuses_ai_of_another_variant(monkeypatch):
+    """A Paulista-only AI is refused under Mineiro, at construction and when swapped in."""
+    monkeypatch.setattr(GameConfig, "RULE_VARIANT", "mineiro")
+    with pytest.raises(ValueError):
+        UIController(opponent_ai=InitRam(), seed=1)
+
+    controller = UIController(seed=1)
+    assert isinstance(controller.opponent_ai, BaselineOpponent)
+    with pytest.raises(ValueError):
+        controller.set_opponent_ai(InitRam())
+    assert isinstance(controller.opponent_ai, BaselineOpponent)
@@ -6,12 +6,140 @@ This module handles all Truco-specific logic:
 - Player and AI responses to truco calls
 - Truco state management and escalation
 - Point calculations for truco scenarios
+- A pure, table-driven negotiation kernel (truco_step) shared by the
+  console game, the Textual controller and the headless engines
 
 This module is separate from core game logic to allow for different
 AI difficulty levels and truco strategies.
+
+The negotiation graph is finite (values 1/3/6/9/12, two sides), so every
+legal move is compiled once into NEGOTIATION_TABLE. A state is
+(value, last_raiser, last_accepted); a raise is pending while value is
+above last_accepted, and only the other side may answer it. Running ends
+the negotiation with a TrucoEnd (winner, points = last accepted value).
 """
 
 import random
+from typing import NamedTuple, Optional
+
+TRUCO_VALUES = (1, 3, 6, 9, 12)
+TRUCO_PLAYERS = ("Jogador", "Oponente")
+TRUCO_ACTIONS = ("raise", "accept", "run", "reraise")
+
+
+class TrucoState(NamedTuple):
+    """Live negotiation state; a raise to `value` is pending while value > last_accepted."""
+
+    value: int
+    last_raiser: Optional[str]
+    last_accepted: int
+
+    @property
+    def pending(self) -> bool:
+        return self.value != self.last_accepted
+
+
+class TrucoEnd(NamedTuple):
+    """Terminal outcome: the other side ran, `winner` scores `points` and the hand is over."""
+
+    winner: str
+    points: int
+
+
+NEGOTIATION_START = TrucoState(1, None, 1)
+
+
+def _transition(state, actor, action):
+    """
+    Rules of one negotiation move (the same as TrucoLogic.can_raise_truco and
+    calculate_points_for_runner).
+
+    Returns:
+        TrucoState, TrucoEnd, or None if the move is not allowed
+    """
+    value, last_raiser, last_accepted = state
+    if value == last_accepted:
+        # Nothing pending: the only move is a raise by whoever did not raise last
+        if action != "raise" or value >= TRUCO_VALUES[-1] or last_raiser == actor:
+            return None
+        return TrucoState(TRUCO_VALUES[TRUCO_VALUES.index(value) + 1], actor, value)
+    # A raise is pending: only the other side answers it
+    if action == "raise" or actor == last_raiser:
+        return None
+    if action == "run":
+        return TrucoEnd(last_raiser, last_accepted)
+    if action == "reraise" and value < TRUCO_VALUES[-1]:
+        # Reraising implicitly accepts the pending value
+        return TrucoState(TRUCO_VALUES[TRUCO_VALUES.index(value) + 1], actor, value)
+    # Accepting (or reraising at the maximum) settles the pending value
+    return TrucoState(value, last_raiser, value)
+
+
+def _compile_negotiation():
+    """Walk every state reachable from NEGOTIATION_START; return (states, table, moves)."""
+    states = [NEGOTIATION_START]
+    table = {}
+    moves = {}
+    for state in states:
+        legais = []
+        for actor in TRUCO_PLAYERS:
+            for action in TRUCO_ACTIONS:
+                result = _transition(state, actor, action)
+                if result is None:
+                    continue
+                table[(*state, actor, action)] = result
+                legais.append((actor, action, result))
+                if isinstance(result, TrucoState) and result not in states:
+                    states.append(result)
+        moves[state] = tuple(legais)
+    return tuple(states), table, moves
+
+
+# NEGOTIATION_TABLE[(value, last_raiser, last_accepted, actor, action)] -> TrucoState | TrucoEnd
+# NEGOTIATION_MOVES[state] -> ((actor, action, result), ...) legal moves
+NEGOTIATION_STATES, NEGOTIATION_TABLE, NEGOTIATION_MOVES = _compile_negotiation()
+
+
+def truco_step(value, last_raiser, last_accepted, actor, action):
+    """
+    Apply one negotiation move.
+
+    Args:
+        value (int): Current value (the pending proposal, if any)
+        last_raiser (str): "Jogador", "Oponente" or None
+        last_accepted (int): Last accepted value
+        actor (str): Who moves ("Jogador" or "Oponente")
+        action (str): 'raise', 'accept', 'run' or 'reraise'
+
+    Returns:
+        TrucoState, TrucoEnd, or None if the move is not allowed
+    """
+    return NEGOTIATION_TABLE.get((value, last_raiser, last_accepted, actor, action))
+
+
+def negotiation_paths(state):
+    """
+    Every way the negotiation can go from `state` until nothing is pending.
+
+    From a settled state each legal raise is tried; from a pending state
+    the answers to it are followed.
+
+    Args:
+        state (TrucoState): Reachable negotiation state
+
+    Yields:
+        tuple: (moves, result) with moves a tuple of (actor, action) and
+        result the settled TrucoState or the TrucoEnd
+    """
+    pilha = [(state, ())]
+    while pilha:
+        atual, caminho = pilha.pop()
+        for actor, action, result in NEGOTIATION_MOVES[atual]:
+            passos = caminho + ((actor, action),)
+            if isinstance(result, TrucoState) and result.pending:
+                pilha.append((result, passos))
+            else:
+                yield passos, result
 
 
 class TrucoLogic:
@@ -22,8 +150,15 @@ class TrucoLogic:
     Truco unique among card games.
     """
     
-    def __init__(self):
-        """Initialize truco state tracking."""
+    def __init__(self, rng=None):
+        """
+        Initialize truco state tracking.
+        
+        Args:
+            rng (random.Random, optional): Generator for AI decisions (see rng.py);
+                a fresh unseeded one is created if omitted
+        """
+        self.rng = rng if rng is not None else random.Random()
         # Truco state tracking
         self.current_hand_value = 1  # Current value of the hand (1, 3, 6, 9, 12)
         self.last_accepted_value = 1  # Last value that was explicitly accepted (for defensive tracking)
@@ -106,8 +241,8 @@ class TrucoLogic:
         """
         Handle a complete truco sequence until someone accepts or runs.
         
-        This is the core truco negotiation logic that handles back-and-forth
-        escalation between players.
+        Drives truco_step with the console callbacks: asks each side for its
+        answer and shows reraises, acceptances and runs as they happen.
         
         Args:
             initiator (str): Who started the truco ("Jogador" or "Oponente")
@@ -126,65 +261,44 @@ class TrucoLogic:
             # Cannot handle truco sequence without UI
             return False, current_value, initiator, None, self.current_hand_value
         
-        raiser = initiator
-        value = current_value
-        last_accepted_value = self.current_hand_value
-        
-        while value <= 12:
+        state = TrucoState(current_value, initiator, self.current_hand_value)
+        while True:
+            value, raiser, last_accepted_value = state
             if raiser == "Oponente":
                 # Get player's response to opponent's truco
+                responder = "Jogador"
                 response = input_handler.get_truco_response(value, raiser, self.truco_names)
-                
-                if response == 'run':
-                    # Player ran away
-                    return False, value, "Jogador", raiser, last_accepted_value
-                elif response == 'accept':
-                    # Player accepted
-                    return True, value, None, raiser, value
-                elif response == 'reraise':
-                    # Player wants to reraise
-                    last_accepted_value = value
-                    next_value = self.get_next_truco_value(value)
-                    if next_value is None or next_value > 12:
-                        # Cannot reraise further, must accept
-                        return True, value, None, raiser, value
-                    
-                    # Show player's reraise
-                    ui_handler.show_truco_call("Jogador", next_value, self.truco_names)
-                    
-                    # Update state for next iteration
-                    raiser = "Jogador"
-                    value = next_value
             else:
                 # Get opponent's response to player's truco
+                responder = "Oponente"
                 response = self.get_opponent_truco_response(value)
-                
-                if response == 'run':
-                    # Opponent ran away
+            
+            result = truco_step(value, raiser, last_accepted_value, responder, response)
+            if result is None:
+                # Not a valid answer, ask again
+                continue
+            if isinstance(result, TrucoEnd):
+                if responder == "Oponente":
                     ui_handler.show_opponent_runs(value, self.truco_names)
-                    return False, value, "Oponente", raiser, last_accepted_value
-                elif response == 'accept':
-                    # Opponent accepted
+                return False, value, responder, raiser, last_accepted_value
+            if not result.pending:
+                # Accepted (a reraise at the maximum counts as accepting)
+                if responder == "Oponente":
                     ui_handler.show_truco_acceptance("Oponente", value, self.truco_names)
-                    return True, value, None, raiser, value
-                elif response == 'reraise':
-                    # Opponent wants to reraise
-                    last_accepted_value = value
-                    next_value = self.get_next_truco_value(value)
-                    if next_value is None or next_value > 12:
-                        # Cannot reraise further, must accept
-                        ui_handler.show_truco_acceptance("Oponente", value, self.truco_names)
-                        return True, value, None, raiser, value
-                    
-                    # Show opponent's reraise
-                    ui_handler.show_truco_call("Oponente", next_value, self.truco_names)
-                    
-                    # Update state for next iteration
-                    raiser = "Oponente"
-                    value = next_value
+                return True, value, None, raiser, value
+            
+            # Show the reraise; the other side answers it next
+            ui_handler.show_truco_call(responder, result.value, self.truco_names)
+            state = result
+    
+    def negotiation_state(self):
+        """
+        Current settled negotiation state, as used by truco_step.
         
-        # Should never reach here, but safety fallback
-        return True, value, None, raiser, last_accepted_value
+        Returns:
+            TrucoState: (current_hand_value, last_raiser, last_accepted_value)
+        """
+        return TrucoState(self.current_hand_value, self.last_raiser, self.last_accepted_value)
     
     def get_opponent_truco_response(self, current_value):
         """
@@ -206,10 +320,10 @@ class TrucoLogic:
             # Random choice between all three options
             # Weighted slightly toward acceptance for better gameplay
             choices = ['run', 'accept', 'accept', 'reraise']  # Accept has higher probability
-            return random.choice(choices)
+            return self.rng.choice(choices)
         else:
             # Can only run or accept at max value
-            return random.choice(['run', 'accept'])
+            return self.rng.choice(['run', 'accept'])
     
     def should_opponent_initiate_truco(self, current_value, difficulty='medium'):
         """
@@ -233,7 +347,7 @@ class TrucoLogic:
         else:  # hard
             probability = 0.35  # 35% chance
         
-        return random.random() < probability
+        return self.rng.random() < probability
     
     def update_truco_state(self, new_value, raiser):
         """
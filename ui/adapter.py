@@ -67,21 +67,22 @@ def snapshot_from_gamecore() -> Dict:
     """
     try:
         from game_core import GameCore
+        from cards import card_to_str, cards_to_str, rank_to_str
     except Exception:
         # If GameCore isn't importable for some reason, fall back to demo_game_state
         return demo_game_state()
 
-    core = GameCore()
+    core = GameCore(variant="paulista")  # the demo state shows a vira
     core.reiniciar_baralho()
-    carta_vira, manilha = core.determinar_manilha()
-    # deal three cards each
-    player_hand = core.distribuir_cartas(3)
-    opponent_hand = core.distribuir_cartas(3)
+    vira_id, manilha_id = core.determinar_manilha()
+    # deal three cards each (core works on card ids; convert for display)
+    player_hand = cards_to_str(core.distribuir_cartas(3))
+    opponent_hand = cards_to_str(core.distribuir_cartas(3))
 
     state = {
         "scores": {"player": core.pontos_jogador, "opponent": core.pontos_oponente},
-        "carta_vira": carta_vira,
-        "manilha": manilha,
+        "carta_vira": card_to_str(vira_id),
+        "manilha": rank_to_str(manilha_id),
         "round_results": [],
         "player_hand": player_hand,
         "played": {"player": None, "opponent": None},
@@ -1,21 +1,65 @@
 from typing import Dict, Optional, List
 from game_core import GameCore
+from cards import CARD_NAMES, card_to_str, cards_to_str
 from config import GameConfig
-from truco_logic import TrucoLogic
+from truco_logic import TrucoEnd, TrucoLogic, TrucoState, truco_step
+from rng import table_rngs
 from ai.opponents import BaseAIOpponent, BaselineOpponent, AIOpponentContext, _get_default_opponent
 
+# TrucoLogic raiser names as seen from the opponent AI's side
+_RAISER_KEYS = {"Jogador": "player", "Oponente": "opponent"}
+
+
+def _refill(destino: List, origem: List, nomes=None) -> None:
+    """Make `destino` match `origem` (mapped through `nomes`) without building a new list."""
+    for i in range(len(origem)):
+        item = origem[i] if nomes is None else nomes[origem[i]]
+        if i == len(destino):
+            destino.append(item)
+        elif destino[i] is not item:
+            destino[i] = item
+    del destino[len(origem):]
+
+
 class UIController:
     """Lightweight controller used by the Textual UI for prototyping interactions.
 
     This intentionally keeps logic simple and does not implement full Truco
     negotiation. It uses GameCore for card dealing, scoring, and winner determination.
+    Hands, played cards, vira and manilha are kept as card ids internally and only
+    converted to display strings in snapshots and AI contexts.
     """
-    def __init__(self, opponent_ai: Optional[BaseAIOpponent] = None):
-        self.core = GameCore()
+    def __init__(self, opponent_ai: Optional[BaseAIOpponent] = None, seed=None):
+        # Each table owns its random streams; a seed makes the whole table reproducible
+        rngs = table_rngs(seed)
+        self.core = GameCore(rng=rngs["core"])
         self.config = GameConfig
-        self.truco = TrucoLogic()
-        self.opponent_ai: BaseAIOpponent = opponent_ai or _get_default_opponent()
+        self.truco = TrucoLogic(rng=rngs["truco"])
+        if opponent_ai is None:
+            opponent_ai = _get_default_opponent()
+            if opponent_ai.variants is not None and self.core.variant.name not in opponent_ai.variants:
+                # The default AI may not know this variant; fall back to one that plays any
+                opponent_ai = BaselineOpponent()
+        self._check_variant(opponent_ai)
+        self.opponent_ai: BaseAIOpponent = opponent_ai
+        if seed is not None:
+            self.opponent_ai.rng = rngs["opponent"]
         self.message: Optional[str] = None
+        # One context reused for every AI decision, refreshed in place
+        self.ai_context = AIOpponentContext(
+            opponent_hand=[],
+            player_hand=[],
+            played={"player": None, "opponent": None},
+            manilha="",
+            carta_vira="",
+            scores={"player": 0, "opponent": 0},
+            current_hand_value=1,
+            last_accepted_value=1,
+            pending_truco=None,
+            round_results=[],
+            player_starts_round=True,
+            player_starts_hand=True,
+        )
         self.reset_hand()
 
     def reset_hand(self):
@@ -23,10 +67,11 @@ class UIController:
         carta_vira, manilha = self.core.determinar_manilha()
         self.carta_vira = carta_vira
         self.manilha = manilha
-        # deal hands
-        self.player_hand = self.core.distribuir_cartas(self.config.CARDS_PER_HAND)
-        self.opponent_hand = self.core.distribuir_cartas(self.config.CARDS_PER_HAND)
+        # deal hands (copied out of the core's deck view since cards get popped)
+        self.player_hand = list(self.core.distribuir_cartas(self.config.CARDS_PER_HAND))
+        self.opponent_hand = list(self.core.distribuir_cartas(self.config.CARDS_PER_HAND))
         self.played = {"player": None, "opponent": None}
+        self.played_cards = []
         self.round_results = []
         # reset truco state for new hand
         self.truco.reset_truco_state()
@@ -53,9 +98,19 @@ class UIController:
         except Exception:
             pass
 
+    def _check_variant(self, opponent_ai: BaseAIOpponent) -> None:
+        """Refuse an AI that does not understand this table's rule variant (see rules.py)."""
+        if opponent_ai.variants is not None and self.core.variant.name not in opponent_ai.variants:
+            raise ValueError(f"{opponent_ai.name} does not play {self.core.variant.name} rules")
+
     def set_opponent_ai(self, opponent_ai: Optional[BaseAIOpponent]):
-        """Swap the active opponent AI (useful for debugging/testing different profiles)."""
-        self.opponent_ai = opponent_ai or BaselineOpponent()
+        """Swap the active opponent AI (useful for debugging/testing different profiles).
+
+        Raises ValueError, like MatchEngine, if the AI does not play this table's variant.
+        """
+        opponent_ai = opponent_ai or BaselineOpponent()
+        self._check_variant(opponent_ai)
+        self.opponent_ai = opponent_ai
 
     def reset_match(self):
         """Reset match-level scores and start a fresh hand.
@@ -71,6 +126,10 @@ class UIController:
         # Start a fresh hand as well
         self.reset_hand()
 
+    def _played_names(self) -> Dict[str, Optional[str]]:
+        """Return the played cards as display strings (None for empty slots)."""
+        return {who: (card_to_str(card) if card is not None else None) for who, card in self.played.items()}
+
     def get_snapshot(self) -> Dict:
         # Get pending truco name if one exists
         pending_truco_name = None
@@ -82,11 +141,11 @@ class UIController:
         
         return {
             "scores": {"player": self.core.pontos_jogador, "opponent": self.core.pontos_oponente},
-            "carta_vira": self.carta_vira,
-            "manilha": self.manilha,
+            "carta_vira": card_to_str(self.carta_vira) if self.carta_vira is not None else "",
+            "manilha": self.core.variant.manilha_label(self.manilha),
             "round_results": self.round_results.copy(),
-            "player_hand": self.player_hand.copy(),
-            "played": self.played.copy(),
+            "player_hand": cards_to_str(self.player_hand),
+            "played": self._played_names(),
             "message": self.message,
             "pending_truco": self.pending_truco,
             "pending_truco_name": pending_truco_name,
@@ -132,6 +191,8 @@ class UIController:
             winner = self.core.vencedor_rodada(p, o, self.manilha)
         except Exception:
             winner = None
+        # Remember resolved cards so AI contexts know which cards are gone
+        self.played_cards.extend(card for card in (p, o) if card is not None)
         # Update per-round counters and messages, but DO NOT award hand points yet
         if winner == "Jogador":
             self.vitorias_jogador += 1
@@ -244,62 +305,68 @@ class UIController:
         return self.get_snapshot()
 
     def call_truco(self) -> Dict:
-        # Player initiates a truco request. We drive a single step of negotiation
-        # and return either a completed result or a pending request for the UI.
+        # Player initiates a truco request. truco_step drives the negotiation until
+        # it settles, someone runs, or the opponent reraises and the UI must answer.
         
         # First, check if player can raise truco (not the last raiser, and not at max value)
         if not self.truco.can_raise_truco("Jogador"):
             self.message = "Você não pode aumentar agora (você aumentou por último)"
             return self.get_snapshot()
         
-        next_value = self.truco.get_next_truco_value()
-        if next_value is None:
+        state = truco_step(*self.truco.negotiation_state(), "Jogador", "raise")
+        if state is None:
             self.message = "Já no valor máximo de truco"
             return self.get_snapshot()
+        return self._advance_truco(state)
 
-        # Opponent decides reactively via AI hook
+    def _opponent_truco_response(self, value: int) -> str:
+        """Opponent's answer to a raise to `value`, via the AI hook (random fallback)."""
         try:
-            response = self.opponent_ai.decide_truco_response(next_value, self.truco, self._build_ai_context())
+            return self.opponent_ai.decide_truco_response(value, self.truco, self._build_ai_context())
         except Exception:
-            response = self.truco.get_opponent_truco_response(next_value)
-        if response == 'accept':
-            # Opponent accepted player's truco
-            self.truco.update_truco_state(next_value, 'Jogador')
-            self.message = f"Oponente aceitou {self.truco.get_truco_name(next_value)}"
-            return self.get_snapshot()
-        elif response == 'run':
-            # Opponent fled — award last accepted points (before this raise proposal)
-            last_accepted = self.truco.last_accepted_value
-            winner, points = self.truco.calculate_points_for_runner('Oponente', next_value, last_accepted)
-            self.core.update_score(winner, points)
-            self.message = f"{winner} ganha {points} ponto(s) (fugiu)"
-            # Mark the hand ended and set next-hand/round starter based on winner
-            try:
-                self.core.player_starts_hand = (winner == "Jogador")
-                self.core.player_starts_round = (winner == "Jogador")
-            except Exception:
-                pass
-            self.hand_ended = True
-            return self.get_snapshot()
-        else:
-            # Opponent re-raised — compute the new value and create a pending request
-            opp_new = self.truco.get_next_truco_value(next_value)
-            if opp_new is None:
-                # cannot reraise further; treat as acceptance
-                self.truco.update_truco_state(next_value, 'Jogador')
-                self.message = f"Oponente aceitou {self.truco.get_truco_name(next_value)}"
-                return self.get_snapshot()
-
-            # Create pending truco for the UI to respond to
-            # By re-raising, opponent implicitly accepted next_value, so it becomes last_accepted
+            return self.truco.get_opponent_truco_response(value)
+
+    def _advance_truco(self, state: TrucoState) -> Dict:
+        """Let the opponent answer the player's raises and apply where the negotiation stops."""
+        while state.pending and state.last_raiser == "Jogador":
+            response = self._opponent_truco_response(state.value)
+            result = truco_step(*state, "Oponente", response)
+            if result is None:
+                result = truco_step(*state, "Oponente", "accept")
+            if isinstance(result, TrucoEnd):
+                return self._truco_run(result)
+            state = result
+
+        if state.pending:
+            # Opponent re-raised; by doing so it implicitly accepted last_accepted
             self.pending_truco = {
-                "value": opp_new,
+                "value": state.value,
                 "raiser": "Oponente",
-                "last_accepted": next_value,
+                "last_accepted": state.last_accepted,
             }
-            self.message = f"Oponente pediu {self.truco.get_truco_name(opp_new)} - Aceitar / Fugir / Aumentar?"
+            self.message = f"Oponente pediu {self.truco.get_truco_name(state.value)} - Aceitar / Fugir / Aumentar?"
             return self.get_snapshot()
 
+        self.truco.update_truco_state(state.value, state.last_raiser)
+        self.pending_truco = None
+        quem = "Oponente aceitou" if state.last_raiser == "Jogador" else "Você aceitou"
+        self.message = f"{quem} {self.truco.get_truco_name(state.value)}"
+        return self.get_snapshot()
+
+    def _truco_run(self, end: TrucoEnd) -> Dict:
+        """Someone ran from a raise: award the last accepted points and end the hand."""
+        self.pending_truco = None
+        self.core.update_score(end.winner, end.points)
+        self.message = f"{end.winner} ganha {end.points} ponto(s) (fugiu)"
+        # Mark the hand ended and set next-hand/round starter based on winner
+        try:
+            self.core.player_starts_hand = (end.winner == "Jogador")
+            self.core.player_starts_round = (end.winner == "Jogador")
+        except Exception:
+            pass
+        self.hand_ended = True
+        return self.get_snapshot()
+
     def run(self) -> Dict:
         # Player runs from truco: calculate points based on current truco state
         # Use last_accepted_value (not current_hand_value) as the points to award
@@ -320,21 +387,29 @@ class UIController:
         return self.get_snapshot()
 
     def _build_ai_context(self) -> AIOpponentContext:
-        """Build a sanitized context snapshot for AI decision making."""
-        return AIOpponentContext(
-            opponent_hand=self.opponent_hand.copy(),
-            player_hand=self.player_hand.copy(),
-            played=self.played.copy(),
-            manilha=self.manilha,
-            carta_vira=self.carta_vira,
-            scores={"player": self.core.pontos_jogador, "opponent": self.core.pontos_oponente},
-            current_hand_value=self.truco.current_hand_value,
-            last_accepted_value=self.truco.last_accepted_value,
-            pending_truco=self.pending_truco.copy() if isinstance(self.pending_truco, dict) else self.pending_truco,
-            round_results=self.round_results.copy(),
-            player_starts_round=getattr(self.core, "player_starts_round", True),
-            player_starts_hand=getattr(self.core, "player_starts_hand", True),
-        )
+        """Refresh the shared AI context from the controller state and return it.
+
+        Fields are updated in place (card ids mapped to the shared name strings),
+        so a decision allocates nothing; the AI must not mutate or keep it.
+        """
+        ctx = self.ai_context
+        _refill(ctx.opponent_hand, self.opponent_hand, CARD_NAMES)
+        _refill(ctx.player_hand, self.player_hand, CARD_NAMES)
+        _refill(ctx.seen_cards, self.played_cards, CARD_NAMES)
+        _refill(ctx.round_results, self.round_results)
+        for who, card in self.played.items():
+            ctx.played[who] = CARD_NAMES[card] if card is not None else None
+        ctx.manilha = self.core.variant.manilha_label(self.manilha)
+        ctx.carta_vira = CARD_NAMES[self.carta_vira] if self.carta_vira is not None else ""
+        ctx.scores["player"] = self.core.pontos_jogador
+        ctx.scores["opponent"] = self.core.pontos_oponente
+        ctx.current_hand_value = self.truco.current_hand_value
+        ctx.last_accepted_value = self.truco.last_accepted_value
+        ctx.pending_truco = self.pending_truco
+        ctx.player_starts_round = getattr(self.core, "player_starts_round", True)
+        ctx.player_starts_hand = getattr(self.core, "player_starts_hand", True)
+        ctx.last_raiser = _RAISER_KEYS.get(self.truco.last_raiser)
+        return ctx
 
     def respond_to_truco(self, action: str) -> Dict:
         """Handle a player response to a pending opponent truco.
@@ -346,70 +421,30 @@ class UIController:
             return self.get_snapshot()
 
         pending = self.pending_truco
-        value = pending["value"]
-        last_accepted = pending.get("last_accepted", self.truco.current_hand_value)
-
-        if action == 'accept':
-            # Player accepts the opponent's raise
-            self.truco.update_truco_state(value, 'Oponente')
-            self.message = f"Você aceitou {self.truco.get_truco_name(value)}"
-            self.pending_truco = None
+        state = TrucoState(
+            pending["value"],
+            pending.get("raiser", "Oponente"),
+            pending.get("last_accepted", self.truco.current_hand_value),
+        )
+        result = truco_step(*state, "Jogador", action)
+        if result is None:
+            # Unknown action
+            self.message = "Ação desconhecida"
             return self.get_snapshot()
 
-        if action == 'run':
+        if isinstance(result, TrucoEnd):
             # Player runs — opponent wins last accepted points
-            winner, points = self.truco.calculate_points_for_runner('Jogador', value, last_accepted)
-            self.core.update_score(winner, points)
-            self.message = f"{winner} ganha {points} ponto(s) (fugiu)"
-            # Clear pending and mark hand completed; set starter based on winner
+            return self._truco_run(result)
+
+        if action == 'reraise' and not result.pending:
+            # cannot reraise further; treated as accept
+            self.truco.update_truco_state(result.value, result.last_raiser)
+            self.message = f"Valor máximo atingido. Aceito {self.truco.get_truco_name(result.value)}"
             self.pending_truco = None
-            try:
-                self.core.player_starts_hand = (winner == "Jogador")
-                self.core.player_starts_round = (winner == "Jogador")
-            except Exception:
-                pass
-            self.hand_ended = True
             return self.get_snapshot()
 
-        if action == 'reraise':
-            # Player increases the raise further
-            next_val = self.truco.get_next_truco_value(value)
-            if next_val is None:
-                # cannot reraise further; treat as accept
-                self.truco.update_truco_state(value, 'Oponente')
-                self.message = f"Valor máximo atingido. Aceito {self.truco.get_truco_name(value)}"
-                self.pending_truco = None
-                return self.get_snapshot()
-
-            # Now opponent must respond to the player's reraise
-            opp_resp = self.truco.get_opponent_truco_response(next_val)
-            if opp_resp == 'accept':
-                self.truco.update_truco_state(next_val, 'Jogador')
-                self.message = f"Oponente aceitou {self.truco.get_truco_name(next_val)}"
-                self.pending_truco = None
-                return self.get_snapshot()
-            elif opp_resp == 'run':
-                # Opponent runs from player's re-raise; player wins value (what was implicitly accepted)
-                winner, points = self.truco.calculate_points_for_runner('Oponente', next_val, value)
-                self.core.update_score(winner, points)
-                self.message = f"{winner} ganha {points} ponto(s) (fugiu)"
-                self.pending_truco = None
-                return self.get_snapshot()
-            else:
-                # Opponent reraise again — create new pending request
-                opp_new = self.truco.get_next_truco_value(next_val)
-                if opp_new is None:
-                    self.truco.update_truco_state(next_val, 'Jogador')
-                    self.message = f"Oponente aceitou {self.truco.get_truco_name(next_val)}"
-                    self.pending_truco = None
-                    return self.get_snapshot()
-                self.pending_truco = {"value": opp_new, "raiser": "Oponente", "last_accepted": next_val}
-                self.message = f"Oponente pediu {self.truco.get_truco_name(opp_new)} - Aceitar / Fugir / Aumentar?"
-                return self.get_snapshot()
-
-        # Unknown action
-        self.message = "Ação desconhecida"
-        return self.get_snapshot()
+        # Accepted, or the player re-raised and the opponent answers next
+        return self._advance_truco(result)
 
     # --- Methods used by TrucoLogic for callbacks/input ---
     def get_truco_response(self, value: int, raiser: str, truco_names: Dict) -> str: